@@ -0,0 +1,3 @@
+"""
+Benchmark Package Initialization
+"""
\ No newline at end of file
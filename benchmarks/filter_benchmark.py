@@ -0,0 +1,121 @@
+"""
+Filter Benchmark - Compiled filter engine over message lists and columns
+
+Compares the former per-message filter (dict lookups and payload.lower()
+per criterion and message) with the compiled predicate over DLTMessage
+lists and with the columnar evaluation over DLTMessageColumns.
+
+Usage:
+    python -m benchmarks.filter_benchmark --count 10000000 --list-count 1000000
+"""
+import argparse
+import random
+import time
+
+from core.dlt_columns import DLTMessageColumns
+from core.dlt_filter_engine import FilterSpec, compile_filter
+from core.dlt_message import DLTMessage
+
+ECUS = ["ECU1", "ECU2", "ECU3"]
+APPS = [f"AP{i:02d}" for i in range(40)]
+CTXS = [f"C{i:03d}" for i in range(400)]
+LEVELS = ["FATAL", "ERROR", "WARN", "INFO", "DEBUG", "VERBOSE"]
+LEVEL_WEIGHTS = [1, 5, 20, 60, 10, 4]
+
+FILTERS = {
+    "levels": {"log_level": ["FATAL", "ERROR", "WARN"]},
+    "app + ctx": {"app_id": APPS[:5], "ctx_id": CTXS[:50]},
+    "payload": {"payload_text": "Timeout"},
+    "mixed": {"ecu": ["ECU1"], "log_level": ["ERROR", "WARN"], "payload_text": "timeout"},
+}
+
+def legacy_matches(msg, filter_config):
+    """The per-message filter the engine replaces"""
+    if filter_config.get("ecu") and msg.ecu_id not in filter_config["ecu"]:
+        return False
+    if filter_config.get("app_id") and msg.app_id not in filter_config["app_id"]:
+        return False
+    if filter_config.get("ctx_id") and msg.ctx_id not in filter_config["ctx_id"]:
+        return False
+    if filter_config.get("log_level") and msg.log_level not in filter_config["log_level"]:
+        return False
+    if filter_config.get("time_start") and msg.timestamp < filter_config["time_start"]:
+        return False
+    if filter_config.get("time_end") and msg.timestamp > filter_config["time_end"]:
+        return False
+    if filter_config.get("payload_text"):
+        if filter_config["payload_text"].lower() not in msg.payload.lower():
+            return False
+    return True
+
+def make_payloads(rng, count=2000):
+    """Pool of payload strings shared by the generated messages"""
+    words = ["init", "state", "changed", "timeout", "request", "response", "retry",
+             "signal", "value", "buffer", "connected", "lost", "frame", "update"]
+    return [" ".join(rng.choice(words) for _ in range(8)) + f" {i}" for i in range(count)]
+
+def make_messages(count, rng, payloads):
+    """Generate decoded messages"""
+    messages = []
+    levels = rng.choices(LEVELS, LEVEL_WEIGHTS, k=count)
+    for i in range(count):
+        msg = DLTMessage()
+        msg.timestamp = 1000.0 + i * 0.001
+        msg.ecu_id = ECUS[i % len(ECUS)]
+        msg.app_id = APPS[rng.randrange(len(APPS))]
+        msg.ctx_id = CTXS[rng.randrange(len(CTXS))]
+        msg.log_level = levels[i]
+        msg.payload = payloads[rng.randrange(len(payloads))]
+        messages.append(msg)
+    return messages
+
+def make_columns(count, rng, payloads):
+    """Generate columns directly (no message objects)"""
+    columns = DLTMessageColumns()
+    batch = 100000
+    for start in range(0, count, batch):
+        columns.extend(make_messages(min(batch, count - start), rng, payloads))
+    return columns
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return time.perf_counter() - started, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the compiled filter engine")
+    parser.add_argument("--count", type=int, default=10_000_000,
+                        help="messages in the columnar run")
+    parser.add_argument("--list-count", type=int, default=1_000_000,
+                        help="messages in the message list runs")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    payloads = make_payloads(rng)
+
+    print(f"Generating {args.list_count} messages...")
+    messages = make_messages(args.list_count, rng, payloads)
+    print(f"{'filter':<12} {'legacy':>10} {'compiled':>10} {'columns':>10} {'hits':>10}")
+    list_columns = DLTMessageColumns.from_messages(messages)
+    for name, config in FILTERS.items():
+        compiled = compile_filter(FilterSpec.from_config(config))
+        legacy_time, legacy = timed(
+            lambda: [i for i, m in enumerate(messages) if legacy_matches(m, config)])
+        compiled_time, hits = timed(lambda: compiled.filter(messages))
+        columns_time, column_hits = timed(lambda: compiled.filter(list_columns))
+        assert legacy == hits == column_hits
+        print(f"{name:<12} {legacy_time:>9.2f}s {compiled_time:>9.2f}s "
+              f"{columns_time:>9.2f}s {len(hits):>10}")
+    del messages, list_columns
+
+    print(f"\nGenerating {args.count} columnar messages...")
+    columns = make_columns(args.count, rng, payloads)
+    print(f"{'filter':<12} {'columns':>10} {'msg/s':>14} {'hits':>10}")
+    for name, config in FILTERS.items():
+        compiled = compile_filter(FilterSpec.from_config(config))
+        elapsed, hits = timed(lambda: compiled.filter(columns))
+        print(f"{name:<12} {elapsed:>9.2f}s {args.count / elapsed:>14,.0f} {len(hits):>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Ingest Benchmark - End-to-end throughput and latency of the live viewer path
+
+Runs a local replay server and pushes its stream through the same path the
+viewer uses: DLTConnection -> LiveMessageQueue -> per-frame drain into the
+message arena. Reports messages/s, receive-to-display latency percentiles
+and drop counts.
+
+Usage:
+    python -m benchmarks.ingest_benchmark --count 200000 --speed 0
+"""
+import argparse
+import shutil
+import tempfile
+import threading
+import time
+
+from core.dlt_arena import DLTMessageArena
+from core.dlt_connection import DLTConnection
+from core.dlt_replay import DLTReplayServer, iter_synthetic_frames, iter_file_frames, parse_send_time
+from core.dlt_udp import DLTUDPConnection
+from core.live_queue import LiveMessageQueue
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+class DisplaySimulator:
+    """Drains the live queue on a fixed frame cadence like the Tk UI does"""
+
+    def __init__(self, live_queue, frame_interval=0.05, max_batch=5000):
+        self.live_queue = live_queue
+        self.frame_interval = frame_interval
+        self.max_batch = max_batch
+        self.store = DLTMessageArena()
+        self.latencies = []
+        self.displayed = 0
+        self.first_display = None
+        self.last_display = None
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run)
+        self.thread.daemon = True
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+        self.store.close()
+
+    def _run(self):
+        while not self.stop_event.wait(self.frame_interval):
+            self._drain()
+        self._drain()
+
+    def _drain(self):
+        batch = self.live_queue.drain(self.max_batch)
+        if not batch:
+            return
+        self.store.extend(batch)
+        now = time.time()
+        for msg in batch:
+            sent = parse_send_time(msg.payload)
+            if sent:
+                self.latencies.append(now - sent)
+        self.displayed += len(batch)
+        if self.first_display is None:
+            self.first_display = now
+        self.last_display = now
+
+def run_benchmark(count=100000, protocol="tcp", rate=1000.0, speed=0.0, file_path=None,
+                  burst_every=None, burst_size=0, drop_rate=0.0, corrupt_rate=0.0,
+                  queue_size=50000, frame_interval=0.05, max_batch=5000, idle_timeout=1.0):
+    """Run one benchmark and return a result dictionary"""
+    if file_path:
+        def source():
+            return iter_file_frames(file_path)
+    else:
+        def source():
+            return iter_synthetic_frames(count, seed=1)
+
+    log_dir = tempfile.mkdtemp(prefix="dlt_bench_")
+    live_queue = LiveMessageQueue(queue_size)
+    display = DisplaySimulator(live_queue, frame_interval, max_batch)
+
+    server = DLTReplayServer(
+        source, protocol=protocol, rate=rate, speed=speed,
+        burst_every=burst_every, burst_size=burst_size,
+        drop_rate=drop_rate, corrupt_rate=corrupt_rate, seed=1
+    )
+
+    if protocol == "udp":
+        connection = DLTUDPConnection("127.0.0.1", 0)
+    else:
+        host, port = server.start()
+        connection = DLTConnection(host, port)
+    connection.log_dir = log_dir
+    connection.add_callback(live_queue.put)
+
+    try:
+        display.start()
+        if not connection.connect():
+            raise RuntimeError("Could not connect to replay server")
+        if protocol == "udp":
+            server.port = connection.socket.getsockname()[1]
+            server.start()
+
+        start = time.time()
+        server.wait()
+
+        # Wait until the viewer side has been idle for idle_timeout
+        last_count = -1
+        while display.displayed != last_count or len(live_queue):
+            last_count = display.displayed
+            time.sleep(idle_timeout)
+    finally:
+        server.stop()
+        connection.disconnect()
+        display.stop()
+        shutil.rmtree(log_dir, ignore_errors=True)
+
+    sent = server.get_stats()
+    queue_stats = live_queue.get_stats()
+    pipeline_stats = connection.get_pipeline_stats()
+    latencies = sorted(display.latencies)
+    elapsed = (display.last_display or start) - start
+
+    result = {
+        "protocol": protocol,
+        "sent": sent["sent_messages"],
+        "received": queue_stats["received"],
+        "displayed": display.displayed,
+        "lost_in_transport": (sent["sent_messages"] - queue_stats["received"]
+                              - pipeline_stats["frames_dropped"]),
+        "pipeline_dropped": pipeline_stats["frames_dropped"],
+        "max_pending_batches": pipeline_stats["max_pending_batches"],
+        "queue_dropped": queue_stats["dropped"],
+        "max_pending": queue_stats["max_pending"],
+        "msgs_per_second": display.displayed / elapsed if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "p50": percentile(latencies, 0.50),
+            "p90": percentile(latencies, 0.90),
+            "p99": percentile(latencies, 0.99),
+            "max": latencies[-1] if latencies else None
+        }
+    }
+    for key, value in result["latency_ms"].items():
+        if value is not None:
+            result["latency_ms"][key] = round(value * 1000.0, 3)
+    if protocol == "udp":
+        result["sender_stats"] = connection.get_sender_stats()
+    return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the live DLT ingest path")
+    parser.add_argument("--file", help=".dlt file to replay instead of synthetic traffic")
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--protocol", choices=("tcp", "udp"), default="tcp")
+    parser.add_argument("--rate", type=float, default=1000.0, help="messages/s at 1x")
+    parser.add_argument("--speed", type=float, default=0.0, help="speed factor, 0 = unthrottled")
+    parser.add_argument("--burst-every", type=float, default=None)
+    parser.add_argument("--burst-size", type=int, default=0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--corrupt-rate", type=float, default=0.0)
+    parser.add_argument("--queue-size", type=int, default=50000)
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(
+        count=args.count, protocol=args.protocol, rate=args.rate, speed=args.speed,
+        file_path=args.file, burst_every=args.burst_every, burst_size=args.burst_size,
+        drop_rate=args.drop_rate, corrupt_rate=args.corrupt_rate,
+        queue_size=args.queue_size
+    )
+
+    print(f"Protocol:          {result['protocol'].upper()}")
+    print(f"Sent:              {result['sent']}")
+    print(f"Received:          {result['received']}")
+    print(f"Displayed:         {result['displayed']}")
+    print(f"Lost in transport: {result['lost_in_transport']}")
+    print(f"Pipeline dropped:  {result['pipeline_dropped']} "
+          f"(max pending batches {result['max_pending_batches']})")
+    print(f"Queue dropped:     {result['queue_dropped']} (max pending {result['max_pending']})")
+    print(f"Throughput:        {result['msgs_per_second']:.0f} msgs/s")
+    lat = result["latency_ms"]
+    print(f"Latency (ms):      p50={lat['p50']} p90={lat['p90']} p99={lat['p99']} max={lat['max']}")
+    for sender, stats in result.get("sender_stats", {}).items():
+        print(f"Sender {sender}: {stats['lost_messages']} lost in {stats['counter_gaps']} gaps")
+
+if __name__ == "__main__":
+    main()
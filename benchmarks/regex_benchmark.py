@@ -0,0 +1,79 @@
+"""
+Regex Benchmark - Multi-pattern matching as the pattern count grows
+
+Compares trying every pattern on every message (the former
+DLTRegexMatcher loop) with the literal-prefiltered DLTRegexMatcher, for
+single messages and for batch matching over a message range.
+
+Usage:
+    python -m benchmarks.regex_benchmark --messages 20000 --patterns 10 100 500
+"""
+import argparse
+import random
+import time
+
+from core.dlt_message import DLTMessage
+from core.dlt_regex import DLTRegexMatcher
+
+WORDS = ["init", "state", "changed", "timeout", "request", "response", "retry",
+         "signal", "value", "buffer", "connected", "lost", "frame", "update"]
+
+def make_messages(count, rng):
+    """Generate messages with word and number payloads"""
+    messages = []
+    for _ in range(count):
+        msg = DLTMessage()
+        msg.payload = " ".join(rng.choice(WORDS) for _ in range(6)) + f" code={rng.randrange(100000)}"
+        messages.append(msg)
+    return messages
+
+def make_patterns(count, rng):
+    """Watch patterns: a word followed by a specific code"""
+    patterns = {}
+    for i in range(count):
+        word = rng.choice(WORDS)
+        patterns[f"watch{i}"] = rf"{word}\b.*code=({rng.randrange(100000)})\b"
+    return patterns
+
+def naive_match(patterns, message):
+    """Every pattern on every message"""
+    results = {}
+    for name, pattern in patterns.items():
+        match = pattern.search(message.payload)
+        if match:
+            results[name] = match.groups()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark multi-pattern regex matching")
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--patterns", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    messages = make_messages(args.messages, rng)
+    print(f"{'patterns':>8} {'naive':>10} {'matcher':>10} {'batch':>10} {'matches':>8}")
+    for count in args.patterns:
+        matcher = DLTRegexMatcher()
+        for name, pattern in make_patterns(count, rng).items():
+            matcher.add_pattern(name, pattern)
+
+        started = time.perf_counter()
+        naive = [naive_match(matcher.patterns, msg) for msg in messages]
+        naive_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        single = [matcher.match_message(msg) for msg in messages]
+        single_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        batch = matcher.match_range(messages)
+        batch_time = time.perf_counter() - started
+
+        assert naive == single
+        assert [(i, r) for i, r in enumerate(naive) if r] == batch
+        print(f"{count:>8} {naive_time:>9.2f}s {single_time:>9.2f}s {batch_time:>9.2f}s {len(batch):>8}")
+
+if __name__ == "__main__":
+    main()
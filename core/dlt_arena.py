@@ -0,0 +1,205 @@
+"""
+DLT Message Arena - Compact append-only storage for live sessions
+"""
+import tempfile
+import threading
+from array import array
+from collections import OrderedDict
+from .dlt_message import DLTMessage
+
+class DLTMessageArena:
+    """
+    Append-only store for the raw bytes of live DLT messages
+
+    Message bytes are packed back to back into fixed-size segments and
+    located through offset/length/timestamp arrays instead of keeping one
+    DLTMessage object per message. When the resident segments exceed the
+    memory cap the oldest ones are spilled to a temporary file, so every
+    message stays browsable while memory use stays bounded.
+
+    The arena behaves like a read-only list of DLTMessage objects, which are
+    decoded on access (with a small cache for recently used ones). Callers
+    that already hold the decoded messages of a batch should use those
+    instead of reading them back. The ECU ID of each message is stored
+    next to its bytes, so an ECU assigned after decoding (such as the
+    stream name of a merged session) survives decoding again. Whole-list passes such as sorting or
+    filtering decode every stored message, including spilled ones read from
+    disk, so they cost a full pass over the stored bytes.
+    """
+
+    # A single DLT message can never be larger than this
+    MAX_MESSAGE_SIZE = 0xFFFF
+
+    def __init__(self, segment_size=4 * 1024 * 1024, memory_cap=256 * 1024 * 1024,
+                 spill_dir=None, cache_size=2048):
+        """Initialize the arena
+
+        Args:
+            segment_size: Size of one arena segment in bytes
+            memory_cap: Maximum bytes of segments kept in memory
+            spill_dir: Directory for the spill file (None for system temp)
+            cache_size: Number of decoded messages to keep cached
+        """
+        self.segment_size = max(segment_size, self.MAX_MESSAGE_SIZE + 1)
+        self.max_resident_segments = max(1, memory_cap // self.segment_size)
+        self.spill_dir = spill_dir
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._spill_file = None
+        self.clear()
+
+    def clear(self):
+        """Discard all stored messages"""
+        with self._lock:
+            self.segments = []           # bytearray per segment, None once spilled
+            self.segment_used = array('I')
+            self.offsets = array('Q')    # Virtual address of each message
+            self.lengths = array('I')
+            self.timestamps = array('d')
+            # ECU ID code per message (0 keeps the decoded ECU ID)
+            self.ecu_codes = array('H')
+            self.ecu_ids = [None]
+            self._ecu_lookup = {}
+            self.first_resident = 0      # Index of the oldest in-memory segment
+            self.spilled_bytes = 0
+            self._cache = OrderedDict()
+            if self._spill_file:
+                self._spill_file.close()
+                self._spill_file = None
+
+    def close(self):
+        """Release the spill file"""
+        self.clear()
+
+    def append(self, message):
+        """Store a message's raw bytes and receive timestamp"""
+        if message.raw_data:
+            self.append_raw(message.raw_data, message.timestamp, message.ecu_id)
+
+    def extend(self, messages):
+        """Store a batch of messages"""
+        for message in messages:
+            self.append(message)
+
+    def append_raw(self, data, timestamp, ecu_id=None):
+        """Store raw message bytes
+
+        Args:
+            data: Raw message bytes
+            timestamp: Receive timestamp
+            ecu_id: ECU ID to report instead of the decoded one (None to
+                keep the decoded one)
+
+        Returns:
+            Index of the stored message
+        """
+        size = len(data)
+        if size > self.MAX_MESSAGE_SIZE:
+            raise ValueError(f"Message too large for arena: {size} bytes")
+
+        with self._lock:
+            if not self.segments or self.segment_used[-1] + size > self.segment_size:
+                self._new_segment()
+
+            seg_idx = len(self.segments) - 1
+            pos = self.segment_used[-1]
+            self.segments[seg_idx][pos:pos + size] = data
+            self.segment_used[-1] = pos + size
+
+            self.offsets.append(seg_idx * self.segment_size + pos)
+            self.lengths.append(size)
+            self.timestamps.append(timestamp)
+            code = 0
+            if ecu_id is not None:
+                code = self._ecu_lookup.get(ecu_id)
+                if code is None:
+                    code = self._ecu_lookup[ecu_id] = len(self.ecu_ids)
+                    self.ecu_ids.append(ecu_id)
+            self.ecu_codes.append(code)
+            return len(self.offsets) - 1
+
+    def _new_segment(self):
+        """Start a new segment, spilling the oldest ones over the cap"""
+        self.segments.append(bytearray(self.segment_size))
+        self.segment_used.append(0)
+
+        while len(self.segments) - self.first_resident > self.max_resident_segments:
+            self._spill_segment(self.first_resident)
+            self.first_resident += 1
+
+    def _spill_segment(self, seg_idx):
+        """Write a segment to the spill file and drop it from memory"""
+        if self._spill_file is None:
+            self._spill_file = tempfile.TemporaryFile(
+                prefix="dlt_arena_", suffix=".spill", dir=self.spill_dir
+            )
+
+        used = self.segment_used[seg_idx]
+        self._spill_file.seek(seg_idx * self.segment_size)
+        self._spill_file.write(memoryview(self.segments[seg_idx])[:used])
+        self.segments[seg_idx] = None
+        self.spilled_bytes += used
+
+    def get_raw(self, index):
+        """Get the raw bytes of the message at index"""
+        address = self.offsets[index]
+        size = self.lengths[index]
+        seg_idx, pos = divmod(address, self.segment_size)
+
+        with self._lock:
+            segment = self.segments[seg_idx]
+            if segment is not None:
+                return bytes(segment[pos:pos + size])
+
+            self._spill_file.seek(address)
+            return self._spill_file.read(size)
+
+    def get_message(self, index):
+        """Decode the message at index into a DLTMessage"""
+        msg = self._cache.get(index)
+        if msg is not None:
+            self._cache.move_to_end(index)
+            return msg
+
+        msg = DLTMessage()
+        msg.parse_from_bytes(self.get_raw(index))
+        msg.timestamp = self.timestamps[index]
+        code = self.ecu_codes[index]
+        if code:
+            msg.ecu_id = self.ecu_ids[code]
+
+        self._cache[index] = msg
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return msg
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.get_message(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError("arena index out of range")
+        return self.get_message(index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.get_message(i)
+
+    @property
+    def resident_bytes(self):
+        """Bytes of segment memory currently held in RAM"""
+        return (len(self.segments) - self.first_resident) * self.segment_size
+
+    def get_stats(self):
+        """Get arena memory statistics"""
+        return {
+            "messages": len(self.offsets),
+            "segments": len(self.segments),
+            "resident_bytes": self.resident_bytes,
+            "spilled_bytes": self.spilled_bytes,
+            "stored_bytes": sum(self.segment_used)
+        }
@@ -0,0 +1,188 @@
+"""
+DLT Bitmap Index - Per-value position bitmaps for categorical filtering
+"""
+import re
+from array import array
+from bisect import bisect_left
+from itertools import compress
+
+CHUNK_BITS = 16
+CHUNK_SIZE = 1 << CHUNK_BITS
+
+# Chunks holding fewer positions of a value store sorted offsets instead
+# of a bitmap (a full chunk bitmap is 8 KiB)
+ARRAY_LIMIT = 4096
+
+# Chunks with at most this many distinct codes are split with translate()
+TRANSLATE_LIMIT = 8
+
+# For every byte of a bitmap, one 0/1 byte per bit (lowest bit first)
+_EXPAND = [bytes((value >> bit) & 1 for bit in range(8)) for value in range(256)]
+
+# For every byte of a bitmap, the offsets of its set bits
+_BITS = [tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)]
+
+_NONZERO = re.compile(rb"[^\x00]")
+
+def _to_bitmap(container):
+    """Get a chunk container as an int bitmap"""
+    if isinstance(container, int):
+        return container
+    digits = bytearray(b"0") * CHUNK_SIZE
+    last = CHUNK_SIZE - 1
+    for offset in container:
+        digits[last - offset] = 49
+    return int(digits, 2)
+
+def _extend_positions(bitmap, base, out):
+    """Append the positions of the set bits of a chunk bitmap"""
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    if bitmap.bit_count() < ARRAY_LIMIT:
+        # Sparse: visit only the non-zero bytes
+        for match in _NONZERO.finditer(data):
+            start = base + (match.start() << 3)
+            out.extend(start + bit for bit in _BITS[data[match.start()]])
+        return
+    mask = b"".join(map(_EXPAND.__getitem__, data))
+    out.extend(compress(range(base, base + len(mask)), mask))
+
+class DLTBitmapIndex:
+    """
+    Bitmaps of message positions for every categorical value
+
+    Positions are split into chunks of 65536. Within a chunk every value
+    has a container: sorted 16-bit offsets when the value is rare there,
+    an int bitmap otherwise, so rare contexts cost a few bytes per message
+    and frequent levels one bit. A selection is answered chunk by chunk
+    with OR within a field and AND across fields; chunks where a field has
+    no selected value are skipped without touching the other fields.
+
+    The index follows an append-only DLTMessageColumns: update() indexes
+    new positions, re-indexing the last, partially filled chunk.
+    """
+
+    def __init__(self, columns):
+        """Initialize the index
+
+        Args:
+            columns: DLTMessageColumns to index
+        """
+        self.columns = columns
+        self.indexed = 0
+        # field -> code -> {chunk: container}
+        self.postings = {field: [] for field in columns.CATEGORICAL}
+        self._tables = {}
+
+    def update(self):
+        """Index positions added to the columns since the last update"""
+        total = len(self.columns)
+        if total == self.indexed:
+            return
+        start = (self.indexed >> CHUNK_BITS) << CHUNK_BITS
+        for chunk_start in range(start, total, CHUNK_SIZE):
+            chunk_end = min(chunk_start + CHUNK_SIZE, total)
+            for field, codes in self.columns.codes.items():
+                self._index_chunk(field, chunk_start >> CHUNK_BITS, codes[chunk_start:chunk_end])
+        self.indexed = total
+
+    def _index_chunk(self, field, chunk, codes):
+        """Build the containers of one field within one chunk"""
+        postings = self.postings[field]
+        distinct = set(codes)
+        while len(postings) <= max(distinct):
+            postings.append({})
+
+        if len(distinct) <= TRANSLATE_LIMIT and max(distinct) < 256:
+            # Few values: one C-level pass per value
+            data = array('B', codes).tobytes()
+            for code in distinct:
+                bitmap = int(data.translate(self._table(code))[::-1], 2)
+                postings[code][chunk] = bitmap
+            return
+
+        offsets = {}
+        for offset, code in enumerate(codes):
+            container = offsets.get(code)
+            if container is None:
+                container = offsets[code] = array('H')
+            container.append(offset)
+        for code, container in offsets.items():
+            postings[code][chunk] = container if len(container) < ARRAY_LIMIT else _to_bitmap(container)
+
+    def _table(self, code):
+        """translate() table mapping a code to '1' and every other byte to '0'"""
+        table = self._tables.get(code)
+        if table is None:
+            table = bytearray(b"0") * 256
+            table[code] = 49
+            table = self._tables[code] = bytes(table)
+        return table
+
+    def count(self, field, code):
+        """Get the number of positions holding a code"""
+        self.update()
+        postings = self.postings[field]
+        if code >= len(postings):
+            return 0
+        return sum(container.bit_count() if isinstance(container, int) else len(container)
+                   for container in postings[code].values())
+
+    def select(self, criteria, start=0, stop=None):
+        """Get the positions matching categorical criteria
+
+        Args:
+            criteria: Dictionary of field -> collection of allowed codes
+            start: First position to consider
+            stop: Position to stop at (None for all)
+
+        Returns:
+            List of matching positions in ascending order
+        """
+        self.update()
+        stop = self.indexed if stop is None else min(stop, self.indexed)
+        if start >= stop:
+            return []
+        fields = []
+        for field, codes in criteria.items():
+            postings = self.postings[field]
+            selected = [postings[code] for code in codes if code < len(postings)]
+            if not selected:
+                return []
+            fields.append(selected)
+        if not fields:
+            return list(range(start, stop))
+
+        # Fields selecting the fewest chunks first, to skip chunks early
+        fields.sort(key=lambda selected: sum(len(chunks) for chunks in selected))
+        first, rest = fields[0], fields[1:]
+        first_chunk, last_chunk = start >> CHUNK_BITS, (stop - 1) >> CHUNK_BITS
+        chunk_numbers = sorted(chunk for chunk in set().union(*first)
+                               if first_chunk <= chunk <= last_chunk)
+
+        positions = []
+        for chunk in chunk_numbers:
+            base = chunk << CHUNK_BITS
+            containers = [chunks[chunk] for chunks in first if chunk in chunks]
+            if not rest and len(containers) == 1 and not isinstance(containers[0], int):
+                positions.extend(map(base.__add__, containers[0]))
+                continue
+
+            result = 0
+            for container in containers:
+                result |= _to_bitmap(container)
+            for selected in rest:
+                combined = 0
+                for chunks in selected:
+                    container = chunks.get(chunk)
+                    if container is not None:
+                        combined |= _to_bitmap(container)
+                result &= combined
+                if not result:
+                    break
+            if result:
+                _extend_positions(result, base, positions)
+
+        # Trim the partially covered first and last chunks
+        if positions and (positions[0] < start or positions[-1] >= stop):
+            positions = positions[bisect_left(positions, start):bisect_left(positions, stop)]
+        return positions
@@ -0,0 +1,252 @@
+"""
+DLT Message Bus - In-process publish/subscribe for received messages
+"""
+import threading
+import time
+from collections import deque
+
+# Delivery policies for a full subscriber queue
+POLICY_BLOCK = "block"              # Publisher waits, up to block_timeout
+POLICY_DROP_OLDEST = "drop_oldest"  # Oldest pending message is discarded
+POLICY_SAMPLE = "sample"            # Only every Nth message is kept under load
+POLICY_ERRORS_ONLY = "errors_only"  # Only FATAL/ERROR are kept under load
+
+POLICIES = (POLICY_BLOCK, POLICY_DROP_OLDEST, POLICY_SAMPLE, POLICY_ERRORS_ONLY)
+
+# Log levels that the lossy policies never drop
+PROTECTED_LEVELS = ("FATAL", "ERROR")
+
+class DLTSubscription:
+    """One subscriber with its own bounded queue and delivery thread"""
+
+    # Extra room for FATAL/ERROR messages beyond maxsize, as a fraction
+    ERROR_RESERVE = 0.25
+
+    def __init__(self, callback, policy=POLICY_DROP_OLDEST, maxsize=10000,
+                 sample_every=10, name=None, block_timeout=1.0):
+        """Initialize the subscription
+
+        Args:
+            callback: Callable invoked with each message, in publish order
+            policy: One of POLICIES, applied when the queue fills up
+            maxsize: Maximum number of pending messages
+            sample_every: Keep one of this many messages under the sample policy
+            name: Name shown in statistics (defaults to the callback name)
+            block_timeout: Longest time one publish() waits for a POLICY_BLOCK
+                subscriber. Messages that still do not fit are dropped and
+                counted as stalls.
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown delivery policy: {policy}")
+        self.callback = callback
+        self.policy = policy
+        self.maxsize = max(1, int(maxsize))
+        self.sample_every = max(1, int(sample_every))
+        self.block_timeout = block_timeout
+        self.hard_limit = self.maxsize + max(1, int(self.maxsize * self.ERROR_RESERVE))
+        self.name = name or getattr(callback, "__qualname__", repr(callback))
+
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._sample_count = 0
+        self.thread = None
+        self.running = False
+
+        self.received = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.errors_dropped = 0
+        self.stalls = 0
+        self.errors = 0
+        self.max_pending = 0
+
+    def start(self):
+        """Start the delivery thread"""
+        with self._cond:
+            if self.running:
+                return
+            self.running = True
+        self.thread = threading.Thread(target=self._run, name=f"dlt-bus-{self.name}")
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self, timeout=2.0):
+        """Deliver pending messages (within timeout) and stop the thread"""
+        with self._cond:
+            if not self.running:
+                return
+            self._cond.wait_for(lambda: not self._queue, timeout)
+            self.running = False
+            self._cond.notify_all()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout)
+        self.thread = None
+
+    def publish(self, messages):
+        """Queue messages according to the delivery policy"""
+        deadline = time.time() + self.block_timeout
+        with self._cond:
+            for msg in messages:
+                self.received += 1
+                if not self._accept(msg, deadline):
+                    self.dropped += 1
+                    continue
+                self._queue.append(msg)
+            if len(self._queue) > self.max_pending:
+                self.max_pending = len(self._queue)
+            self._cond.notify_all()
+
+    def _accept(self, msg, deadline):
+        """Decide whether msg is queued (called with the lock held)"""
+        queue = self._queue
+        if self.policy == POLICY_BLOCK:
+            while len(queue) >= self.maxsize and self.running:
+                # Let the delivery thread take what is already queued
+                self._cond.notify_all()
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    self.stalls += 1
+                    return False
+                self._cond.wait(min(remaining, 0.1))
+            return True
+
+        if msg.log_level in PROTECTED_LEVELS:
+            # Errors displace other messages and may use the reserve above
+            # maxsize; only beyond the hard limit are they dropped
+            if len(queue) < self.maxsize or self._evict_oldest():
+                return True
+            if len(queue) < self.hard_limit:
+                return True
+            self.errors_dropped += 1
+            return False
+
+        if self.policy == POLICY_ERRORS_ONLY:
+            # Under load only errors get in
+            return len(queue) < self.maxsize
+
+        if self.policy == POLICY_SAMPLE and len(queue) >= self.maxsize // 2:
+            # Lagging: keep only every Nth message
+            self._sample_count += 1
+            if self._sample_count % self.sample_every:
+                return False
+
+        if len(queue) >= self.maxsize:
+            return self._evict_oldest()
+        return True
+
+    def _evict_oldest(self):
+        """Drop the oldest pending message that is not an error"""
+        queue = self._queue
+        for i, pending in enumerate(queue):
+            if pending.log_level not in PROTECTED_LEVELS:
+                del queue[i]
+                self.dropped += 1
+                return True
+        return False
+
+    def _run(self):
+        """Deliver queued messages until stopped"""
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or not self.running)
+                if not self._queue and not self.running:
+                    return
+                batch = list(self._queue)
+                self._queue.clear()
+                self._cond.notify_all()
+
+            for msg in batch:
+                try:
+                    self.callback(msg)
+                except Exception as e:
+                    self.errors += 1
+                    print(f"Error in message callback {self.name}: {e}")
+            with self._cond:
+                self.delivered += len(batch)
+
+    def get_stats(self):
+        """Get queue depth, lag and drop counters"""
+        with self._cond:
+            oldest = self._queue[0].timestamp if self._queue else None
+            return {
+                "name": self.name,
+                "policy": self.policy,
+                "pending": len(self._queue),
+                "max_pending": self.max_pending,
+                "received": self.received,
+                "delivered": self.delivered,
+                "dropped": self.dropped,
+                "errors_dropped": self.errors_dropped,
+                "stalls": self.stalls,
+                "errors": self.errors,
+                "lag": time.time() - oldest if oldest is not None else 0.0
+            }
+
+class DLTMessageBus:
+    """
+    Fans received messages out to independent subscribers
+
+    Every subscriber has its own queue, delivery thread and policy, so a
+    slow subscriber only lags (or drops, depending on its policy) on its
+    own. Subscribers are lossy (POLICY_DROP_OLDEST) unless they ask for
+    POLICY_BLOCK. A full POLICY_BLOCK subscriber holds up the publisher,
+    and with it every other subscriber, for at most block_timeout per
+    publish() before its overflow is dropped and counted as a stall.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.subscriptions = []
+        self.running = False
+
+    def subscribe(self, callback, policy=POLICY_DROP_OLDEST, maxsize=10000,
+                  sample_every=10, name=None, block_timeout=1.0):
+        """Add a subscriber (an existing subscription for callback is returned)"""
+        with self._lock:
+            for subscription in self.subscriptions:
+                if subscription.callback == callback:
+                    return subscription
+            subscription = DLTSubscription(callback, policy, maxsize, sample_every,
+                                           name, block_timeout)
+            self.subscriptions = self.subscriptions + [subscription]
+            if self.running:
+                subscription.start()
+            return subscription
+
+    def unsubscribe(self, callback):
+        """Remove the subscriber for callback after delivering its backlog"""
+        with self._lock:
+            removed = [s for s in self.subscriptions if s.callback == callback]
+            self.subscriptions = [s for s in self.subscriptions if s.callback != callback]
+        for subscription in removed:
+            subscription.stop()
+
+    def start(self):
+        """Start delivery threads for all subscribers"""
+        with self._lock:
+            self.running = True
+            subscriptions = self.subscriptions
+        for subscription in subscriptions:
+            subscription.start()
+
+    def stop(self, timeout=2.0):
+        """Flush and stop all delivery threads (subscriptions are kept)"""
+        with self._lock:
+            self.running = False
+            subscriptions = self.subscriptions
+        for subscription in subscriptions:
+            subscription.stop(timeout)
+
+    def publish(self, messages):
+        """Offer a batch of messages to every subscriber"""
+        for subscription in self.subscriptions:
+            subscription.publish(messages)
+
+    @property
+    def callbacks(self):
+        """Callbacks of the current subscribers"""
+        return [s.callback for s in self.subscriptions]
+
+    def get_stats(self):
+        """Get per-subscriber statistics"""
+        return [s.get_stats() for s in self.subscriptions]
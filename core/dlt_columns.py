@@ -0,0 +1,110 @@
+"""
+DLT Message Columns - Columnar view of message fields for filtering and sorting
+"""
+from array import array
+from .dlt_bitmap import DLTBitmapIndex
+from .dlt_time_index import DLTTimeIndex
+from .dlt_sort import DLTSortIndex
+
+class DLTMessageColumns:
+    """
+    Message fields stored column by column
+
+    Categorical fields (ECU, app, context, level, type) are dictionary
+    encoded: each column holds small integer codes and values[field] maps
+    a code back to its string. Timestamps are a float array and payloads a
+    list of the messages' own strings, so the columns add little memory on
+    top of decoded messages and none of the per-object attribute lookups.
+    Columns are append-only, like the message stores they mirror.
+    """
+
+    CATEGORICAL = ("ecu_id", "app_id", "ctx_id", "log_level", "msg_type")
+
+    def __init__(self):
+        self.timestamps = array('d')
+        self.payloads = []
+        self.codes = {field: array('I') for field in self.CATEGORICAL}
+        self.values = {field: [] for field in self.CATEGORICAL}
+        self._lookup = {field: {} for field in self.CATEGORICAL}
+        self._folded = []
+        self._bitmaps = None
+        self._times = None
+        self._sort_index = None
+        # Optional DLTTrigramIndex over the payloads, attached once built
+        self.trigrams = None
+        # Optional DLTFileSource of a loaded file, for parallel evaluation
+        self.source = None
+
+    @classmethod
+    def from_messages(cls, messages):
+        """Build the columns of a message sequence"""
+        columns = cls()
+        columns.extend(messages)
+        return columns
+
+    def append(self, message):
+        """Add one message"""
+        self.extend((message,))
+
+    def extend(self, messages):
+        """Add a batch of messages"""
+        encoders = [(self.codes[field].append, self._lookup[field], self.values[field], field)
+                    for field in self.CATEGORICAL]
+        timestamps = self.timestamps
+        payloads = self.payloads
+        start = len(payloads)
+        for message in messages:
+            timestamps.append(message.timestamp)
+            payloads.append(message.payload)
+            for append_code, lookup, values, field in encoders:
+                value = getattr(message, field)
+                code = lookup.get(value)
+                if code is None:
+                    code = lookup[value] = len(values)
+                    values.append(value)
+                append_code(code)
+        if self.trigrams is not None and self.trigrams.indexed == start:
+            self.trigrams.update(payloads)
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def code_of(self, field, value):
+        """Get the code of a value (None if it never occurred)"""
+        return self._lookup[field].get(value)
+
+    def code_set(self, field, values):
+        """Get the codes of the given values that occur in the column"""
+        lookup = self._lookup[field]
+        return {lookup[value] for value in values if value in lookup}
+
+    def value(self, field, index):
+        """Get the value of a categorical field at index"""
+        return self.values[field][self.codes[field][index]]
+
+    def folded_payloads(self):
+        """Casefolded payloads for case-insensitive search, built on first use"""
+        folded = self._folded
+        if len(folded) < len(self.payloads):
+            folded.extend(payload.casefold() for payload in self.payloads[len(folded):])
+        return folded
+
+    def bitmaps(self):
+        """Bitmap index over the categorical columns, brought up to date"""
+        if self._bitmaps is None:
+            self._bitmaps = DLTBitmapIndex(self)
+        self._bitmaps.update()
+        return self._bitmaps
+
+    def times(self):
+        """Time index over the timestamp column, brought up to date"""
+        if self._times is None:
+            self._times = DLTTimeIndex(self.timestamps)
+        self._times.update()
+        return self._times
+
+    def sort_index(self):
+        """Cached sort permutations of the columns"""
+        if self._sort_index is None:
+            self._sort_index = DLTSortIndex(self)
+        return self._sort_index
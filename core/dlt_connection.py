@@ -1,15 +1,40 @@
 """
 DLT Network Connection - Module for TCP/IP connections to DLT devices
 """
+import errno
 import socket
+import selectors
 import threading
 import time
 import os
 from datetime import datetime
 from .dlt_message import DLTMessage
+from .dlt_pipeline import DLTIngestPipeline
+from .dlt_loss import DLTLossTracker
+from .dlt_bus import DLTMessageBus, POLICY_DROP_OLDEST
 
 class DLTConnection:
-    """Class for handling TCP/IP connections to DLT devices"""
+    """Class for handling TCP/IP connections to DLT devices
+
+    The receive thread only frames the byte stream and records the raw
+    frames. Decoding runs in a DLTIngestPipeline, which publishes to a
+    DLTMessageBus where every listener has its own queue and policy, so
+    slow listeners never hold up recv() or each other.
+    """
+    
+    # Default time allowed for establishing the TCP connection (seconds)
+    CONNECT_TIMEOUT = 5.0
+    
+    # Head start of each address before the next one is tried in parallel
+    ATTEMPT_DELAY = 0.25
+    
+    # Bytes requested per recv() call
+    RECV_SIZE = 65536
+    
+    # Maximum time recorded data may sit in the file buffer (seconds).
+    # The receive thread wakes up at this interval on a quiet link to
+    # flush the tail of the recording.
+    LOG_FLUSH_INTERVAL = 0.5
     
     def __init__(self, host="localhost", port=3490):
         """Initialize connection parameters"""
@@ -19,117 +44,405 @@ class DLTConnection:
         self.is_connected = False
         self.receive_thread = None
         self.stop_thread = False
-        self.callbacks = []
+        self.bus = DLTMessageBus()
+        self.disconnect_callbacks = []
         self.log_file = None
         self.log_dir = os.path.expanduser("~/dlt_logs")
         
-    def connect(self):
-        """Establish connection to DLT device"""
+        # Optional DLTRecorder taking over recording (rotation and index)
+        self.recorder = None
+        
+        # Keep the log file open when the link drops unexpectedly, so a
+        # reconnect can continue the same recording
+        self.keep_log_on_drop = False
+        self.disconnected_at = None
+        self.send_lock = threading.Lock()
+        
+        # Non-blocking connect: further (host, port) candidates are tried in
+        # parallel, the whole attempt is bounded by connect_timeout and can
+        # be aborted from another thread with cancel_connect()
+        self.addresses = []
+        self.connect_timeout = self.CONNECT_TIMEOUT
+        self.attempt_delay = self.ATTEMPT_DELAY
+        self.connect_status = ""
+        self.connected_address = None
+        self.last_error = None
+        self._cancel_connect = threading.Event()
+        
+        # Staged ingest: decoder pool and ordered delivery to callbacks
+        self.pipeline = DLTIngestPipeline(self._dispatch_messages)
+        
+        # Message counter gaps seen on the wire (before any shedding)
+        self.loss_tracker = DLTLossTracker()
+        self.log_lock = threading.Lock()
+        self.last_log_flush = 0.0
+        self.log_dirty = False
+        
+    def connect(self, resume_log=False):
+        """Establish connection to DLT device
+        
+        Args:
+            resume_log: Continue the current log file (with a gap marker)
+                instead of starting a new one
+        """
         try:
-            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.socket.connect((self.host, self.port))
+            self.last_error = None
+            sock, self.connected_address = self._open_socket()
+            
+            # Replace a previous link: its receive loop ends without
+            # reporting a disconnect, since it is no longer the current one
+            self.receive_thread = None
+            self._close_socket()
+            self.socket = sock
+            self.socket.settimeout(self.LOG_FLUSH_INTERVAL)
             self.is_connected = True
             
+            # Set up decoding and recording before any data arrives
+            self._start_pipeline()
+            self._open_log(resume_log)
+            
             # Start receive thread
             self.stop_thread = False
-            self.receive_thread = threading.Thread(target=self._receive_loop)
+            self.receive_thread = threading.Thread(target=self._receive_loop, args=(sock,))
             self.receive_thread.daemon = True
             self.receive_thread.start()
             
-            # Start new log file
-            self._start_new_log()
-            
             return True
         except Exception as e:
             print(f"Connection failed: {e}")
+            self.last_error = e
             self.is_connected = False
             return False
     
+    def cancel_connect(self):
+        """Abort a connect() in progress in another thread"""
+        self._cancel_connect.set()
+    
+    def _resolve_targets(self):
+        """Resolve the configured addresses to (family, sockaddr, label) tuples"""
+        targets = []
+        for host, port in [(self.host, self.port)] + list(self.addresses):
+            label = f"{host}:{port}"
+            try:
+                infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            except socket.gaierror as e:
+                print(f"Cannot resolve {label}: {e}")
+                continue
+            for family, _, _, _, sockaddr in infos:
+                targets.append((family, sockaddr, label))
+        if not targets:
+            raise ConnectionError("No address could be resolved")
+        return targets
+    
+    def _open_socket(self):
+        """Connect to the first address that answers
+        
+        Attempts are non-blocking and staggered by attempt_delay; a failed
+        attempt starts the next one immediately. The first established
+        connection wins and the others are closed.
+        
+        Returns:
+            Tuple of (connected socket, "host:port" label)
+        """
+        self._cancel_connect.clear()
+        targets = self._resolve_targets()
+        deadline = time.monotonic() + self.connect_timeout
+        selector = selectors.DefaultSelector()
+        errors = []
+        next_target = 0
+        next_start = time.monotonic()
+        
+        try:
+            while True:
+                if self._cancel_connect.is_set():
+                    raise ConnectionAbortedError("Connect cancelled")
+                now = time.monotonic()
+                if now >= deadline:
+                    raise TimeoutError(
+                        f"No connection within {self.connect_timeout:.1f} s ({', '.join(errors) or 'no answer'})"
+                    )
+                
+                pending = len(selector.get_map())
+                if next_target < len(targets) and (now >= next_start or not pending):
+                    family, sockaddr, label = targets[next_target]
+                    next_target += 1
+                    next_start = now + self.attempt_delay
+                    self.connect_status = f"Trying {label} ({next_target} of {len(targets)})"
+                    sock = socket.socket(family, socket.SOCK_STREAM)
+                    sock.setblocking(False)
+                    err = sock.connect_ex(sockaddr)
+                    if err in (0, errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN):
+                        selector.register(sock, selectors.EVENT_WRITE, label)
+                    else:
+                        errors.append(f"{label}: {os.strerror(err)}")
+                        sock.close()
+                    continue
+                    
+                if not pending:
+                    raise ConnectionError("; ".join(errors))
+                
+                # Wake up regularly to notice cancellation
+                wait = min(0.05, deadline - now)
+                if next_target < len(targets):
+                    wait = min(wait, max(0.0, next_start - now))
+                for key, _ in selector.select(wait):
+                    sock = key.fileobj
+                    selector.unregister(sock)
+                    err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                    if err == 0:
+                        sock.setblocking(True)
+                        return sock, key.data
+                    errors.append(f"{key.data}: {os.strerror(err)}")
+                    sock.close()
+                    next_start = time.monotonic()
+        finally:
+            for key in list(selector.get_map().values()):
+                key.fileobj.close()
+            selector.close()
+            self.connect_status = ""
+    
     def disconnect(self):
         """Close connection to DLT device"""
         self.stop_thread = True
-        if self.socket:
-            try:
-                self.socket.close()
-            except:
-                pass
+        self._close_socket()
         self.is_connected = False
         
+        # Deliver what was already received, then stop the workers
+        self._stop_pipeline()
+        
         # Close current log file
-        if self.log_file:
-            self.log_file.close()
-            self.log_file = None
+        self._close_log()
+        
+    def _close_socket(self):
+        """Close and forget the socket of the current link"""
+        sock, self.socket = self.socket, None
+        if sock:
+            try:
+                sock.close()
+            except OSError:
+                pass
+        
+    def send(self, data):
+        """Send raw bytes (e.g. control requests) to the device"""
+        sock = self.socket
+        if not self.is_connected or not sock:
+            raise ConnectionError("Not connected")
+        with self.send_lock:
+            sock.sendall(data)
         
-    def _receive_loop(self):
-        """Background thread for receiving messages"""
+    def _receive_loop(self, sock):
+        """Background thread for receiving messages (framing only)
+
+        Args:
+            sock: Socket of the link this loop serves
+        """
         buffer = bytearray()
         
         while not self.stop_thread:
             try:
                 # Read data
-                data = self.socket.recv(4096)
+                try:
+                    data = sock.recv(self.RECV_SIZE)
+                except socket.timeout:
+                    # Link is quiet: make sure recorded data reaches the disk
+                    self._flush_log()
+                    continue
                 if not data:
                     break
                     
                 buffer.extend(data)
                 
-                # Process complete messages
-                while len(buffer) >= 4:  # Minimum message size
-                    # Try to parse message
-                    msg = DLTMessage()
-                    bytes_used = msg.parse_from_bytes(buffer)
-                    
-                    if bytes_used > 0:
-                        # Valid message found
-                        buffer = buffer[bytes_used:]
-                        
-                        # Save to log file
-                        if self.log_file and msg.raw_data:
-                            try:
-                                self.log_file.write(msg.raw_data)
-                                self.log_file.flush()
-                            except Exception as e:
-                                print(f"Error writing to log file: {e}")
-                        
-                        # Notify listeners
-                        for callback in self.callbacks:
-                            callback(msg)
-                    else:
-                        # Invalid or incomplete message
-                        break
+                # Hand complete frames on; decoding happens in the pipeline
+                frames, bytes_used = DLTMessage.split_frames(buffer)
+                if bytes_used:
+                    del buffer[:bytes_used]
+                    self.loss_tracker.track_frames(self.connected_address, frames)
+                    self._ingest_frames(frames)
                         
             except Exception as e:
-                print(f"Error receiving data: {e}")
+                # A replaced link's socket was closed on purpose
+                if not self.stop_thread and threading.current_thread() is self.receive_thread:
+                    print(f"Error receiving data: {e}")
                 break
         
+        self._on_receive_loop_exit()
+    
+    def _on_receive_loop_exit(self):
+        """Mark the connection closed and report unexpected disconnects"""
+        if threading.current_thread() is not self.receive_thread:
+            # A newer connection has already replaced this receive loop
+            return
+            
         self.is_connected = False
+        self._close_socket()
         
-        # Close log file on disconnect
-        if self.log_file:
-            self.log_file.close()
-            self.log_file = None
+        if self.stop_thread:
+            # Requested via disconnect(), which closes the log itself
+            return
+            
+        self.disconnected_at = time.time()
+        
+        # Close log file on disconnect unless a reconnect will resume it
+        if not self.keep_log_on_drop:
+            self._stop_pipeline()
+            self._close_log()
+            
+        for callback in list(self.disconnect_callbacks):
+            try:
+                callback(self)
+            except Exception as e:
+                print(f"Error in disconnect callback: {e}")
+    
+    def _open_log(self, resume_log):
+        """Start a new log file, or continue the open one with a gap marker"""
+        if resume_log and self.log_file:
+            gap = time.time() - self.disconnected_at if self.disconnected_at else 0.0
+            self._write_gap_marker(gap)
+        else:
+            self._start_new_log()
+        self.disconnected_at = None
+    
+    def _write_gap_marker(self, gap_seconds):
+        """Record a marker message for the time the link was down"""
+        marker = DLTMessage()
+        marker.app_id = "DLTV"
+        marker.ctx_id = "GAP"
+        marker.log_level = "WARN"
+        marker.payload = f"Connection gap: no data for {gap_seconds:.3f} s"
+        self._ingest_frames([marker.encode()])
+    
+    def _start_pipeline(self):
+        """Start the ingest pipeline and the bus (kept running across reconnects)"""
+        self.bus.start()
+        self.pipeline.start()
+    
+    def _stop_pipeline(self):
+        """Stop the ingest pipeline and the bus after delivering queued messages"""
+        self.pipeline.stop()
+        self.bus.stop()
+    
+    def _ingest_frames(self, frames):
+        """Record raw frames and queue them for decoding (receive thread)
+        
+        Frames are only decoded while someone listens; a recording-only
+        connection just writes them.
+        """
+        self._record_frames(frames)
+        if self.bus.subscriptions:
+            self.pipeline.submit(frames, time.time())
+    
+    def _record_frames(self, frames):
+        """Append raw frames to the log file
+        
+        Recording happens before the pipeline, so it stays complete even
+        when the live path sheds batches. Under traffic the file is flushed
+        at most every LOG_FLUSH_INTERVAL seconds instead of once per batch;
+        the receive loop calls _flush_log() when the link goes quiet.
+        """
+        with self.log_lock:
+            if not self.log_file:
+                return
+            try:
+                if self.log_file is self.recorder:
+                    self.recorder.write_frames(frames)
+                else:
+                    self.log_file.write(b"".join(frames))
+                self.log_dirty = True
+                if time.time() - self.last_log_flush >= self.LOG_FLUSH_INTERVAL:
+                    self._flush_log_locked()
+            except Exception as e:
+                print(f"Error writing to log file: {e}")
+    
+    def _flush_log(self):
+        """Flush recorded data that is still in the file buffer"""
+        with self.log_lock:
+            try:
+                self._flush_log_locked()
+            except Exception as e:
+                print(f"Error writing to log file: {e}")
+    
+    def _flush_log_locked(self):
+        """Flush the log file (log_lock held)"""
+        if self.log_file and self.log_dirty:
+            self.log_file.flush()
+            self.log_dirty = False
+        self.last_log_flush = time.time()
+    
+    def _close_log(self):
+        """Flush and close the current log file"""
+        with self.log_lock:
+            if self.log_file:
+                self.log_file.close()
+                self.log_file = None
+    
+    def _dispatch_messages(self, messages):
+        """Publish a decoded batch to listeners (pipeline delivery thread)"""
+        self.bus.publish(messages)
+    
+    def get_pipeline_stats(self):
+        """Get ingest pipeline throughput and backpressure statistics"""
+        return self.pipeline.get_stats()
+    
+    def get_loss_stats(self):
+        """Get message counter gap statistics of the received stream"""
+        return self.loss_tracker.get_stats()
+    
+    def get_subscriber_stats(self):
+        """Get lag and drop counters of every message listener"""
+        return self.bus.get_stats()
     
-    def add_callback(self, callback):
-        """Add callback for received messages"""
-        if callback not in self.callbacks:
-            self.callbacks.append(callback)
+    def add_disconnect_callback(self, callback):
+        """Add callback invoked (with the connection) when the link drops"""
+        if callback not in self.disconnect_callbacks:
+            self.disconnect_callbacks.append(callback)
+    
+    def remove_disconnect_callback(self, callback):
+        """Remove disconnect callback"""
+        if callback in self.disconnect_callbacks:
+            self.disconnect_callbacks.remove(callback)
+    
+    @property
+    def callbacks(self):
+        """Registered message callbacks"""
+        return self.bus.callbacks
+    
+    def add_callback(self, callback, policy=POLICY_DROP_OLDEST, maxsize=10000, name=None):
+        """Add callback for received messages
+        
+        Args:
+            callback: Called with each message from its own delivery thread
+            policy: Bus policy when the callback falls behind. The default
+                drops the oldest pending messages (never FATAL/ERROR);
+                POLICY_BLOCK is for consumers that must not lose messages
+                and can hold up the others for a bounded time.
+            maxsize: Messages that may queue up for this callback
+            name: Name shown in subscriber statistics
+        """
+        self.bus.subscribe(callback, policy=policy, maxsize=maxsize, name=name)
     
     def remove_callback(self, callback):
         """Remove message callback"""
-        if callback in self.callbacks:
-            self.callbacks.remove(callback)
+        self.bus.unsubscribe(callback)
             
     def clear_log(self):
         """Clear current log and start a new one"""
-        if self.log_file:
-            self.log_file.close()
-            self.log_file = None
+        self._close_log()
             
         if self.is_connected:
             self._start_new_log()
             
     def _start_new_log(self):
         """Start a new log file with timestamp"""
+        if self.recorder is not None:
+            try:
+                self.recorder.open()
+            except OSError as e:
+                print(f"Error creating log file: {e}")
+                return False
+            with self.log_lock:
+                self.log_file = self.recorder
+            return True
+            
         try:
             # Create logs directory if needed
             os.makedirs(self.log_dir, exist_ok=True)
@@ -139,11 +452,11 @@ class DLTConnection:
             filename = f"DLT_LOG_{timestamp}.dlt"
             filepath = os.path.join(self.log_dir, filename)
             
-            # Open new log file
-            self.log_file = open(filepath, 'wb')
-            
-            # Write DLT file header
-            self.log_file.write(b'DLT\1')  # Magic + version
+            # Open new log file and write DLT file header (magic + version)
+            log_file = open(filepath, 'wb')
+            log_file.write(b'DLT\1')
+            with self.log_lock:
+                self.log_file = log_file
             
             print(f"Started new log file: {filepath}")
             return True
@@ -2,10 +2,17 @@
 DLT Control Message Support
 """
 import struct
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
 from enum import IntEnum
+from .dlt_bus import POLICY_BLOCK
+from .dlt_message import DLTMessage
 
 class DLTControlMessageType(IntEnum):
     """DLT Control Message Types"""
+    SET_LOG_LEVEL = 0x01
     GET_LOG_INFO = 0x03
     GET_DEFAULT_LOG_LEVEL = 0x04
     SET_DEFAULT_LOG_LEVEL = 0x05
@@ -19,10 +26,156 @@ class DLTControlMessageType(IntEnum):
 class DLTControlMessage:
     """Class for handling DLT Control Messages"""
     
+    # Response bit set in the service id of replies (see get_response)
+    RESPONSE_FLAG = 0x1000
+    
+    # Message type info (low MSIN nibble) for control messages
+    CONTROL_REQUEST = 0x01
+    CONTROL_RESPONSE = 0x02
+    
+    # Response status codes
+    STATUS_OK = 0
+    STATUS_NOT_SUPPORTED = 1
+    STATUS_ERROR = 2
+    
+    # Log level value that resets a context to the default level
+    LOG_LEVEL_DEFAULT = -1
+    
+    # GET_LOG_INFO response status: the request option that was answered,
+    # or no matching context
+    LOG_INFO_WITH_LEVELS = 6
+    LOG_INFO_WITH_DESCRIPTIONS = 7
+    LOG_INFO_NO_MATCH = 8
+    
     def __init__(self, service_id, status=0):
         self.service_id = service_id
         self.status = status
         self.payload = b""
+    
+    @classmethod
+    def set_log_level(cls, app_id, ctx_id, level, ecu_id=""):
+        """Create a SET_LOG_LEVEL request
+        
+        Args:
+            app_id: Application ID
+            ctx_id: Context ID
+            level: Numeric log level (DLTMessage.LOG_* or LOG_LEVEL_DEFAULT)
+            ecu_id: Communication interface / ECU ID (optional)
+        """
+        msg = cls(DLTControlMessageType.SET_LOG_LEVEL)
+        msg.payload = (_id_bytes(app_id) + _id_bytes(ctx_id) +
+                       struct.pack("<b", level) + _id_bytes(ecu_id))
+        return msg
+    
+    @classmethod
+    def set_default_log_level(cls, level, ecu_id=""):
+        """Create a SET_DEFAULT_LOG_LEVEL request"""
+        msg = cls(DLTControlMessageType.SET_DEFAULT_LOG_LEVEL)
+        msg.payload = struct.pack("<b", level) + _id_bytes(ecu_id)
+        return msg
+    
+    @classmethod
+    def get_log_info(cls, app_id="", ctx_id="", options=7, ecu_id=""):
+        """Create a GET_LOG_INFO request (empty IDs query everything)"""
+        msg = cls(DLTControlMessageType.GET_LOG_INFO)
+        msg.payload = (struct.pack("<B", options) + _id_bytes(app_id) +
+                       _id_bytes(ctx_id) + _id_bytes(ecu_id))
+        return msg
+    
+    @property
+    def is_response(self):
+        """True if this is a response to a request"""
+        return bool(self.service_id & self.RESPONSE_FLAG)
+    
+    @property
+    def request_id(self):
+        """Service id of the request this message belongs to"""
+        return self.service_id & ~self.RESPONSE_FLAG
+    
+    def to_frame(self, counter=0, app_id="DLTV", ctx_id="CTRL"):
+        """Wrap the control message in a DLT message for sending"""
+        data = self.encode()
+        length = 4 + 10 + len(data)
+        header = (1 << 31) | ((counter & 0xFF) << 16) | length
+        info = self.CONTROL_RESPONSE if self.is_response else self.CONTROL_REQUEST
+        msin = (DLTMessage.MSG_TYPE_CONTROL << 4) | info
+        return (struct.pack("<IB", header, msin) + _id_bytes(app_id) +
+                _id_bytes(ctx_id) + b"\0" + data)
+    
+    @classmethod
+    def from_message(cls, message):
+        """Decode the control message carried by a received DLTMessage"""
+        if message.msg_type != "CONTROL" or not message.raw_data:
+            return None
+        header = struct.unpack("<I", bytes(message.raw_data[0:4]))[0]
+        offset = 14 if (header >> 31) & 0x01 else 4
+        return cls.decode(bytes(message.raw_data[offset:]))
+    
+    @classmethod
+    def log_info_response(cls, levels, options=LOG_INFO_WITH_LEVELS):
+        """Create a GET_LOG_INFO response (as sent by a daemon)
+        
+        Args:
+            levels: Dict of (app_id, ctx_id) -> log level
+            options: LOG_INFO_WITH_LEVELS or LOG_INFO_WITH_DESCRIPTIONS
+        """
+        apps = {}
+        for (app_id, ctx_id), level in levels.items():
+            apps.setdefault(app_id, []).append((ctx_id, level))
+        
+        payload = struct.pack("<H", len(apps))
+        for app_id, contexts in apps.items():
+            payload += _id_bytes(app_id) + struct.pack("<H", len(contexts))
+            for ctx_id, level in contexts:
+                payload += _id_bytes(ctx_id) + struct.pack("<bb", level, -1)
+                if options == cls.LOG_INFO_WITH_DESCRIPTIONS:
+                    payload += struct.pack("<H", 0)
+            if options == cls.LOG_INFO_WITH_DESCRIPTIONS:
+                payload += struct.pack("<H", 0)
+        
+        msg = cls(DLTControlMessageType.GET_LOG_INFO | cls.RESPONSE_FLAG, options)
+        msg.payload = payload + b"remo"
+        return msg
+    
+    def get_log_levels(self):
+        """Extract the context log levels from a GET_LOG_INFO response
+        
+        Returns:
+            Dict of (app_id, ctx_id) -> log level, empty if the response
+            carries no levels or is malformed
+        """
+        options = self.status
+        if options not in (self.LOG_INFO_WITH_LEVELS, self.LOG_INFO_WITH_DESCRIPTIONS):
+            return {}
+        
+        levels = {}
+        data = self.payload
+        try:
+            app_count = struct.unpack_from("<H", data, 0)[0]
+            pos = 2
+            for _ in range(app_count):
+                app_id = data[pos:pos + 4].decode('ascii', 'replace').strip('\0')
+                ctx_count = struct.unpack_from("<H", data, pos + 4)[0]
+                pos += 6
+                for _ in range(ctx_count):
+                    ctx_id = data[pos:pos + 4].decode('ascii', 'replace').strip('\0')
+                    level = struct.unpack_from("<b", data, pos + 4)[0]
+                    pos += 6
+                    if options == self.LOG_INFO_WITH_DESCRIPTIONS:
+                        pos += 2 + struct.unpack_from("<H", data, pos)[0]
+                    levels[(app_id, ctx_id)] = level
+                if options == self.LOG_INFO_WITH_DESCRIPTIONS:
+                    pos += 2 + struct.unpack_from("<H", data, pos)[0]
+        except struct.error:
+            return {}
+        return levels
+    
+    def get_software_version(self):
+        """Extract the version string from a GET_SOFTWARE_VERSION response"""
+        if len(self.payload) < 4:
+            return ""
+        length = struct.unpack("<I", self.payload[:4])[0]
+        return self.payload[4:4 + length].decode('ascii', 'replace').rstrip('\0')
         
     def encode(self):
         """Encode control message to bytes"""
@@ -42,4 +195,187 @@ class DLTControlMessage:
         
     def get_response(self):
         """Create response message"""
-        return DLTControlMessage(self.service_id | 0x1000, self.status)
\ No newline at end of file
+        return DLTControlMessage(self.service_id | 0x1000, self.status)
+
+def _id_bytes(id_str):
+    """Encode a DLT ID as 4 zero-padded ASCII bytes"""
+    return id_str.encode('ascii', 'replace')[:4].ljust(4, b'\0')
+
+class DLTControlClient:
+    """
+    Sends control requests over a DLTConnection and matches the responses
+
+    Requests are pipelined: they are written without waiting for earlier
+    replies, and each returns a Future. Responses are correlated to the
+    oldest outstanding request with the same service id (the daemon answers
+    in order). Requests that get no answer within the timeout fail with
+    TimeoutError.
+    """
+    
+    def __init__(self, connection, timeout=2.0):
+        """Initialize the client and start listening for responses
+        
+        Args:
+            connection: Connected DLTConnection
+            timeout: Default response timeout in seconds
+        """
+        self.connection = connection
+        self.timeout = timeout
+        self.counter = 0
+        self.pending = {}  # service id -> deque of [future, deadline, timeout]
+        self.lock = threading.Lock()
+        self.reaper_thread = None
+        self.stop_reaper = threading.Event()
+        # Replies must not be dropped when the live stream floods the bus
+        self.connection.add_callback(self._on_message, policy=POLICY_BLOCK, name="control")
+    
+    def close(self):
+        """Stop listening and fail all outstanding requests"""
+        self.connection.remove_callback(self._on_message)
+        self.stop_reaper.set()
+        with self.lock:
+            pending, self.pending = self.pending, {}
+        for entries in pending.values():
+            for future, _, _ in entries:
+                if not future.done():
+                    future.set_exception(ConnectionError("Control client closed"))
+    
+    def send_request(self, request, timeout=None):
+        """Send a single request
+        
+        Returns:
+            Future resolving to the response DLTControlMessage
+        """
+        return self.send_requests([request], timeout)[0]
+    
+    def send_requests(self, requests, timeout=None):
+        """Send several requests in one write without waiting for replies
+        
+        Returns:
+            List of Futures, one per request, in request order
+        """
+        if timeout is None:
+            timeout = self.timeout
+        deadline = time.time() + timeout
+        futures = []
+        frames = []
+        
+        with self.lock:
+            for request in requests:
+                future = Future()
+                future.set_running_or_notify_cancel()
+                self.pending.setdefault(request.service_id, deque()).append([future, deadline, timeout])
+                futures.append(future)
+                frames.append(request.to_frame(self.counter))
+                self.counter = (self.counter + 1) & 0xFF
+        
+        self._ensure_reaper()
+        try:
+            self.connection.send(b"".join(frames))
+        except Exception as e:
+            self._fail(futures, e)
+        return futures
+    
+    def set_log_level(self, app_id, ctx_id, level, timeout=None):
+        """Set the log level of one context"""
+        return self.send_request(DLTControlMessage.set_log_level(app_id, ctx_id, level), timeout)
+    
+    def set_log_levels(self, levels, timeout=None):
+        """Set log levels of many contexts in one pipelined batch
+        
+        Args:
+            levels: Iterable of (app_id, ctx_id, level) tuples
+        
+        Returns:
+            List of Futures in the order of levels
+        """
+        requests = [DLTControlMessage.set_log_level(app, ctx, level) for app, ctx, level in levels]
+        return self.send_requests(requests, timeout)
+    
+    def set_default_log_level(self, level, timeout=None):
+        """Set the ECU's default log level"""
+        return self.send_request(DLTControlMessage.set_default_log_level(level), timeout)
+    
+    def get_log_info(self, app_id="", ctx_id="", timeout=None):
+        """Query registered applications/contexts and their levels"""
+        return self.send_request(DLTControlMessage.get_log_info(app_id, ctx_id), timeout)
+    
+    def get_software_version(self, timeout=None):
+        """Query the daemon software version"""
+        return self.send_request(
+            DLTControlMessage(DLTControlMessageType.GET_SOFTWARE_VERSION), timeout
+        )
+    
+    @staticmethod
+    def wait_all(futures, timeout=None):
+        """Wait for all futures and return their responses (or exceptions)"""
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result(timeout))
+            except Exception as e:
+                results.append(e)
+        return results
+    
+    def _on_message(self, message):
+        """Match a received control response to its request"""
+        if message.msg_type != "CONTROL":
+            return
+        response = DLTControlMessage.from_message(message)
+        if response is None or not response.is_response:
+            return
+        
+        with self.lock:
+            entries = self.pending.get(response.request_id)
+            if not entries:
+                return
+            future = entries.popleft()[0]
+            if not entries:
+                del self.pending[response.request_id]
+        
+        # A late reply to a request that already timed out is discarded
+        if not future.done():
+            future.set_result(response)
+    
+    def _ensure_reaper(self):
+        """Start the timeout thread if it is not running"""
+        if self.reaper_thread is None or not self.reaper_thread.is_alive():
+            self.stop_reaper.clear()
+            self.reaper_thread = threading.Thread(target=self._reap_timeouts)
+            self.reaper_thread.daemon = True
+            self.reaper_thread.start()
+    
+    def _reap_timeouts(self):
+        """Fail requests whose deadline passed
+        
+        Timed out requests stay queued for one more period of their own
+        timeout, so a late reply still lines up with its own request
+        instead of being matched to the next one.
+        """
+        while not self.stop_reaper.wait(0.05):
+            now = time.time()
+            expired = []
+            with self.lock:
+                for service_id in list(self.pending):
+                    entries = self.pending[service_id]
+                    # Per-request timeouts differ, so deadlines are not ordered
+                    for future, deadline, _ in entries:
+                        if deadline <= now and not future.done():
+                            expired.append(future)
+                    # Replies arrive in order: only the head can be retired
+                    while entries and entries[0][1] + entries[0][2] < now:
+                        entries.popleft()
+                    if not entries:
+                        del self.pending[service_id]
+                if not self.pending:
+                    self.reaper_thread = None
+            
+            self._fail(expired, TimeoutError("Control request timed out"))
+            if self.reaper_thread is None:
+                return
+    
+    def _fail(self, futures, error):
+        """Fail futures that are still outstanding"""
+        for future in futures:
+            if not future.done():
+                future.set_exception(error)
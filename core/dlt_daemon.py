@@ -0,0 +1,130 @@
+"""
+DLT Recorder Daemon - Headless multi-ECU recording
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from .dlt_connection import DLTConnection
+from .dlt_recorder import DLTRecorder
+from .lifecycle_manager import DLTLifecycleManager
+from utils.config import get_setting
+from utils.logger import get_logger
+
+class DLTRecorderDaemon:
+    """
+    Records every configured ECU without a user interface
+
+    Each ECU gets its own connection, rotating indexed recorder and
+    lifecycle manager, which connects in the background and reconnects
+    with backoff. Nobody subscribes to the decoded messages, so frames are
+    written without being decoded. A JSON status file is rewritten every
+    status_interval seconds; apart from that the main thread sleeps.
+    """
+
+    def __init__(self, ecus, config, output_dir=None, status_file=None):
+        """Initialize the daemon
+
+        Args:
+            ecus: ECUConfig objects to record (entries without an IP are skipped)
+            config: Application configuration (recorder.* and connection.* settings)
+            output_dir: Directory for the recordings (one subdirectory per ECU)
+            status_file: Path of the JSON status file
+        """
+        self.logger = get_logger()
+        self.config = config
+        self.output_dir = os.path.expanduser(
+            output_dir or get_setting(config, "recorder.output_dir", "~/dlt_records")
+        )
+        self.status_file = os.path.expanduser(
+            status_file or get_setting(config, "recorder.status_file",
+                                       os.path.join(self.output_dir, "status.json"))
+        )
+        self.status_interval = get_setting(config, "recorder.status_interval", 5.0)
+        self.ecus = [ecu for ecu in ecus if ecu.ip_address]
+        self.started_at = None
+        self.recorders = {}
+        self.connections = {}
+        self.lifecycles = {}
+        self._stop_event = threading.Event()
+
+    def start(self):
+        """Start recording every ECU"""
+        self.started_at = time.time()
+        self._stop_event.clear()
+        for ecu in self.ecus:
+            recorder = DLTRecorder(
+                os.path.join(self.output_dir, ecu.ecu_id),
+                prefix=ecu.ecu_id,
+                max_bytes=get_setting(self.config, "recorder.max_file_mb", 256) * 1024 * 1024,
+                max_seconds=get_setting(self.config, "recorder.max_file_minutes", 60) * 60,
+                index_block_size=get_setting(self.config, "recorder.index_block_size", 1000)
+            )
+            connection = DLTConnection(ecu.ip_address, ecu.tcp_port)
+            connection.connect_timeout = get_setting(
+                self.config, "connection.connect_timeout", DLTConnection.CONNECT_TIMEOUT
+            )
+            connection.recorder = recorder
+
+            # The lifecycle manager makes the first attempt as well, so an
+            # ECU that is still booting is picked up when it comes online
+            lifecycle = DLTLifecycleManager(connection)
+            self.recorders[ecu.ecu_id] = recorder
+            self.connections[ecu.ecu_id] = connection
+            self.lifecycles[ecu.ecu_id] = lifecycle
+            lifecycle.start()
+            self.logger.info(f"Recording {ecu.ecu_id} from {ecu.ip_address}:{ecu.tcp_port}")
+
+    def run(self):
+        """Write the status file periodically until stop() is called"""
+        if self.started_at is None:
+            self.start()
+        try:
+            while not self._stop_event.wait(self.status_interval):
+                self.write_status()
+        finally:
+            self.shutdown()
+
+    def stop(self):
+        """Ask run() to return (safe to call from a signal handler)"""
+        self._stop_event.set()
+
+    def shutdown(self):
+        """Disconnect all ECUs and close their recordings"""
+        for lifecycle in self.lifecycles.values():
+            lifecycle.stop()
+        for connection in self.connections.values():
+            connection.disconnect()
+        self.write_status()
+        self.logger.info("Recorder stopped")
+
+    def get_status(self):
+        """Get connection, recording and loss status of every ECU"""
+        ecus = {}
+        for ecu_id, connection in self.connections.items():
+            ecus[ecu_id] = {
+                "address": f"{connection.host}:{connection.port}",
+                "connected": connection.is_connected,
+                "recording": self.recorders[ecu_id].get_stats(),
+                "loss": {key: value for key, value in connection.get_loss_stats().items()
+                         if key != "streams"},
+                "lifecycle": self.lifecycles[ecu_id].get_metrics()
+            }
+        return {
+            "updated": datetime.now().isoformat(),
+            "started": datetime.fromtimestamp(self.started_at).isoformat() if self.started_at else None,
+            "pid": os.getpid(),
+            "ecus": ecus
+        }
+
+    def write_status(self):
+        """Write the status file atomically"""
+        try:
+            os.makedirs(os.path.dirname(self.status_file) or ".", exist_ok=True)
+            temp_path = self.status_file + ".tmp"
+            with open(temp_path, "w") as f:
+                json.dump(self.get_status(), f, indent=2)
+            os.replace(temp_path, self.status_file)
+        except OSError as e:
+            self.logger.error(f"Error writing status file: {e}")
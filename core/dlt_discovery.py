@@ -0,0 +1,119 @@
+"""
+DLT Network Discovery - Concurrent scanning for DLT daemons
+"""
+import asyncio
+import ipaddress
+import threading
+
+class DLTNetworkScanner:
+    """Concurrent TCP port scanner for finding DLT devices
+
+    Probes are non-blocking connects driven by an asyncio event loop, with
+    at most `concurrency` connects in flight. Results are reported through
+    a callback as soon as each open port is found.
+    """
+
+    def __init__(self, networks=("192.168.1.0/24",), ports=(3490, 3491),
+                 concurrency=256, timeout=0.3, include_localhost=True):
+        """Initialize the scanner
+
+        Args:
+            networks: Iterable of CIDR strings (or single addresses) to scan
+            ports: Iterable of TCP ports to probe on each host
+            concurrency: Maximum number of simultaneous connection attempts
+            timeout: Connect timeout per probe in seconds
+            include_localhost: Also probe localhost
+        """
+        self.networks = [ipaddress.ip_network(n.strip(), strict=False) for n in networks]
+        self.ports = [int(p) for p in ports]
+        self.concurrency = max(1, int(concurrency))
+        self.timeout = timeout
+        self.include_localhost = include_localhost
+        self.total = 0
+        self.probed = 0
+        self.found = 0
+        self._cancel = threading.Event()
+
+    def iter_targets(self):
+        """Yield (host, port) pairs to probe, without duplicates"""
+        hosts = []
+        if self.include_localhost:
+            hosts.append("localhost")
+        seen = set()
+        for network in self.networks:
+            # hosts() skips network/broadcast addresses, except for /31 and /32
+            for addr in (network.hosts() if network.num_addresses > 2 else network):
+                host = str(addr)
+                if host not in seen:
+                    seen.add(host)
+                    hosts.append(host)
+
+        for port in self.ports:
+            for host in hosts:
+                yield host, port
+
+    def count_targets(self):
+        """Number of probes a scan will perform"""
+        hosts = sum(
+            n.num_addresses - 2 if n.num_addresses > 2 else n.num_addresses
+            for n in self.networks
+        )
+        if self.include_localhost:
+            hosts += 1
+        return hosts * len(self.ports)
+
+    def cancel(self):
+        """Stop a running scan as soon as in-flight probes finish"""
+        self._cancel.set()
+
+    @property
+    def is_cancelled(self):
+        return self._cancel.is_set()
+
+    def scan(self, on_found):
+        """Run the scan in the calling thread
+
+        Args:
+            on_found: Callback invoked with (host, port) for every open port.
+                Called from the scanning thread.
+        """
+        self._cancel.clear()
+        self.total = self.count_targets()
+        self.probed = 0
+        self.found = 0
+        asyncio.run(self._scan(on_found))
+
+    async def _scan(self, on_found):
+        """Probe all targets with a fixed pool of worker coroutines"""
+        targets = self.iter_targets()
+        workers = [
+            asyncio.ensure_future(self._worker(targets, on_found))
+            for _ in range(min(self.concurrency, max(1, self.total)))
+        ]
+        await asyncio.gather(*workers)
+
+    async def _worker(self, targets, on_found):
+        """Probe targets from the shared iterator until it is exhausted"""
+        for host, port in targets:
+            if self._cancel.is_set():
+                return
+            if await self._probe(host, port):
+                self.found += 1
+                on_found(host, port)
+            self.probed += 1
+
+    async def _probe(self, host, port):
+        """Check whether a TCP connection to host:port can be established"""
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port), self.timeout
+            )
+        except (OSError, asyncio.TimeoutError):
+            return False
+
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return True
@@ -0,0 +1,195 @@
+"""
+DLT Filter Cache - Cached and incrementally refined filter results
+"""
+import threading
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from .dlt_filter_engine import compile_filter, search_columns
+
+class _CachedResult:
+    """Result of one filter/search query over the first count positions"""
+
+    __slots__ = ("spec", "search", "positions", "count")
+
+    def __init__(self, spec, search, positions, count):
+        self.spec = spec
+        self.search = search
+        self.positions = array('I', positions)
+        self.count = count
+
+    @property
+    def size(self):
+        return len(self.positions) * self.positions.itemsize
+
+    def contains(self, spec, search):
+        """True if this result is a superset of the result of (spec, search)"""
+        if not spec.narrows(self.spec):
+            return False
+        return self.search is None or (search is not None and self.search in search)
+
+class DLTFilterCache:
+    """
+    LRU cache of filter and search results over one DLTMessageColumns
+
+    Results are keyed by the normalized FilterSpec plus the casefolded
+    toolbar search text. A query missing the cache is evaluated over the
+    smallest cached result it narrows (one more typed character, one more
+    unchecked context) instead of over all messages. Results of an
+    append-only live store are brought up to date by evaluating only the
+    positions added since. Stored positions are 32-bit arrays; the least
+    recently used results are evicted beyond max_bytes.
+
+    Queries can be evaluated in chunks, reporting each chunk's matches as
+    they are found and stopping early when cancelled; a cancelled query
+    leaves nothing in the cache. Regex-heavy queries over a large loaded
+    file are handed to an optional DLTParallelFilter instead.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, parallel=None):
+        self.max_bytes = max_bytes
+        self.parallel = parallel
+        self.columns = None
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.stats = {"hits": 0, "refinements": 0, "misses": 0, "evictions": 0}
+        # Queries may run on a worker thread while the view clears the cache
+        self._lock = threading.RLock()
+
+    def clear(self):
+        """Drop all results"""
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        self.columns = None
+        self.entries.clear()
+        self.bytes = 0
+
+    def query(self, columns, spec, search=None, count=None, cancel=None,
+              on_partial=None, chunk_size=None):
+        """Get the positions matching a filter spec and a toolbar search
+
+        Args:
+            columns: DLTMessageColumns to evaluate over
+            spec: FilterSpec of the filter panel
+            search: Toolbar search text (None or empty for no search)
+            count: Evaluate only the first count positions (None for all)
+            cancel: Optional threading.Event; when set, evaluation stops at
+                the next chunk and None is returned
+            on_partial: Optional callback receiving each chunk's matches
+                as they are found
+            chunk_size: Positions per chunk (None for a single chunk)
+
+        Returns:
+            New list of matching positions in ascending order, or None if
+            cancelled
+        """
+        search = search.casefold() if search else None
+        total = len(columns) if count is None else min(count, len(columns))
+        if search is None and spec.is_empty():
+            return self._publish(list(range(total)), on_partial)
+        key = (spec.key(), search)
+
+        # Only the lookup and the store hold the lock, not the evaluation
+        with self._lock:
+            if columns is not self.columns:
+                self._clear()
+                self.columns = columns
+            entry = self.entries.get(key)
+            if entry is not None and entry.count >= total:
+                self.stats["hits"] += 1
+                self.entries.move_to_end(key)
+                positions = list(entry.positions)
+                if entry.count > total:
+                    positions = positions[:bisect_left(positions, total)]
+                return self._publish(positions, on_partial)
+
+            # Segments of (candidates, whether the spec is already applied)
+            if entry is not None:
+                # Up to date except for positions appended since
+                self.stats["hits"] += 1
+                positions = list(entry.positions)
+                self._publish(list(positions), on_partial)
+                segments = [(range(entry.count, total), False)]
+            else:
+                base = self._find_base(spec, search)
+                positions = []
+                if base is not None:
+                    self.stats["refinements"] += 1
+                    # The base already applied the spec to its own positions if
+                    # only the search grew; positions appended since need it
+                    segments = [(list(base.positions), base.spec.key() == spec.key()),
+                                (range(base.count, total), False)]
+                else:
+                    self.stats["misses"] += 1
+                    segments = [(range(total), False)]
+
+        candidate_count = sum(len(candidates) for candidates, _ in segments)
+        if self.parallel is not None and self.parallel.applies(columns, spec, search, candidate_count):
+            candidates = []
+            for part, _ in segments:
+                candidates.extend(part)
+            part = self.parallel.evaluate(columns, spec, search, candidates, cancel, on_partial)
+            if part is None:
+                return None
+            positions.extend(part)
+        else:
+            for candidates, skip_spec in segments:
+                size = chunk_size or max(1, len(candidates))
+                for start in range(0, len(candidates), size):
+                    if cancel is not None and cancel.is_set():
+                        return None
+                    part = self._evaluate(columns, spec, search, candidates[start:start + size], skip_spec)
+                    positions.extend(part)
+                    if part and on_partial is not None:
+                        on_partial(part)
+
+        with self._lock:
+            if columns is self.columns:
+                self._store(key, spec, search, positions, total)
+        return positions
+
+    @staticmethod
+    def _publish(positions, on_partial):
+        """Report a result computed in one piece"""
+        if positions and on_partial is not None:
+            on_partial(positions)
+        return positions
+
+    def _find_base(self, spec, search):
+        """Smallest cached result containing the result of the query"""
+        best = None
+        for entry in self.entries.values():
+            if entry.contains(spec, search) and (best is None or len(entry.positions) < len(best.positions)):
+                best = entry
+        return best
+
+    @staticmethod
+    def _evaluate(columns, spec, search, candidates, skip_spec=False):
+        """Evaluate the query over candidate positions"""
+        positions = candidates
+        if not skip_spec and not spec.is_empty():
+            positions = compile_filter(spec).filter(columns, positions)
+        if search is not None:
+            positions = search_columns(columns, search, positions)
+        return positions if isinstance(positions, list) else list(positions)
+
+    def _store(self, key, spec, search, positions, count):
+        """Cache a result and evict beyond the memory budget"""
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old.size
+        entry = _CachedResult(spec, search, positions, count)
+        if entry.size > self.max_bytes:
+            return
+        self.entries[key] = entry
+        self.bytes += entry.size
+        while self.bytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes -= evicted.size
+            self.stats["evictions"] += 1
+
+    def get_stats(self):
+        """Get cache statistics"""
+        return dict(self.stats, entries=len(self.entries), bytes=self.bytes)
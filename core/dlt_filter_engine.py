@@ -0,0 +1,314 @@
+"""
+DLT Filter Engine - Filter specs compiled into specialized predicates
+"""
+import re
+from .dlt_columns import DLTMessageColumns
+from .dlt_regex import required_literals
+
+class FilterSpec:
+    """
+    Normalized, hashable description of a message filter
+
+    Empty selections mean "no restriction", as in the filter panel and
+    DLTFilter. Two specs selecting the same messages in the same way have
+    the same key().
+    """
+
+    CATEGORICAL = ("ecu_ids", "app_ids", "ctx_ids", "log_levels", "msg_types")
+
+    # Message attribute and column of each categorical criterion
+    FIELDS = {
+        "ecu_ids": "ecu_id",
+        "app_ids": "app_id",
+        "ctx_ids": "ctx_id",
+        "log_levels": "log_level",
+        "msg_types": "msg_type"
+    }
+
+    def __init__(self, ecu_ids=None, app_ids=None, ctx_ids=None, log_levels=None,
+                 msg_types=None, time_start=None, time_end=None, payload_text=None,
+                 case_sensitive=False, regex=None, regex_flags=0, query=None):
+        self.ecu_ids = frozenset(ecu_ids) if ecu_ids else None
+        self.app_ids = frozenset(app_ids) if app_ids else None
+        self.ctx_ids = frozenset(ctx_ids) if ctx_ids else None
+        self.log_levels = frozenset(log_levels) if log_levels else None
+        self.msg_types = frozenset(msg_types) if msg_types else None
+        self.time_start = time_start or None
+        self.time_end = time_end or None
+        self.payload_text = payload_text or None
+        self.case_sensitive = bool(case_sensitive) if payload_text else False
+        self.regex = regex or None
+        self.regex_flags = regex_flags if regex else 0
+        self.query = query.strip() if query and query.strip() else None
+
+    @classmethod
+    def from_config(cls, filter_config):
+        """Create from the filter panel's configuration dictionary"""
+        filter_config = filter_config or {}
+        return cls(
+            ecu_ids=filter_config.get("ecu"),
+            app_ids=filter_config.get("app_id"),
+            ctx_ids=filter_config.get("ctx_id"),
+            log_levels=filter_config.get("log_level"),
+            msg_types=filter_config.get("msg_type"),
+            time_start=filter_config.get("time_start"),
+            time_end=filter_config.get("time_end"),
+            payload_text=filter_config.get("payload_text"),
+            case_sensitive=filter_config.get("case_sensitive", False),
+            regex=filter_config.get("regex"),
+            query=filter_config.get("query")
+        )
+
+    @classmethod
+    def from_filter(cls, dlt_filter):
+        """Create from a DLTFilter"""
+        regex = dlt_filter.regex_pattern
+        return cls(
+            ecu_ids=dlt_filter.ecu_ids,
+            app_ids=dlt_filter.app_ids,
+            ctx_ids=dlt_filter.ctx_ids,
+            log_levels=dlt_filter.log_levels,
+            time_start=dlt_filter.time_start,
+            time_end=dlt_filter.time_end,
+            payload_text=dlt_filter.payload_text,
+            case_sensitive=dlt_filter.case_sensitive,
+            regex=regex.pattern if regex is not None else None,
+            regex_flags=regex.flags & ~re.UNICODE if regex is not None else 0
+        )
+
+    def key(self):
+        """Hashable key identifying the filter"""
+        return (self.ecu_ids, self.app_ids, self.ctx_ids, self.log_levels, self.msg_types,
+                self.time_start, self.time_end, self.payload_text, self.case_sensitive,
+                self.regex, self.regex_flags, self.query)
+
+    def is_empty(self):
+        """True if the spec lets every message through"""
+        return self.key() == FilterSpec().key()
+
+    def narrows(self, other):
+        """True if every message matching this spec also matches other
+
+        A narrowing spec can be evaluated over the result of the wider
+        one instead of over all messages.
+        """
+        for name in self.CATEGORICAL:
+            wide = getattr(other, name)
+            narrow = getattr(self, name)
+            if wide is not None and (narrow is None or not narrow <= wide):
+                return False
+        if other.time_start is not None and (self.time_start is None or self.time_start < other.time_start):
+            return False
+        if other.time_end is not None and (self.time_end is None or self.time_end > other.time_end):
+            return False
+        if other.payload_text is not None:
+            if self.payload_text is None:
+                return False
+            if other.case_sensitive:
+                if not self.case_sensitive or other.payload_text not in self.payload_text:
+                    return False
+            elif other.payload_text.casefold() not in self.payload_text.casefold():
+                return False
+        if other.regex is not None and (self.regex, self.regex_flags) != (other.regex, other.regex_flags):
+            return False
+        if other.query is not None and self.query != other.query:
+            return False
+        return True
+
+    def __eq__(self, other):
+        return isinstance(other, FilterSpec) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        active = {name: value for name, value in vars(self).items()
+                  if value not in (None, False, 0)}
+        return f"FilterSpec({active})"
+
+class CompiledFilter:
+    """
+    A filter spec compiled for repeated evaluation
+
+    matches() is generated code containing only the active criteria, with
+    needles casefolded and value sets frozen once. filter() runs over a
+    DLTMessage sequence or over DLTMessageColumns; on columns the
+    categorical criteria are answered by the bitmap index (or, when
+    refining given candidates, by lookups of precomputed code tables), time
+    ranges by binary search or block min/max skipping (DLTTimeIndex), a
+    trigram index narrows text and regex criteria to candidate blocks, and
+    every other criterion is one tight pass over the surviving positions,
+    cheapest first. A query (see DLTQuery) runs its own plan over the
+    positions left. Messages checked one by one with matches(message,
+    reference) take the reference_time() of their columns, so that the
+    clock times of a query fall on the same day either way.
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.needle = None
+        if spec.payload_text:
+            self.needle = spec.payload_text if spec.case_sensitive else spec.payload_text.casefold()
+        self.regex = re.compile(spec.regex, spec.regex_flags) if spec.regex else None
+        self.query = None
+        if spec.query:
+            # Imported here: the query planner evaluates its predicates with FilterSpecs
+            from .dlt_query import DLTQuery
+            self.query = DLTQuery(spec.query)
+        # Substrings every match contains, for narrowing by a trigram index
+        self.literals = [spec.payload_text] if spec.payload_text else []
+        if spec.regex:
+            self.literals.extend(required_literals(spec.regex, spec.regex_flags))
+        self.matches = self._compile_predicate()
+
+    def _compile_predicate(self):
+        """Generate a predicate for just the active criteria"""
+        spec = self.spec
+        namespace = {}
+        terms = []
+        for name in FilterSpec.CATEGORICAL:
+            values = getattr(spec, name)
+            if values is not None:
+                namespace[f"_{name}"] = values
+                terms.append(f"m.{FilterSpec.FIELDS[name]} in _{name}")
+        if spec.time_start is not None:
+            namespace["_time_start"] = spec.time_start
+            terms.append("m.timestamp >= _time_start")
+        if spec.time_end is not None:
+            namespace["_time_end"] = spec.time_end
+            terms.append("m.timestamp <= _time_end")
+        if self.needle is not None:
+            namespace["_needle"] = self.needle
+            terms.append("_needle in m.payload" if spec.case_sensitive
+                         else "_needle in m.payload.casefold()")
+        if self.regex is not None:
+            namespace["_search"] = self.regex.search
+            terms.append("_search(m.payload) is not None")
+        if self.query is not None:
+            namespace["_query"] = self.query.matches
+            terms.append("_query(m, _reference)")
+
+        # reference: day of the clock times of a query (see reference_time)
+        source = "lambda m, _reference=None: " + (" and ".join(terms) if terms else "True")
+        return eval(source, namespace)
+
+    def filter(self, store, candidates=None):
+        """Get the positions of matching messages
+
+        Args:
+            store: DLTMessageColumns or a sequence of DLTMessage
+            candidates: Ascending positions to consider (None for all)
+
+        Returns:
+            List of matching positions in ascending order
+        """
+        if isinstance(store, DLTMessageColumns):
+            return self.filter_columns(store, candidates)
+        if candidates is None:
+            candidates = range(len(store))
+        if self.spec.is_empty():
+            return list(candidates)
+        matches = self.matches
+        # Clock times of a query fall on the first message's day, as over columns
+        reference = store[0].timestamp if self.query is not None and len(store) else None
+        return [i for i in candidates if matches(store[i], reference)]
+
+    def filter_columns(self, columns, candidates=None):
+        """Evaluate the filter over a columnar store"""
+        spec = self.spec
+        criteria = {FilterSpec.FIELDS[name]: getattr(spec, name)
+                    for name in FilterSpec.CATEGORICAL if getattr(spec, name) is not None}
+
+        timed = spec.time_start is not None or spec.time_end is not None
+        times = columns.times() if timed else None
+        whole = candidates is None or (isinstance(candidates, range) and candidates.step == 1)
+        if timed and whole and times.sorted:
+            # Sorted timestamps turn the time range into a position range
+            candidates = times.select(spec.time_start, spec.time_end, candidates)
+            timed = False
+
+        if criteria and whole:
+            # Categorical criteria are answered by the bitmap index
+            start, stop = (0, None) if candidates is None else (candidates.start, candidates.stop)
+            positions = columns.bitmaps().select({
+                field: columns.code_set(field, values) for field, values in criteria.items()
+            }, start, stop)
+        else:
+            positions = range(len(columns)) if candidates is None else candidates
+            for field, values in criteria.items():
+                allowed = self.code_table(columns, field, values)
+                codes = columns.codes[field]
+                positions = [i for i in positions if allowed[codes[i]]]
+
+        if timed:
+            positions = times.select(spec.time_start, spec.time_end, positions)
+
+        if self.literals and columns.trigrams is not None:
+            positions = columns.trigrams.candidates(self.literals, positions)
+
+        if self.needle is not None:
+            needle = self.needle
+            payloads = columns.payloads if spec.case_sensitive else columns.folded_payloads()
+            positions = [i for i in positions if needle in payloads[i]]
+        if self.regex is not None:
+            search = self.regex.search
+            payloads = columns.payloads
+            positions = [i for i in positions if search(payloads[i])]
+
+        if self.query is not None:
+            positions = self.query.evaluate(columns, positions)
+
+        return positions if isinstance(positions, list) else list(positions)
+
+    @staticmethod
+    def code_table(columns, field, values):
+        """Lookup table with 1 for the codes of the allowed values"""
+        allowed = bytearray(len(columns.values[field]))
+        for code in columns.code_set(field, values):
+            allowed[code] = 1
+        return allowed
+
+_compiled_cache = {}
+
+def compile_filter(spec):
+    """Compile a FilterSpec (recently compiled specs are reused)"""
+    key = spec.key()
+    compiled = _compiled_cache.get(key)
+    if compiled is None:
+        if len(_compiled_cache) >= 64:
+            _compiled_cache.clear()
+        compiled = _compiled_cache[key] = CompiledFilter(spec)
+    return compiled
+
+def search_columns(columns, text, positions=None):
+    """Get the positions whose payload, app ID or context ID contains text
+
+    This is the toolbar search: case-insensitive and not a filter spec of
+    its own, since it matches any of three fields.
+
+    Args:
+        columns: DLTMessageColumns to search
+        text: Text to look for
+        positions: Ascending positions to search (None for all)
+
+    Returns:
+        List of matching positions in ascending order
+    """
+    hits = compile_filter(FilterSpec(payload_text=text)).filter(columns, positions)
+
+    # IDs are few distinct values: match the values, then take their positions
+    needle = text.casefold()
+    id_hits = set()
+    for field in ("app_id", "ctx_id"):
+        codes = {code for code, value in enumerate(columns.values[field])
+                 if needle in value.casefold()}
+        if codes:
+            if isinstance(positions, range):
+                id_hits.update(columns.bitmaps().select({field: codes}, positions.start, positions.stop))
+            else:
+                id_hits.update(columns.bitmaps().select({field: codes}))
+    if not id_hits:
+        return hits
+    if positions is not None and not isinstance(positions, range):
+        id_hits.intersection_update(positions)
+    return sorted(id_hits.union(hits))
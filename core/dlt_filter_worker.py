@@ -0,0 +1,77 @@
+"""
+DLT Filter Worker - Cancellable background evaluation of filter queries
+"""
+import threading
+from utils.logger import get_logger
+
+class DLTFilterWorker:
+    """
+    Evaluates filter queries on a background thread
+
+    Submitting a query cancels the one in flight: it stops at its next
+    chunk boundary without reporting further results, so only the newest
+    query's results reach the view. Matches are reported chunk by chunk
+    through on_partial as they are found, then on_done receives the full
+    result. Callbacks run on the worker thread; UI callers hand them over
+    to their own thread.
+    """
+
+    CHUNK_SIZE = 4 * 65536
+
+    def __init__(self, cache, chunk_size=CHUNK_SIZE):
+        """Initialize the worker
+
+        Args:
+            cache: DLTFilterCache the queries are evaluated through
+            chunk_size: Positions evaluated between cancellation checks
+        """
+        self.logger = get_logger()
+        self.cache = cache
+        self.chunk_size = chunk_size
+        self._cancel = None
+
+    def submit(self, columns, spec, search=None, on_partial=None, on_done=None):
+        """Start a query, cancelling the one in flight
+
+        Args:
+            columns: DLTMessageColumns to evaluate over
+            spec: FilterSpec to apply
+            search: Toolbar search text
+            on_partial: Callback receiving each chunk's matching positions
+            on_done: Callback receiving all matching positions
+
+        Returns:
+            threading.Event cancelling this query when set
+        """
+        self.cancel()
+        cancel = self._cancel = threading.Event()
+        # Positions appended after submission are left to the caller
+        count = len(columns)
+        thread = threading.Thread(
+            target=self._run,
+            args=(columns, spec, search, count, cancel, on_partial, on_done),
+            daemon=True
+        )
+        thread.start()
+        return cancel
+
+    def cancel(self):
+        """Cancel the query in flight, if any"""
+        if self._cancel is not None:
+            self._cancel.set()
+            self._cancel = None
+
+    def _run(self, columns, spec, search, count, cancel, on_partial, on_done):
+        """Evaluate one query (worker thread)"""
+        def partial(positions):
+            if not cancel.is_set() and on_partial is not None:
+                on_partial(positions)
+
+        try:
+            positions = self.cache.query(columns, spec, search, count=count, cancel=cancel,
+                                         on_partial=partial, chunk_size=self.chunk_size)
+        except Exception as e:
+            self.logger.error(f"Error evaluating filter: {e}", exc_info=True)
+            return
+        if positions is not None and not cancel.is_set() and on_done is not None:
+            on_done(positions)
@@ -3,6 +3,7 @@ DLT Message Filters
 """
 import re
 from datetime import datetime
+from .dlt_filter_engine import FilterSpec, compile_filter
 
 class DLTFilter:
     """Filter for DLT messages"""
@@ -52,42 +53,22 @@ class DLTFilter:
         self.payload_text = text
         self.case_sensitive = case_sensitive
         
+    def __setattr__(self, name, value):
+        # Any change to the criteria invalidates the compiled predicate
+        super().__setattr__(name, value)
+        if name != "_compiled":
+            super().__setattr__("_compiled", None)
+        
+    def compiled(self):
+        """Get the filter compiled into a predicate of the active criteria"""
+        if self._compiled is None:
+            self._compiled = compile_filter(FilterSpec.from_filter(self))
+        return self._compiled
+        
     def matches(self, message):
         """Check if message matches filter criteria"""
-        # ECU ID filter
-        if self.ecu_ids and message.ecu_id not in self.ecu_ids:
-            return False
-            
-        # Application ID filter
-        if self.app_ids and message.app_id not in self.app_ids:
-            return False
-            
-        # Context ID filter
-        if self.ctx_ids and message.ctx_id not in self.ctx_ids:
-            return False
-            
-        # Log level filter
-        if self.log_levels and message.log_level not in self.log_levels:
-            return False
-            
-        # Time range filter
-        if self.time_start and message.timestamp < self.time_start:
-            return False
-        if self.time_end and message.timestamp > self.time_end:
-            return False
-            
-        # Payload text filter
-        if self.payload_text:
-            if self.case_sensitive:
-                if self.payload_text not in message.payload:
-                    return False
-            else:
-                if self.payload_text.lower() not in message.payload.lower():
-                    return False
-                    
-        # Regex pattern filter
-        if self.regex_pattern:
-            if not self.regex_pattern.search(message.payload):
-                return False
-                
-        return True
\ No newline at end of file
+        return self.compiled().matches(message)
+        
+    def filter(self, store, candidates=None):
+        """Get the positions of the matching messages of a list or columnar store"""
+        return self.compiled().filter(store, candidates)
@@ -0,0 +1,220 @@
+"""
+DLT Log Storm Governor - Automatic throttling of flooding contexts
+"""
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from .dlt_control import DLTControlMessage
+from .dlt_message import DLTMessage
+
+class GovernorEvent:
+    """Class representing one governor action"""
+
+    def __init__(self, action, app_id, ctx_id, rate, level, message=None, description=""):
+        self.timestamp = time.time()
+        self.action = action          # "throttle", "restore" or "failed"
+        self.app_id = app_id
+        self.ctx_id = ctx_id
+        self.rate = rate
+        self.level = level
+        self.message = message        # Message that triggered the action
+        self.description = description
+
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            "timestamp": datetime.fromtimestamp(self.timestamp).isoformat(),
+            "action": self.action,
+            "app_id": self.app_id,
+            "ctx_id": self.ctx_id,
+            "rate": round(self.rate, 1),
+            "level": self.level,
+            "description": self.description
+        }
+
+class DLTLogStormGovernor:
+    """
+    Watches per app/context message rates on the live stream and lowers the
+    verbosity of contexts that flood the link
+
+    Rates are measured over fixed windows. For a context above the threshold
+    the current level is queried with GET_LOG_INFO, then a SET_LOG_LEVEL
+    request with the throttle level is sent. After the cooldown the context
+    is set back to the level it had before. If that level could not be
+    determined, the fallback restore level (the ECU default unless
+    configured) is used instead. Every action is recorded as a
+    GovernorEvent.
+    """
+
+    def __init__(self, control_client, threshold=2000.0, window=1.0,
+                 throttle_level=DLTMessage.LOG_WARN, cooldown=30.0,
+                 restore_level=DLTControlMessage.LOG_LEVEL_DEFAULT):
+        """Initialize the governor
+
+        Args:
+            control_client: DLTControlClient used to change log levels
+            threshold: Messages per second above which a context is throttled
+            window: Rate measurement window in seconds
+            throttle_level: Log level applied to a flooding context
+            cooldown: Seconds before a throttled context is restored
+            restore_level: Log level applied when restoring a context whose
+                previous level is unknown
+        """
+        self.control_client = control_client
+        self.threshold = threshold
+        self.window = window
+        self.throttle_level = throttle_level
+        self.cooldown = cooldown
+        self.restore_level = restore_level
+        self.enabled = True
+
+        self.lock = threading.Lock()
+        self.window_start = None
+        self.counts = defaultdict(int)
+        self.last_message = {}
+        self.throttled = {}   # (app_id, ctx_id) -> throttle time
+        self.previous_levels = {}  # (app_id, ctx_id) -> level before throttling
+        self.events = []
+        self.new_events = []
+
+    def on_message(self, message, now=None):
+        """Count a live message (connection callback)"""
+        if now is None:
+            now = time.time()
+        key = (message.app_id, message.ctx_id)
+        with self.lock:
+            if self.window_start is None:
+                self.window_start = now
+            self.counts[key] += 1
+            self.last_message[key] = message
+        self.tick(now)
+
+    def tick(self, now=None):
+        """Evaluate finished windows and expired cooldowns"""
+        if now is None:
+            now = time.time()
+
+        actions = []
+        with self.lock:
+            if self.window_start is not None and now - self.window_start >= self.window:
+                elapsed = now - self.window_start
+                for key, count in self.counts.items():
+                    rate = count / elapsed
+                    if rate > self.threshold and key not in self.throttled and self.enabled:
+                        self.throttled[key] = now
+                        actions.append(("throttle", key, rate, self.last_message.get(key)))
+                self.counts.clear()
+                self.last_message.clear()
+                self.window_start = now
+
+            for key, since in list(self.throttled.items()):
+                if now - since >= self.cooldown:
+                    del self.throttled[key]
+                    actions.append(("restore", key, 0.0, None))
+
+        for action, key, rate, message in actions:
+            self._apply(action, key, rate, message)
+
+    def _apply(self, action, key, rate, message):
+        """Throttle or restore one context"""
+        if action == "throttle":
+            self._throttle(key, rate, message)
+        else:
+            self._restore(key)
+
+    def _throttle(self, key, rate, message):
+        """Remember the current level of a context, then lower it"""
+        app_id, ctx_id = key
+        try:
+            future = self.control_client.get_log_info(app_id, ctx_id)
+        except Exception:
+            self._send_throttle(key, rate, message, None)
+            return
+        future.add_done_callback(
+            lambda f: self._on_log_info(f, key, rate, message)
+        )
+
+    def _on_log_info(self, future, key, rate, message):
+        """Store the level reported by GET_LOG_INFO and send the throttle"""
+        try:
+            previous = future.result().get_log_levels().get(key)
+        except Exception:
+            previous = None
+        self._send_throttle(key, rate, message, previous)
+
+    def _send_throttle(self, key, rate, message, previous):
+        """Record the throttle event and lower the log level"""
+        app_id, ctx_id = key
+        level = self.throttle_level
+        with self.lock:
+            if previous is None:
+                self.previous_levels.pop(key, None)
+            else:
+                self.previous_levels[key] = previous
+        known = f"was {previous}" if previous is not None else "previous level unknown"
+        description = (f"Log storm: {app_id}/{ctx_id} at {rate:.0f} msg/s "
+                       f"(limit {self.threshold:.0f}), log level lowered to {level} ({known})")
+        self._record(GovernorEvent("throttle", app_id, ctx_id, rate, level, message, description))
+        self._send_level(key, level, message)
+
+    def _restore(self, key):
+        """Set a context back to the level it had before throttling"""
+        app_id, ctx_id = key
+        with self.lock:
+            level = self.previous_levels.pop(key, None)
+        if level is None:
+            level = self.restore_level
+            description = (f"Cooldown over: {app_id}/{ctx_id} previous log level unknown, "
+                           f"restored to fallback level {level}")
+        else:
+            description = f"Cooldown over: {app_id}/{ctx_id} log level restored to {level}"
+        self._record(GovernorEvent("restore", app_id, ctx_id, 0.0, level, None, description))
+        self._send_level(key, level, None)
+
+    def _send_level(self, key, level, message):
+        """Send a SET_LOG_LEVEL request and record failures"""
+        app_id, ctx_id = key
+        try:
+            future = self.control_client.set_log_level(app_id, ctx_id, level)
+        except Exception as e:
+            self._record_failure(key, level, message, e)
+            return
+        future.add_done_callback(
+            lambda f: self._on_response(f, key, level, message)
+        )
+
+    def _on_response(self, future, key, level, message):
+        """Record failed or rejected log level changes"""
+        try:
+            response = future.result()
+        except Exception as e:
+            self._record_failure(key, level, message, e)
+            return
+        if response.status != DLTControlMessage.STATUS_OK:
+            self._record_failure(key, level, message, f"status {response.status}")
+
+    def _record_failure(self, key, level, message, error):
+        """Record a failed log level change"""
+        app_id, ctx_id = key
+        self._record(GovernorEvent(
+            "failed", app_id, ctx_id, 0.0, level, message,
+            f"Setting log level {level} for {app_id}/{ctx_id} failed: {error}"
+        ))
+
+    def _record(self, event):
+        """Store an event"""
+        with self.lock:
+            self.events.append(event)
+            self.new_events.append(event)
+
+    def pop_new_events(self):
+        """Get events recorded since the last call"""
+        with self.lock:
+            events, self.new_events = self.new_events, []
+            return events
+
+    def get_throttled(self):
+        """Get the currently throttled (app_id, ctx_id) pairs"""
+        with self.lock:
+            return list(self.throttled)
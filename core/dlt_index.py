@@ -0,0 +1,204 @@
+"""
+DLT File Index - Sparse block index stored next to a recorded DLT file
+"""
+import json
+import os
+from .dlt_message import DLTMessage
+
+class DLTFileIndex:
+    """
+    Sparse index of a recorded DLT file
+
+    Messages are grouped into blocks of block_size. Each block records its
+    byte offset, first message number, message count and receive time
+    range, so a reader can seek to a message number or a point in time
+    without parsing the whole file. Per-file counts of log levels,
+    applications and contexts allow skipping files that cannot match a
+    filter. The index is built from the raw frame headers; no payload is
+    decoded.
+    """
+
+    VERSION = 1
+    SUFFIX = ".idx"
+
+    def __init__(self, block_size=1000):
+        self.block_size = max(1, int(block_size))
+        self.messages = 0
+        self.size = 0
+        self.blocks = []     # [offset, first, count, start_time, end_time]
+        self.levels = {}
+        self.apps = {}
+        self.contexts = {}
+
+    @classmethod
+    def path_for(cls, dlt_path):
+        """Index file path belonging to a DLT file"""
+        return dlt_path + cls.SUFFIX
+
+    def add_frames(self, frames, offset, recv_time=None):
+        """Index raw frames written at offset
+
+        Args:
+            frames: List of complete raw frames, in file order
+            offset: File offset of the first frame
+            recv_time: Receive time of the frames (None if unknown)
+        """
+        levels = self.levels
+        apps = self.apps
+        contexts = self.contexts
+        for frame in frames:
+            if not self.blocks or self.blocks[-1][2] >= self.block_size:
+                self.blocks.append([offset, self.messages, 0, recv_time, recv_time])
+            block = self.blocks[-1]
+            block[2] += 1
+            if recv_time is not None:
+                if block[3] is None or recv_time < block[3]:
+                    block[3] = recv_time
+                if block[4] is None or recv_time > block[4]:
+                    block[4] = recv_time
+
+            # Extended header: MSIN, app ID, context ID
+            if frame[3] & 0x80 and len(frame) >= 14:
+                msin = frame[4]
+                if msin >> 4 == DLTMessage.MSG_TYPE_LOG:
+                    level = msin & 0x0F
+                    levels[level] = levels.get(level, 0) + 1
+                app = frame[5:9].rstrip(b"\0").decode("ascii", "replace")
+                ctx = frame[9:13].rstrip(b"\0").decode("ascii", "replace")
+                apps[app] = apps.get(app, 0) + 1
+                contexts[ctx] = contexts.get(ctx, 0) + 1
+
+            offset += len(frame)
+            self.messages += 1
+        self.size = offset
+
+    def find_block(self, message_number):
+        """Get the block holding a message number (None if out of range)"""
+        lo, hi = 0, len(self.blocks)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.blocks[mid][1] <= message_number:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == 0:
+            return None
+        block = self.blocks[lo - 1]
+        return block if message_number < block[1] + block[2] else None
+
+    def find_time(self, timestamp):
+        """Get the first block that may hold messages received at or after timestamp
+
+        Blocks are written in receive order, so their end times ascend and
+        the block is found by binary search.
+
+        Returns:
+            The block, or None if every block ended earlier or the index
+            has no receive times
+        """
+        blocks = self.blocks
+        if not blocks or blocks[0][4] is None:
+            # Built from a file alone, without receive times
+            return None
+        lo, hi = 0, len(blocks)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if blocks[mid][4] < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return blocks[lo] if lo < len(blocks) else None
+
+    def time_range(self):
+        """Get the (start, end) receive time of the file (None if unknown)"""
+        if not self.blocks or self.blocks[0][3] is None:
+            return None
+        return self.blocks[0][3], self.blocks[-1][4]
+
+    def to_dict(self):
+        """Convert to dictionary for serialization"""
+        return {
+            "version": self.VERSION,
+            "block_size": self.block_size,
+            "messages": self.messages,
+            "size": self.size,
+            "blocks": self.blocks,
+            "levels": {str(k): v for k, v in self.levels.items()},
+            "apps": self.apps,
+            "contexts": self.contexts
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create from dictionary"""
+        if data.get("version") != cls.VERSION:
+            raise ValueError(f"Unsupported index version: {data.get('version')}")
+        index = cls(data["block_size"])
+        index.messages = data["messages"]
+        index.size = data["size"]
+        index.blocks = data["blocks"]
+        index.levels = {int(k): v for k, v in data["levels"].items()}
+        index.apps = data["apps"]
+        index.contexts = data["contexts"]
+        return index
+
+    def save(self, path):
+        """Write the index atomically"""
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Read an index written by save()"""
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    @classmethod
+    def build(cls, dlt_path, block_size=1000, chunk_size=1024 * 1024):
+        """Index an existing recording (header magic followed by raw frames)"""
+        index = cls(block_size)
+        with open(dlt_path, "rb") as f:
+            header = f.read(4)
+            offset = len(header)
+            buffer = bytearray()
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                buffer.extend(chunk)
+                frames, used = DLTMessage.split_frames(buffer)
+                index.add_frames(frames, offset)
+                offset += used
+                del buffer[:used]
+        return index
+
+def find_session_time(indexes, timestamp):
+    """Find a point in time in a session recorded across several files
+
+    Args:
+        indexes: DLTFileIndex of each file, in recording order
+        timestamp: Receive time to look for
+
+    Returns:
+        Tuple of (file number, block) of the first block that may hold
+        messages received at or after timestamp, or None if the session
+        ended earlier
+    """
+    ends = []
+    for number, index in enumerate(indexes):
+        time_range = index.time_range()
+        if time_range is not None:
+            ends.append((number, time_range[1]))
+    lo, hi = 0, len(ends)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if ends[mid][1] < timestamp:
+            lo = mid + 1
+        else:
+            hi = mid
+    if lo == len(ends):
+        return None
+    number = ends[lo][0]
+    return number, indexes[number].find_time(timestamp)
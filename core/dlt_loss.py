@@ -0,0 +1,169 @@
+"""
+DLT Loss Tracker - Message counter gap detection and loss accounting
+"""
+import threading
+from collections import deque
+
+class LossEvent:
+    """Class representing one gap in a message counter sequence"""
+
+    def __init__(self, stream, position, expected, counter, lost, timestamp=None):
+        self.stream = stream          # Stream key, e.g. (ecu_id, session_id)
+        self.position = position      # Index of the first message after the gap
+        self.expected = expected      # Counter value that was expected
+        self.counter = counter        # Counter value that arrived
+        self.lost = lost              # Number of messages missing
+        self.timestamp = timestamp
+
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            "stream": self.stream,
+            "position": self.position,
+            "expected": self.expected,
+            "counter": self.counter,
+            "lost": self.lost,
+            "timestamp": self.timestamp
+        }
+
+class DLTCounterState:
+    """Counter sequence state of one stream"""
+
+    def __init__(self):
+        self.last_counter = None
+        self.messages = 0
+        self.gaps = 0
+        self.lost = 0
+        self.wraps = 0
+        self.duplicates = 0
+
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            "messages": self.messages,
+            "gaps": self.gaps,
+            "lost": self.lost,
+            "wraps": self.wraps,
+            "duplicates": self.duplicates,
+            "last_counter": self.last_counter
+        }
+
+class DLTLossTracker:
+    """
+    Tracks the 8-bit message counter of each stream
+
+    The counter advances by one per message and wraps from 255 to 0. A
+    wrap is normal; any other jump is a gap of (counter - expected) mod 256
+    lost messages. A repeated counter is counted as a duplicate, not as a
+    loss. Losses of 256 messages or more in one go alias to a smaller gap
+    and cannot be told apart from it.
+    """
+
+    COUNTER_MODULO = 256
+
+    def __init__(self, max_events=1000):
+        """Initialize the tracker
+
+        Args:
+            max_events: Number of most recent loss events kept
+        """
+        self.max_events = max_events
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget all streams, counters and events"""
+        with self._lock:
+            self.streams = {}
+            self.events = deque(maxlen=self.max_events)
+            self.position = 0
+
+    def track_counter(self, stream, counter, position=None, timestamp=None):
+        """Check the next counter value of a stream
+
+        Args:
+            stream: Hashable stream key
+            counter: Message counter value (0-255)
+            position: Message index recorded in a loss event (defaults to
+                the number of messages tracked so far)
+            timestamp: Message time recorded in a loss event
+
+        Returns:
+            Number of messages lost before this one
+        """
+        with self._lock:
+            if position is None:
+                position = self.position
+            self.position += 1
+
+            state = self.streams.get(stream)
+            if state is None:
+                state = self.streams[stream] = DLTCounterState()
+            state.messages += 1
+
+            last = state.last_counter
+            state.last_counter = counter
+            if last is None:
+                return 0
+
+            expected = (last + 1) % self.COUNTER_MODULO
+            if counter < last:
+                state.wraps += 1
+            if counter == expected:
+                return 0
+            if counter == last:
+                state.duplicates += 1
+                return 0
+
+            lost = (counter - expected) % self.COUNTER_MODULO
+            state.gaps += 1
+            state.lost += lost
+            self.events.append(LossEvent(stream, position, expected, counter, lost, timestamp))
+            return lost
+
+    def track(self, message, position=None):
+        """Check the counter of a message, per ECU and session"""
+        return self.track_counter((message.ecu_id, message.session_id), message.counter,
+                                  position, message.timestamp)
+
+    def track_messages(self, messages, start=0):
+        """Check a sequence of messages numbered from start
+
+        Returns:
+            Number of messages lost
+        """
+        return sum(self.track(msg, start + i) for i, msg in enumerate(messages))
+
+    def track_frames(self, stream, frames):
+        """Check the counters of raw frames (third header byte)
+
+        Returns:
+            Number of messages lost
+        """
+        return sum(self.track_counter(stream, frame[2]) for frame in frames)
+
+    def get_events(self):
+        """Get the most recent loss events, oldest first"""
+        with self._lock:
+            return list(self.events)
+
+    def get_stream_stats(self, stream):
+        """Get the counters of one stream (None if it was never seen)"""
+        with self._lock:
+            state = self.streams.get(stream)
+            return state.to_dict() if state else None
+
+    def get_stats(self):
+        """Get total and per-stream loss statistics"""
+        with self._lock:
+            messages = sum(s.messages for s in self.streams.values())
+            lost = sum(s.lost for s in self.streams.values())
+            return {
+                "messages": messages,
+                "lost": lost,
+                "gaps": sum(s.gaps for s in self.streams.values()),
+                "wraps": sum(s.wraps for s in self.streams.values()),
+                "duplicates": sum(s.duplicates for s in self.streams.values()),
+                "loss_rate": lost / (messages + lost) if messages + lost else 0.0,
+                "streams": {key: s.to_dict() for key, s in self.streams.items()}
+            }
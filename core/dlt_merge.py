@@ -0,0 +1,270 @@
+"""
+DLT Stream Merger - Time-ordered merge of several live message streams
+"""
+import heapq
+import threading
+import time
+from collections import deque
+from .dlt_bus import POLICY_BLOCK
+
+class DLTStreamState:
+    """Watermark and late-arrival counters of one merged stream"""
+
+    def __init__(self, name, now):
+        self.name = name
+        self.watermark = None      # Newest time key seen on this stream
+        self.last_arrival = now    # Wall-clock time of the last message (or registration)
+        self.received = 0
+        self.late = 0
+        self.max_lateness = 0.0
+
+    def is_idle(self, now, idle_timeout):
+        """True if the stream has not delivered anything for idle_timeout"""
+        return now - self.last_arrival > idle_timeout
+
+class DLTStreamMerger:
+    """
+    Merges messages from several connections into one time-ordered stream
+
+    Each stream is assumed to be ordered on its own; only the interleaving
+    between streams is wrong. Messages wait in a bounded reorder buffer and
+    are released once it is safe or once waiting longer would exceed a
+    bound:
+
+    - every active stream's watermark has passed the message (nothing
+      earlier can still arrive), or
+    - the newest message seen is more than window seconds ahead, or
+    - the message has waited max_delay seconds of wall-clock time, or
+    - more than max_buffered messages are waiting.
+
+    Streams that have been quiet for idle_timeout do not hold back the
+    watermark. A message older than one already released is a late
+    arrival: it is passed on immediately (out of order) and reported in
+    the statistics and late events.
+    """
+
+    def __init__(self, window=0.2, max_buffered=10000, max_delay=0.5,
+                 idle_timeout=1.0, time_key=None, max_late_events=1000):
+        """Initialize the merger
+
+        Args:
+            window: Reorder window in seconds of message time
+            max_buffered: Maximum number of messages in the reorder buffer
+            max_delay: Longest wall-clock time a message is held back
+            idle_timeout: Quiet time after which a stream stops holding
+                back the watermark
+            time_key: Callable returning the merge time of a message
+                (defaults to message.timestamp)
+            max_late_events: Number of late arrivals kept for reporting
+        """
+        self.window = window
+        self.max_buffered = max(1, int(max_buffered))
+        self.max_delay = max_delay
+        self.idle_timeout = idle_timeout
+        self.time_key = time_key or (lambda msg: msg.timestamp)
+
+        self.streams = {}
+        self.outputs = []
+        self.late_events = deque(maxlen=max_late_events)
+        self._attached = []
+        self._heap = []
+        self._seq = 0
+        self._lock = threading.RLock()
+        self._stop_event = threading.Event()
+        self.thread = None
+
+        self.released = 0
+        self.released_key = None
+        self.max_pending = 0
+        self.forced = 0   # Released by the window, delay or size bound
+
+    def add_output(self, callback):
+        """Add a consumer called with each batch of merged messages"""
+        if callback not in self.outputs:
+            self.outputs.append(callback)
+
+    def remove_output(self, callback):
+        """Remove a consumer"""
+        if callback in self.outputs:
+            self.outputs.remove(callback)
+
+    def add_stream(self, name, now=None):
+        """Register a stream so that it holds back the watermark
+
+        A stream that has not delivered anything yet holds back every
+        message until it sends or idle_timeout expires.
+        """
+        with self._lock:
+            if name not in self.streams:
+                self.streams[name] = DLTStreamState(name, time.time() if now is None else now)
+            return self.streams[name]
+
+    def attach(self, connection, name):
+        """Merge the messages received on a connection
+
+        Messages are tagged with the stream name as ECU ID if the
+        connection did not provide one.
+        """
+        self.add_stream(name)
+
+        def on_message(msg):
+            if msg.ecu_id == "UNK":
+                msg.ecu_id = name
+            self.feed(name, [msg])
+
+        connection.add_callback(on_message, policy=POLICY_BLOCK, name=f"merge {name}")
+        self._attached.append((connection, on_message))
+
+    def detach_all(self):
+        """Remove the callbacks added by attach()"""
+        for connection, callback in self._attached:
+            connection.remove_callback(callback)
+        self._attached = []
+
+    def feed(self, name, messages, now=None):
+        """Add messages received on one stream"""
+        if now is None:
+            now = time.time()
+        with self._lock:
+            stream = self.streams.get(name) or self.add_stream(name, now)
+            ready = []
+            for msg in messages:
+                key = self.time_key(msg)
+                stream.received += 1
+                stream.last_arrival = now
+                if stream.watermark is None or key > stream.watermark:
+                    stream.watermark = key
+
+                if self.released_key is not None and key < self.released_key:
+                    self._report_late(stream, msg, self.released_key - key,
+                                      self.released + len(ready))
+                    ready.append(msg)
+                    continue
+                heapq.heappush(self._heap, (key, self._seq, now, msg))
+                self._seq += 1
+
+            if len(self._heap) > self.max_pending:
+                self.max_pending = len(self._heap)
+            ready.extend(self._release(now))
+            self._emit(ready)
+
+    def tick(self, now=None):
+        """Release messages whose delay bound expired or whose streams went idle"""
+        if now is None:
+            now = time.time()
+        with self._lock:
+            self._emit(self._release(now))
+
+    def flush(self):
+        """Release everything still buffered"""
+        with self._lock:
+            ready = []
+            while self._heap:
+                ready.append(self._pop())
+            self._emit(ready)
+
+    def start(self, interval=0.05):
+        """Call tick() periodically from a background thread"""
+        if self.thread and self.thread.is_alive():
+            return
+        self._stop_event.clear()
+
+        def run():
+            while not self._stop_event.wait(interval):
+                self.tick()
+
+        self.thread = threading.Thread(target=run, name="dlt-merge")
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self, timeout=1.0):
+        """Stop the background thread and release the buffered messages"""
+        self._stop_event.set()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout)
+        self.thread = None
+        self.flush()
+
+    def _release(self, now):
+        """Pop every message that may be released (called with the lock held)"""
+        active = [s for s in self.streams.values() if not s.is_idle(now, self.idle_timeout)]
+        if any(s.watermark is None for s in active):
+            low_watermark = None   # A new stream may still send anything
+        elif active:
+            low_watermark = min(s.watermark for s in active)
+        else:
+            low_watermark = float("inf")
+        newest = max((s.watermark for s in self.streams.values() if s.watermark is not None),
+                     default=None)
+
+        ready = []
+        while self._heap:
+            key, _, arrival, _ = self._heap[0]
+            if low_watermark is not None and key <= low_watermark:
+                ready.append(self._pop())
+            elif (key <= newest - self.window or arrival + self.max_delay <= now
+                  or len(self._heap) > self.max_buffered):
+                self.forced += 1
+                ready.append(self._pop())
+            else:
+                break
+        return ready
+
+    def _pop(self):
+        """Remove the oldest buffered message"""
+        key, _, _, msg = heapq.heappop(self._heap)
+        if self.released_key is None or key > self.released_key:
+            self.released_key = key
+        return msg
+
+    def _report_late(self, stream, msg, lateness, position):
+        """Count a message that arrived after newer ones were released"""
+        stream.late += 1
+        if lateness > stream.max_lateness:
+            stream.max_lateness = lateness
+        self.late_events.append({
+            "stream": stream.name,
+            "position": position,
+            "timestamp": self.time_key(msg),
+            "lateness": lateness
+        })
+
+    def _emit(self, messages):
+        """Hand released messages to the outputs (called with the lock held)"""
+        if not messages:
+            return
+        self.released += len(messages)
+        for output in self.outputs:
+            try:
+                output(messages)
+            except Exception as e:
+                print(f"Error in merge output: {e}")
+
+    def pop_late_events(self):
+        """Get and clear the late arrivals reported since the last call"""
+        with self._lock:
+            events = list(self.late_events)
+            self.late_events.clear()
+            return events
+
+    def get_stats(self):
+        """Get buffer depth, release and late-arrival statistics"""
+        with self._lock:
+            now = time.time()
+            return {
+                "pending": len(self._heap),
+                "max_pending": self.max_pending,
+                "released": self.released,
+                "forced": self.forced,
+                "late": sum(s.late for s in self.streams.values()),
+                "streams": {
+                    s.name: {
+                        "received": s.received,
+                        "late": s.late,
+                        "max_lateness": s.max_lateness,
+                        "watermark": s.watermark,
+                        "idle": s.is_idle(now, self.idle_timeout)
+                    }
+                    for s in self.streams.values()
+                }
+            }
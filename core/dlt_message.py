@@ -21,6 +21,16 @@ class DLTMessage:
     LOG_DEBUG = 5
     LOG_VERBOSE = 6
     
+    # Log level names to codes
+    LOG_LEVEL_CODES = {
+        "FATAL": LOG_FATAL,
+        "ERROR": LOG_ERROR,
+        "WARN": LOG_WARN,
+        "INFO": LOG_INFO,
+        "DEBUG": LOG_DEBUG,
+        "VERBOSE": LOG_VERBOSE
+    }
+    
     def __init__(self):
         """Initialize a new DLT message with default values"""
         # Standard DLT fields
@@ -65,7 +75,8 @@ class DLTMessage:
             
             # Extract header fields
             self.length = header & 0xFFFF
-            self.msg_counter = (header >> 16) & 0xFF
+            self.counter = (header >> 16) & 0xFF
+            self.msg_counter = self.counter  # Older name, kept for callers
             use_extended_header = (header >> 31) & 0x01
             
             if len(data) < self.length:
@@ -80,7 +91,10 @@ class DLTMessage:
                 # Parse MSIN (Message Info)
                 msin = data[pos]
                 self.msg_type = self._get_msg_type((msin >> 4) & 0x0F)
-                self.log_level = self._get_log_level(msin & 0x0F)
+                if self.msg_type == "LOG":
+                    # For other types the low nibble is not a log level
+                    # (e.g. control request/response)
+                    self.log_level = self._get_log_level(msin & 0x0F)
                 pos += 1
                 
                 # Parse app/context IDs
@@ -112,6 +126,79 @@ class DLTMessage:
             print(f"Error parsing message: {e}")
             return 0
     
+    @classmethod
+    def parse_all(cls, data):
+        """Parse all complete messages from a buffer
+        
+        Args:
+            data: Bytes or bytearray containing zero or more DLT messages
+            
+        Returns:
+            Tuple of (list of parsed messages, number of bytes consumed).
+            Parsing stops at the first incomplete or invalid message.
+        """
+        messages = []
+        pos = 0
+        frames, _ = cls.split_frames(data)
+        
+        for frame in frames:
+            msg = cls()
+            if msg.parse_from_bytes(frame) != len(frame):
+                break
+            messages.append(msg)
+            pos += len(frame)
+            
+        return messages, pos
+    
+    @staticmethod
+    def split_frames(data):
+        """Split a buffer into raw message frames without decoding them
+
+        Args:
+            data: Bytes or bytearray containing zero or more DLT messages
+
+        Returns:
+            Tuple of (list of frame bytes, number of bytes consumed).
+            Splitting stops at the first incomplete frame or invalid length.
+        """
+        frames = []
+        pos = 0
+        end = len(data)
+
+        while end - pos >= 4:
+            length = data[pos] | (data[pos + 1] << 8)
+            if length < 4 or pos + length > end:
+                break
+            frames.append(bytes(data[pos:pos + length]))
+            pos += length
+
+        return frames, pos
+
+    def encode(self, payload_data=None):
+        """Encode message to bytes (standard + extended header and payload)
+        
+        Args:
+            payload_data: Raw payload bytes, or None to encode the text payload
+            
+        Returns:
+            Bytes in the layout read by parse_from_bytes
+        """
+        if payload_data is None:
+            payload_data = self.payload.encode('utf-8')
+            
+        length = 4 + 10 + len(payload_data)
+        if length > 0xFFFF:
+            raise ValueError(f"Message too long: {length} bytes")
+            
+        header = (1 << 31) | ((self.counter & 0xFF) << 16) | length
+        msin = (self._get_msg_type_code(self.msg_type) << 4) | self._get_log_level_code(self.log_level)
+        
+        return (struct.pack("<IB", header, msin) +
+                self.app_id.encode('ascii', 'replace')[:4].ljust(4, b'\0') +
+                self.ctx_id.encode('ascii', 'replace')[:4].ljust(4, b'\0') +
+                struct.pack("<B", self.arg_count & 0xFF) +
+                payload_data)
+    
     def _parse_log_payload(self, data):
         """Parse LOG type payload"""
         try:
@@ -167,6 +254,20 @@ class DLTMessage:
         }
         return types.get(type_code, "UNKNOWN")
     
+    def _get_msg_type_code(self, msg_type):
+        """Convert message type string to code"""
+        codes = {
+            "LOG": self.MSG_TYPE_LOG,
+            "APP_TRACE": self.MSG_TYPE_APP_TRACE,
+            "NW_TRACE": self.MSG_TYPE_NW_TRACE,
+            "CONTROL": self.MSG_TYPE_CONTROL
+        }
+        return codes.get(msg_type, self.MSG_TYPE_LOG)
+    
+    def _get_log_level_code(self, log_level):
+        """Convert log level string to code"""
+        return self.LOG_LEVEL_CODES.get(log_level, 0)
+    
     def _get_log_level(self, level_code):
         """Convert log level code to string"""
         levels = {
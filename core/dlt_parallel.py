@@ -0,0 +1,212 @@
+"""
+DLT Parallel Filter - Sharded filter and search evaluation in a process pool
+"""
+import mmap
+import multiprocessing
+import os
+import threading
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from .dlt_file import DLTFile
+from .dlt_filter_engine import FilterSpec, compile_filter, search_columns
+from .dlt_query import reference_time
+
+class DLTFileSource:
+    """
+    Where the messages of a DLTMessageColumns were read from
+
+    Positions below len(offsets) are the messages of the file, in file
+    order, with offsets[position] the byte offset of the message.
+    """
+
+    def __init__(self, file_path, header_info, offsets):
+        self.file_path = file_path
+        self.header_info = dict(header_info)
+        self.offsets = offsets
+
+    @classmethod
+    def from_file(cls, dlt_file):
+        """Create from a loaded DLTFile"""
+        offsets = array('Q', (dlt_file.cached_indices[i] for i in range(len(dlt_file.messages))))
+        return cls(dlt_file.file_path, dlt_file.header_info, offsets)
+
+    def __len__(self):
+        return len(self.offsets)
+
+def _evaluate_shard(file_path, header_info, positions, offsets, timestamps, spec, search, reference):
+    """Evaluate a filter and search over the messages of one shard (worker process)
+
+    Args:
+        file_path: DLT file to read the messages from
+        header_info: Header information of the loaded file
+        positions: array('I') of the shard's positions
+        offsets: array('Q') of the byte offset of each position
+        timestamps: array('d') of the timestamp of each position, as loaded
+        spec: FilterSpec to apply
+        search: Casefolded toolbar search text or None
+        reference: reference_time() of the columns, the day of the clock
+            times of a query
+
+    Returns:
+        array('I') of the matching positions
+    """
+    dlt_file = DLTFile(file_path)
+    dlt_file.header_info = header_info
+    matches = compile_filter(spec).matches
+    hits = array('I')
+    with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for position, offset, timestamp in zip(positions, offsets, timestamps):
+            data.seek(offset)
+            message = dlt_file._parse_message(data)
+            if message is None:
+                continue
+            # Timestamps of files without one in the header depend on the load time
+            message.timestamp = timestamp
+            if not matches(message, reference):
+                continue
+            if search is not None and not (search in message.payload.casefold()
+                                           or search in message.app_id.casefold()
+                                           or search in message.ctx_id.casefold()):
+                continue
+            hits.append(position)
+    return hits
+
+class DLTParallelFilter:
+    """
+    Evaluates regex-heavy queries over a loaded DLT file in a process pool
+
+    The indexes of the columns first narrow the query to candidate
+    positions (categorical and time criteria, payload trigrams). The
+    candidates are split into shards of shard_size, and each worker reads
+    its shard's messages straight from the memory-mapped file, so only
+    positions and offsets cross the process boundary, never messages.
+    Shard results are collected in shard order and reported as they
+    arrive, so the view fills from the top while later shards are still
+    being searched.
+    """
+
+    SHARD_SIZE = 65536
+
+    def __init__(self, workers=None, shard_size=SHARD_SIZE, min_messages=1000000):
+        """Initialize the evaluator
+
+        Args:
+            workers: Number of worker processes (None for one per CPU)
+            shard_size: Candidate positions per shard
+            min_messages: Smallest number of candidates worth the pool
+        """
+        self.workers = max(1, int(workers or os.cpu_count() or 1))
+        self.shard_size = max(1, int(shard_size))
+        self.min_messages = max(0, int(min_messages))
+        self.executor = None
+        self._lock = threading.Lock()
+
+    def applies(self, columns, spec, search, count):
+        """True if a query is worth evaluating in the pool
+
+        Args:
+            columns: DLTMessageColumns the query runs over
+            spec: FilterSpec of the query
+            search: Toolbar search text or None
+            count: Number of candidate positions
+        """
+        if self.workers < 2 or getattr(columns, "source", None) is None:
+            return False
+        if count < self.min_messages:
+            return False
+        # Workers decode every candidate again, which only pays off against
+        # regexes; substrings are searched faster in-process
+        return bool(spec.regex or spec.query)
+
+    def _executor(self):
+        with self._lock:
+            if self.executor is None:
+                # Forking would copy the UI and worker threads of the viewer
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self.executor
+
+    def close(self):
+        """Stop the worker processes"""
+        with self._lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def evaluate(self, columns, spec, search, candidates, cancel=None, on_partial=None):
+        """Get the positions matching a filter spec and a toolbar search
+
+        Args:
+            columns: DLTMessageColumns with a source file
+            spec: FilterSpec to apply
+            search: Casefolded toolbar search text or None
+            candidates: Ascending positions to consider
+            cancel: Optional threading.Event; when set, pending shards are
+                dropped and None is returned
+            on_partial: Optional callback receiving each shard's matches,
+                in position order
+
+        Returns:
+            List of matching positions in ascending order, or None if
+            cancelled
+        """
+        source = columns.source
+        positions = self._narrow(columns, spec, candidates)
+        # Positions appended after the file was loaded are not in it
+        split = bisect_left(positions, len(source))
+        local, positions = positions[split:], positions[:split]
+
+        executor = self._executor()
+        offsets = source.offsets
+        timestamps = columns.timestamps
+        reference = reference_time(columns)
+        futures = []
+        for start in range(0, len(positions), self.shard_size):
+            shard = array('I', positions[start:start + self.shard_size])
+            futures.append(executor.submit(
+                _evaluate_shard, source.file_path, source.header_info, shard,
+                array('Q', (offsets[p] for p in shard)), array('d', (timestamps[p] for p in shard)),
+                spec, search, reference
+            ))
+
+        result = []
+        try:
+            for future in futures:
+                while True:
+                    if cancel is not None and cancel.is_set():
+                        return None
+                    try:
+                        hits = future.result(timeout=0.05)
+                        break
+                    except TimeoutError:
+                        continue
+                hits = hits.tolist()
+                result.extend(hits)
+                if hits and on_partial is not None:
+                    on_partial(hits)
+        finally:
+            for future in futures:
+                future.cancel()
+
+        if local:
+            hits = compile_filter(spec).filter(columns, local)
+            if search is not None:
+                hits = search_columns(columns, search, hits)
+            result.extend(hits)
+            if hits and on_partial is not None:
+                on_partial(hits)
+        return result
+
+    @staticmethod
+    def _narrow(columns, spec, candidates):
+        """Candidate positions left by the index-backed criteria of a spec"""
+        cheap = FilterSpec(**{name: getattr(spec, name) for name in FilterSpec.CATEGORICAL},
+                           time_start=spec.time_start, time_end=spec.time_end)
+        positions = compile_filter(cheap).filter(columns, candidates)
+        literals = compile_filter(spec).literals
+        if literals and columns.trigrams is not None:
+            positions = columns.trigrams.candidates(literals, positions)
+        return positions
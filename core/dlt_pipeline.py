@@ -0,0 +1,196 @@
+"""
+DLT Ingest Pipeline - Staged decoding and ordered delivery of received frames
+"""
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .dlt_message import DLTMessage
+
+class DLTIngestPipeline:
+    """
+    Decouples the socket thread from decoding and listeners
+
+    The receive thread only splits the byte stream into frames and hands
+    them to submit(), which never blocks. Batches are decoded on a worker
+    pool, and a single delivery thread passes the decoded messages to the
+    deliver callable in arrival order. The bounded queue of pending batches
+    sits between the stages: when decoding or delivery falls behind, new
+    batches are dropped from the live path and counted instead of stalling
+    the receive thread (and with it the TCP window of the ECU).
+    """
+
+    def __init__(self, deliver, workers=2, max_pending_batches=256, batch_size=512):
+        """Initialize the pipeline
+
+        Args:
+            deliver: Callable receiving each decoded batch (list of DLTMessage)
+            workers: Number of decoder threads
+            max_pending_batches: Batches that may wait for decoding/delivery
+            batch_size: Maximum frames decoded per batch
+        """
+        self.deliver = deliver
+        self.workers = max(1, int(workers))
+        self.max_pending_batches = max(1, int(max_pending_batches))
+        self.batch_size = max(1, int(batch_size))
+
+        self.executor = None
+        self.delivery_thread = None
+        self._pending = queue.Queue(maxsize=self.max_pending_batches)
+        self._stats_lock = threading.Lock()
+        self._idle = threading.Condition(self._stats_lock)
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Reset throughput and backpressure counters"""
+        with self._stats_lock:
+            self.frames_in = 0
+            self.frames_delivered = 0
+            self.frames_dropped = 0
+            self.batches_dropped = 0
+            self.decode_errors = 0
+            self.max_pending = 0
+            self.in_flight = 0
+            self.decode_time = 0.0
+            self.delivery_time = 0.0
+            self.delivery_lag = 0.0
+
+    @property
+    def is_running(self):
+        return self.delivery_thread is not None and self.delivery_thread.is_alive()
+
+    def start(self):
+        """Start the decoder pool and the delivery thread"""
+        if self.is_running:
+            return
+        self._pending = queue.Queue(maxsize=self.max_pending_batches)
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="dlt-decode"
+        )
+        self.delivery_thread = threading.Thread(target=self._delivery_loop, name="dlt-deliver")
+        self.delivery_thread.daemon = True
+        self.delivery_thread.start()
+
+    def stop(self, timeout=2.0):
+        """Deliver what is already queued, then stop the worker threads"""
+        if not self.is_running:
+            return
+        try:
+            self._pending.put(None, timeout=timeout)
+        except queue.Full:
+            pass  # Delivery is stuck; the daemon thread is abandoned
+        if threading.current_thread() is not self.delivery_thread:
+            self.delivery_thread.join(timeout)
+        self.delivery_thread = None
+        with self._stats_lock:
+            executor, self.executor = self.executor, None
+        executor.shutdown(wait=False)
+
+    def submit(self, frames, recv_time=None):
+        """Queue raw frames for decoding without blocking
+
+        Args:
+            frames: List of complete raw DLT frames
+            recv_time: Receive time stamped on the decoded messages
+
+        Returns:
+            True if all frames were queued, False if some were dropped
+        """
+        if not frames:
+            return True
+        if recv_time is None:
+            recv_time = time.time()
+
+        accepted = True
+        for start in range(0, len(frames), self.batch_size):
+            batch = frames[start:start + self.batch_size]
+            with self._stats_lock:
+                self.frames_in += len(batch)
+                self.in_flight += len(batch)
+                executor = self.executor
+            try:
+                if executor is None or self._pending.full():
+                    raise queue.Full
+                future = executor.submit(self._decode_batch, batch, recv_time)
+                self._pending.put_nowait((future, len(batch), recv_time))
+            except (queue.Full, RuntimeError):
+                # Decoding or delivery is behind (or stopped): shed the batch
+                with self._stats_lock:
+                    self.in_flight -= len(batch)
+                    self.frames_dropped += len(batch)
+                    self.batches_dropped += 1
+                    if not self.in_flight:
+                        self._idle.notify_all()
+                accepted = False
+                continue
+
+            with self._stats_lock:
+                if self._pending.qsize() > self.max_pending:
+                    self.max_pending = self._pending.qsize()
+        return accepted
+
+    def _decode_batch(self, frames, recv_time):
+        """Decode one batch of frames (runs on the worker pool)"""
+        started = time.perf_counter()
+        messages = []
+        errors = 0
+        for frame in frames:
+            msg = DLTMessage()
+            if msg.parse_from_bytes(frame) != len(frame):
+                errors += 1
+                continue
+            msg.timestamp = recv_time
+            messages.append(msg)
+
+        with self._stats_lock:
+            self.decode_errors += errors
+            self.decode_time += time.perf_counter() - started
+        return messages
+
+    def _delivery_loop(self):
+        """Hand decoded batches to deliver() in submission order"""
+        while True:
+            item = self._pending.get()
+            if item is None:
+                break
+
+            future, count, recv_time = item
+            started = time.perf_counter()
+            try:
+                self.deliver(future.result())
+            except Exception as e:
+                print(f"Error delivering messages: {e}")
+
+            with self._stats_lock:
+                self.frames_delivered += count
+                self.in_flight -= count
+                self.delivery_time += time.perf_counter() - started
+                self.delivery_lag = time.time() - recv_time
+                if not self.in_flight:
+                    self._idle.notify_all()
+
+    def wait_idle(self, timeout=None):
+        """Wait until every queued frame has been delivered
+
+        Returns:
+            True if the pipeline is idle
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: self.in_flight == 0, timeout)
+
+    def get_stats(self):
+        """Get throughput and backpressure statistics"""
+        with self._stats_lock:
+            return {
+                "frames_in": self.frames_in,
+                "frames_delivered": self.frames_delivered,
+                "frames_dropped": self.frames_dropped,
+                "batches_dropped": self.batches_dropped,
+                "decode_errors": self.decode_errors,
+                "pending_batches": self._pending.qsize(),
+                "max_pending_batches": self.max_pending,
+                "in_flight": self.in_flight,
+                "decode_time": self.decode_time,
+                "delivery_time": self.delivery_time,
+                "delivery_lag": self.delivery_lag
+            }
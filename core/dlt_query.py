@@ -0,0 +1,682 @@
+"""
+DLT Query - Filter query language with a cost-based planner
+
+Example:
+    ecu:ECU1 and app in (NAV,HMI) and level>=WARN and payload~/timeout \\d+/
+    and t in [10:00,10:05]
+
+Predicates:
+    ecu|app|ctx|type : value, = value, != value, in (v1, v2, ...)
+    level            : as above, plus >=, >, <=, < (FATAL is the highest level)
+    payload          : "text" (substring, ignoring case), ~ /regex/flags
+    t|time           : in [start, end], >=, >, <=, < with HH:MM[:SS[.fff]]
+                       (on the day of the first message) or epoch seconds;
+                       either end of a range may be left out
+Predicates combine with and, or, not and parentheses.
+"""
+import re
+import time
+from .dlt_message import DLTMessage
+from .dlt_filter_engine import FilterSpec, compile_filter
+from .dlt_regex import required_literals
+
+class DLTQueryError(ValueError):
+    """Invalid query text"""
+
+    def __init__(self, message, position):
+        super().__init__(f"{message} at position {position}")
+        self.position = position
+
+# Cost classes, cheapest first
+COST_INDEX = 0
+COST_TIME = 1
+COST_TEXT = 2
+COST_REGEX = 3
+
+# Estimated selectivity of text predicates without a trigram index
+DEFAULT_TEXT_SELECTIVITY = 0.05
+
+CATEGORICAL_FIELDS = {
+    "ecu": "ecu_id",
+    "app": "app_id",
+    "ctx": "ctx_id",
+    "level": "log_level",
+    "type": "msg_type"
+}
+
+SPEC_FIELDS = {field: name for name, field in FilterSpec.FIELDS.items()}
+
+class _Context:
+    """State of one evaluation: the columns and the explain trace"""
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.total = len(columns)
+        self.reference = reference_time(columns)
+        self.trace = []
+        self.depth = 0
+
+    def record(self, node, method, estimate, before, after):
+        self.trace.append((self.depth, node.describe(), method, estimate, before, after))
+
+def _categorical_spec(criteria):
+    """FilterSpec of field -> allowed values (an empty set allows nothing)"""
+    return FilterSpec(**{SPEC_FIELDS[field]: values or ["\0"] for field, values in criteria.items()})
+
+def _count(positions, total):
+    return total if positions is None else len(positions)
+
+def _all(positions, total):
+    return range(total) if positions is None else positions
+
+class QueryNode:
+    """Base class of the query tree"""
+
+    cost = COST_INDEX
+
+    def estimate(self, ctx):
+        """Estimated fraction of messages matching"""
+        raise NotImplementedError
+
+    def evaluate(self, ctx, positions):
+        """Matching positions among positions (None for all)"""
+        raise NotImplementedError
+
+    def matches(self, message, reference):
+        """Check a single message (clock times refer to reference's day)"""
+        raise NotImplementedError
+
+    def describe(self):
+        raise NotImplementedError
+
+    def _leaf_evaluate(self, ctx, positions, spec, method):
+        before = _count(positions, ctx.total)
+        result = compile_filter(spec).filter(ctx.columns, positions)
+        ctx.record(self, method, self.estimate(ctx), before, len(result))
+        return result
+
+class Categorical(QueryNode):
+    """field in values"""
+
+    cost = COST_INDEX
+
+    def __init__(self, field, values):
+        self.field = field
+        self.values = frozenset(values)
+
+    def estimate(self, ctx):
+        if not ctx.total:
+            return 0.0
+        columns = ctx.columns
+        index = columns.bitmaps()
+        hits = sum(index.count(self.field, code) for code in columns.code_set(self.field, self.values))
+        return hits / ctx.total
+
+    def evaluate(self, ctx, positions):
+        return self._leaf_evaluate(ctx, positions, _categorical_spec({self.field: self.values}),
+                                   "bitmap index")
+
+    def matches(self, message, reference):
+        return getattr(message, self.field) in self.values
+
+    def describe(self):
+        name = next(key for key, field in CATEGORICAL_FIELDS.items() if field == self.field)
+        return f"{name} in ({','.join(sorted(self.values))})"
+
+class TimeRange(QueryNode):
+    """Timestamp within [start, end]; clock times resolve against a reference day"""
+
+    cost = COST_TIME
+
+    def __init__(self, start=None, end=None, start_inclusive=True, end_inclusive=True):
+        self.start = start
+        self.end = end
+        self.start_inclusive = start_inclusive
+        self.end_inclusive = end_inclusive
+        # Bounds resolved for the last reference, reused by every message
+        self._resolved = (None, (None, None))
+
+    @staticmethod
+    def resolve(bound, reference):
+        """Bound as a timestamp: ("clock", seconds after midnight) or ("epoch", seconds)"""
+        if bound is None:
+            return None
+        kind, value = bound
+        if kind == "epoch":
+            return value
+        day = time.localtime(reference)
+        midnight = time.mktime((day.tm_year, day.tm_mon, day.tm_mday, 0, 0, 0, 0, 0, -1))
+        return midnight + value
+
+    def bounds(self, reference):
+        resolved_for, bounds = self._resolved
+        if resolved_for != reference:
+            bounds = self.resolve(self.start, reference), self.resolve(self.end, reference)
+            self._resolved = (reference, bounds)
+        return bounds
+
+    def estimate(self, ctx):
+        return ctx.columns.times().estimate(*self.bounds(ctx.reference))
+
+    def evaluate(self, ctx, positions):
+        start, end = self.bounds(ctx.reference)
+        before = _count(positions, ctx.total)
+        times = ctx.columns.times()
+        result = times.select(start, end, positions, self.start_inclusive, self.end_inclusive)
+        method = "binary search" if times.sorted else "block min/max"
+        ctx.record(self, method, self.estimate(ctx), before, len(result))
+        return list(result)
+
+    def _inside(self, timestamp, start, end):
+        if start is not None and (timestamp < start or (timestamp == start and not self.start_inclusive)):
+            return False
+        if end is not None and (timestamp > end or (timestamp == end and not self.end_inclusive)):
+            return False
+        return True
+
+    def matches(self, message, reference):
+        start, end = self.bounds(reference)
+        return self._inside(message.timestamp, start, end)
+
+    def describe(self):
+        def show(bound):
+            if bound is None:
+                return ""
+            kind, value = bound
+            if kind == "epoch":
+                return f"{value:.3f}"
+            hours, rest = divmod(value, 3600)
+            minutes, seconds = divmod(rest, 60)
+            return f"{int(hours):02d}:{int(minutes):02d}:{seconds:06.3f}"
+        opening = "[" if self.start_inclusive else "("
+        closing = "]" if self.end_inclusive else ")"
+        return f"t in {opening}{show(self.start)},{show(self.end)}{closing}"
+
+class Text(QueryNode):
+    """Payload contains text, ignoring case"""
+
+    cost = COST_TEXT
+
+    def __init__(self, text):
+        self.text = text
+        self.needle = text.casefold()
+
+    def _literals(self):
+        return [self.text]
+
+    def estimate(self, ctx):
+        if not ctx.total:
+            return 0.0
+        trigrams = ctx.columns.trigrams
+        if trigrams is None:
+            return DEFAULT_TEXT_SELECTIVITY
+        blocks = trigrams.candidate_blocks(self._literals())
+        if blocks is None:
+            return DEFAULT_TEXT_SELECTIVITY
+        # Messages of candidate blocks bound the matches from above
+        covered = len(blocks) * trigrams.block_size + ctx.total - trigrams.indexed
+        return min(1.0, covered / ctx.total)
+
+    def _method(self, ctx):
+        return "trigram + verify" if ctx.columns.trigrams is not None else "payload scan"
+
+    def evaluate(self, ctx, positions):
+        return self._leaf_evaluate(ctx, positions, FilterSpec(payload_text=self.text), self._method(ctx))
+
+    def matches(self, message, reference):
+        return self.needle in message.payload.casefold()
+
+    def describe(self):
+        return f'payload:"{self.text}"'
+
+class Regex(Text):
+    """Payload matches a regular expression"""
+
+    cost = COST_REGEX
+
+    def __init__(self, pattern, flags=0):
+        self.regex = re.compile(pattern, flags)
+        self.pattern = pattern
+        self.flags = flags
+        self.text = pattern
+
+    def _literals(self):
+        return required_literals(self.pattern, self.flags)
+
+    def evaluate(self, ctx, positions):
+        spec = FilterSpec(regex=self.pattern, regex_flags=self.flags)
+        method = "regex" + (" (trigram narrowed)" if ctx.columns.trigrams is not None else "")
+        return self._leaf_evaluate(ctx, positions, spec, method)
+
+    def matches(self, message, reference):
+        return self.regex.search(message.payload) is not None
+
+    def describe(self):
+        flags = "i" if self.flags & re.IGNORECASE else ""
+        return f"payload~/{self.pattern}/{flags}"
+
+class Not(QueryNode):
+    """Negation"""
+
+    def __init__(self, child):
+        self.child = child
+        self.cost = child.cost
+
+    def estimate(self, ctx):
+        return 1.0 - self.child.estimate(ctx)
+
+    def evaluate(self, ctx, positions):
+        before = _count(positions, ctx.total)
+        ctx.depth += 1
+        excluded = set(self.child.evaluate(ctx, positions))
+        ctx.depth -= 1
+        result = [i for i in _all(positions, ctx.total) if i not in excluded]
+        ctx.record(self, "complement", self.estimate(ctx), before, len(result))
+        return result
+
+    def matches(self, message, reference):
+        return not self.child.matches(message, reference)
+
+    def describe(self):
+        return f"not {self.child.describe()}"
+
+class And(QueryNode):
+    """Conjunction, evaluated cheapest and most selective first"""
+
+    def __init__(self, children):
+        self.children = children
+        self.cost = max(child.cost for child in children)
+
+    def estimate(self, ctx):
+        estimate = 1.0
+        for child in self.children:
+            estimate *= child.estimate(ctx)
+        return estimate
+
+    def plan(self, ctx):
+        """Order the children: categorical lookups merged into one, then by cost and selectivity"""
+        categorical = {}
+        rest = []
+        for child in self.children:
+            if isinstance(child, Categorical):
+                values = categorical.get(child.field)
+                categorical[child.field] = child.values if values is None else values & child.values
+            else:
+                rest.append(child)
+        steps = []
+        if categorical:
+            steps.append(IndexLookup(categorical))
+        rest.sort(key=lambda child: (child.cost, child.estimate(ctx)))
+        return steps + rest
+
+    def evaluate(self, ctx, positions):
+        before = _count(positions, ctx.total)
+        start = len(ctx.trace)
+        ctx.depth += 1
+        for step in self.plan(ctx):
+            positions = step.evaluate(ctx, positions)
+            if not positions:
+                break
+        ctx.depth -= 1
+        result = list(_all(positions, ctx.total))
+        ctx.trace.insert(start, (ctx.depth, self.describe(), "and", self.estimate(ctx), before, len(result)))
+        return result
+
+    def matches(self, message, reference):
+        return all(child.matches(message, reference) for child in self.children)
+
+    def describe(self):
+        return "and"
+
+class IndexLookup(QueryNode):
+    """Categorical criteria of a conjunction, answered together by the bitmap index"""
+
+    cost = COST_INDEX
+
+    def __init__(self, criteria):
+        self.criteria = criteria
+
+    def estimate(self, ctx):
+        estimate = 1.0
+        for field, values in self.criteria.items():
+            estimate *= Categorical(field, values).estimate(ctx)
+        return estimate
+
+    def evaluate(self, ctx, positions):
+        return self._leaf_evaluate(ctx, positions, _categorical_spec(self.criteria), "bitmap index")
+
+    def matches(self, message, reference):
+        return all(getattr(message, field) in values for field, values in self.criteria.items())
+
+    def describe(self):
+        return " and ".join(Categorical(field, values).describe() for field, values in self.criteria.items())
+
+class Or(QueryNode):
+    """Disjunction"""
+
+    def __init__(self, children):
+        self.children = children
+        self.cost = max(child.cost for child in children)
+
+    def estimate(self, ctx):
+        missing = 1.0
+        for child in self.children:
+            missing *= 1.0 - child.estimate(ctx)
+        return 1.0 - missing
+
+    def evaluate(self, ctx, positions):
+        before = _count(positions, ctx.total)
+        start = len(ctx.trace)
+        ctx.depth += 1
+        matched = set()
+        for child in sorted(self.children, key=lambda child: child.cost):
+            matched.update(child.evaluate(ctx, positions))
+        ctx.depth -= 1
+        result = sorted(matched)
+        ctx.trace.insert(start, (ctx.depth, self.describe(), "or", self.estimate(ctx), before, len(result)))
+        return result
+
+    def matches(self, message, reference):
+        return any(child.matches(message, reference) for child in self.children)
+
+    def describe(self):
+        return "or"
+
+class _Parser:
+    """Recursive descent parser of the query text"""
+
+    DELIMITERS = " \t\r\n(),[]"
+
+    def __init__(self, text):
+        self.text = text
+        self.pos = 0
+
+    def error(self, message):
+        raise DLTQueryError(message, self.pos)
+
+    def skip(self):
+        while self.pos < len(self.text) and self.text[self.pos].isspace():
+            self.pos += 1
+
+    def peek(self, token):
+        """True if token comes next (keywords must end at a delimiter)"""
+        self.skip()
+        end = self.pos + len(token)
+        if self.text[self.pos:end].lower() != token:
+            return False
+        return not token.isalpha() or end >= len(self.text) or self.text[end] in self.DELIMITERS
+
+    def accept(self, token):
+        if self.peek(token):
+            self.pos += len(token)
+            return True
+        return False
+
+    def expect(self, token):
+        if not self.accept(token):
+            self.error(f"Expected '{token}'")
+
+    def value(self, stop=""):
+        """A quoted string or a bare word"""
+        self.skip()
+        if self.pos < len(self.text) and self.text[self.pos] == '"':
+            end = self.text.find('"', self.pos + 1)
+            if end < 0:
+                self.error("Unterminated string")
+            value = self.text[self.pos + 1:end]
+            self.pos = end + 1
+            return value
+        start = self.pos
+        while self.pos < len(self.text) and self.text[self.pos] not in self.DELIMITERS + stop:
+            self.pos += 1
+        if start == self.pos:
+            self.error("Expected a value")
+        return self.text[start:self.pos]
+
+    def parse(self):
+        node = self.expression()
+        self.skip()
+        if self.pos != len(self.text):
+            self.error("Unexpected text")
+        return node
+
+    def expression(self):
+        children = [self.conjunction()]
+        while self.accept("or"):
+            children.append(self.conjunction())
+        return children[0] if len(children) == 1 else Or(children)
+
+    def conjunction(self):
+        children = [self.unary()]
+        while self.accept("and"):
+            children.append(self.unary())
+        return children[0] if len(children) == 1 else And(children)
+
+    def unary(self):
+        if self.accept("not"):
+            return Not(self.unary())
+        if self.accept("("):
+            node = self.expression()
+            self.expect(")")
+            return node
+        return self.predicate()
+
+    def predicate(self):
+        self.skip()
+        start = self.pos
+        match = re.compile(r"[A-Za-z]+").match(self.text, self.pos)
+        if not match:
+            self.error("Expected a field name")
+        name = match.group().lower()
+        self.pos = match.end()
+
+        if name in CATEGORICAL_FIELDS:
+            return self.categorical(CATEGORICAL_FIELDS[name])
+        if name == "payload":
+            return self.payload()
+        if name in ("t", "time"):
+            return self.time_predicate()
+        self.pos = start
+        self.error(f"Unknown field '{name}'")
+
+    def categorical(self, field):
+        is_level = field == "log_level"
+        for op in (">=", "<=", "!=", ">", "<", ":", "="):
+            if self.accept(op):
+                break
+        else:
+            if self.accept("in"):
+                self.expect("(")
+                values = [self.field_value(field)]
+                while self.accept(","):
+                    values.append(self.field_value(field))
+                self.expect(")")
+                return Categorical(field, values)
+            self.error("Expected an operator")
+
+        value = self.field_value(field)
+        if op in (":", "="):
+            return Categorical(field, [value])
+        if op == "!=":
+            return Not(Categorical(field, [value]))
+        if not is_level:
+            self.error(f"'{op}' only applies to level and time")
+        return Categorical(field, self.level_range(op, value))
+
+    def field_value(self, field):
+        """A value of a categorical field (levels and types ignore case)"""
+        self.skip()
+        start = self.pos
+        value = self.value(",")
+        if field in ("log_level", "msg_type"):
+            value = value.upper()
+        if field == "log_level" and value not in DLTMessage.LOG_LEVEL_CODES:
+            self.pos = start
+            self.error(f"Unknown log level '{value}'")
+        return value
+
+    @staticmethod
+    def level_range(op, value):
+        """Levels at least (>=) or at most (<=) as severe as value"""
+        codes = DLTMessage.LOG_LEVEL_CODES
+        code = codes[value]
+        compare = {
+            ">=": lambda other: other <= code,
+            ">": lambda other: other < code,
+            "<=": lambda other: other >= code,
+            "<": lambda other: other > code
+        }[op]
+        return [name for name, other in codes.items() if compare(other)]
+
+    def payload(self):
+        if self.accept("~"):
+            self.skip()
+            if self.accept("/"):
+                end = self.pos
+                while True:
+                    end = self.text.find("/", end)
+                    if end < 0:
+                        self.error("Unterminated regex")
+                    if self.text[end - 1] != "\\":
+                        break
+                    end += 1
+                pattern = self.text[self.pos:end].replace("\\/", "/")
+                self.pos = end + 1
+                flags = 0
+                while self.pos < len(self.text) and self.text[self.pos] in "is":
+                    flags |= re.IGNORECASE if self.text[self.pos] == "i" else re.DOTALL
+                    self.pos += 1
+            else:
+                pattern, flags = self.value(), 0
+            try:
+                return Regex(pattern, flags)
+            except re.error as e:
+                self.error(f"Invalid regex: {e}")
+        if self.accept(":") or self.accept("="):
+            return Text(self.value())
+        self.error("Expected ':' or '~' after payload")
+
+    def time_predicate(self):
+        if self.accept("in"):
+            if self.accept("["):
+                start_inclusive = True
+            else:
+                self.expect("(")
+                start_inclusive = False
+            start = None if self.peek(",") else self.time_value()
+            self.expect(",")
+            end = None
+            if not (self.peek("]") or self.peek(")")):
+                end = self.time_value()
+            if self.accept("]"):
+                end_inclusive = True
+            else:
+                self.expect(")")
+                end_inclusive = False
+            return TimeRange(start, end, start_inclusive, end_inclusive)
+        for op in (">=", "<=", ">", "<"):
+            if self.accept(op):
+                bound = self.time_value()
+                if op[0] == ">":
+                    return TimeRange(start=bound, start_inclusive=op == ">=")
+                return TimeRange(end=bound, end_inclusive=op == "<=")
+        self.error("Expected 'in' or a comparison after t")
+
+    def time_value(self):
+        """HH:MM[:SS[.fff]] or epoch seconds"""
+        self.skip()
+        start = self.pos
+        text = self.value(",")
+        try:
+            return _time_bound(text)
+        except ValueError:
+            self.pos = start
+            self.error(f"Invalid time '{text}'")
+
+_CLOCK = re.compile(r"(\d{1,2}):(\d{2})(?::(\d{2}(?:\.\d+)?))?")
+
+def _time_bound(text):
+    """("clock", seconds after midnight) for HH:MM[:SS[.fff]], else ("epoch", seconds)"""
+    match = _CLOCK.fullmatch(text)
+    if match:
+        hours, minutes, seconds = match.groups()
+        return ("clock", int(hours) * 3600 + int(minutes) * 60 + float(seconds or 0))
+    return ("epoch", float(text))
+
+def reference_time(columns):
+    """Timestamp on whose day the clock times of a query over columns fall
+
+    This is the day of the first message, so that a query selects the same
+    messages whether it is evaluated over the columns or checked message
+    by message.
+    """
+    return columns.timestamps[0] if len(columns) else time.time()
+
+def parse_time(text, reference):
+    """Convert HH:MM[:SS[.fff]] on reference's day, or epoch seconds, to a timestamp
+
+    Raises:
+        ValueError: If text is neither
+    """
+    return TimeRange.resolve(_time_bound(text.strip()), reference)
+
+class DLTQuery:
+    """
+    A parsed filter query
+
+    evaluate() runs the query's plan over DLTMessageColumns: within each
+    conjunction the categorical predicates are merged into one bitmap
+    index lookup, then time ranges, substrings and regexes follow, each
+    class ordered by estimated selectivity and each evaluated only over
+    the positions the previous ones left. explain() reports every step
+    with its estimated and actual selectivity.
+    """
+
+    def __init__(self, text):
+        self.text = text.strip()
+        if not self.text:
+            raise DLTQueryError("Empty query", 0)
+        self.root = _Parser(self.text).parse()
+        # Day of clock times when matches() is given no reference
+        self.reference = time.time()
+
+    def evaluate(self, columns, positions=None):
+        """Get the matching positions among positions (None for all)"""
+        return self._run(columns, positions).result
+
+    def _run(self, columns, positions):
+        ctx = _Context(columns)
+        ctx.result = self.root.evaluate(ctx, positions)
+        return ctx
+
+    def matches(self, message, reference=None):
+        """Check one message
+
+        Args:
+            message: Message to check
+            reference: Timestamp on whose day clock times fall; pass
+                reference_time() of the columns the message belongs to.
+                None for the day the query was parsed.
+        """
+        return self.root.matches(message, self.reference if reference is None else reference)
+
+    def explain(self, columns):
+        """Run the query and describe each step
+
+        Returns:
+            Text with one line per step: the predicate, how it was
+            evaluated, its estimated and actual selectivity and the
+            number of positions going in and out
+        """
+        ctx = self._run(columns, None)
+        lines = [f"Query: {self.text}",
+                 f"{'step':<48} {'method':<22} {'est':>7} {'actual':>7} {'in':>10} {'out':>10}"]
+        for depth, description, method, estimate, before, after in ctx.trace:
+            actual = after / before if before else 0.0
+            label = "  " * depth + description
+            lines.append(f"{label:<48} {method:<22} {estimate:>7.1%} {actual:>7.1%} {before:>10} {after:>10}")
+        return "\n".join(lines)
+
+def parse_query(text):
+    """Parse query text (raises DLTQueryError)"""
+    return DLTQuery(text)
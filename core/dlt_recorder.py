@@ -0,0 +1,131 @@
+"""
+DLT Recorder - Rotating, indexed recording of raw DLT frames
+"""
+import os
+import threading
+import time
+from datetime import datetime
+from .dlt_message import DLTMessage
+from .dlt_index import DLTFileIndex
+
+class DLTRecorder:
+    """
+    Writes raw frames to size/time rotated files with a sparse index each
+
+    Set as DLTConnection.recorder it takes over the connection's log file:
+    the connection calls write_frames(), flush() and close() the same way
+    it uses a plain file. The index of the current file is rewritten at
+    most every index_interval seconds and when the file is closed.
+    """
+
+    MAGIC = b"DLT\1"
+
+    def __init__(self, directory, prefix="DLT_LOG", max_bytes=256 * 1024 * 1024,
+                 max_seconds=3600, index_block_size=1000, index_interval=10.0):
+        """Initialize the recorder
+
+        Args:
+            directory: Directory receiving the recordings
+            prefix: File name prefix, followed by the start time
+            max_bytes: Start a new file beyond this size (0 for no limit)
+            max_seconds: Start a new file after this time (0 for no limit)
+            index_block_size: Messages per index block
+            index_interval: Longest time the index file lags behind the data
+        """
+        self.directory = directory
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.index_block_size = index_block_size
+        self.index_interval = index_interval
+
+        self.file = None
+        self.path = None
+        self.index = None
+        self.opened_at = None
+        self.last_index_save = 0.0
+        self._lock = threading.RLock()
+
+        self.files = []
+        self.bytes_written = 0
+        self.messages_written = 0
+        self.rotations = 0
+
+    def open(self):
+        """Start a new recording file"""
+        with self._lock:
+            self.close()
+            os.makedirs(self.directory, exist_ok=True)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+            self.path = os.path.join(self.directory, f"{self.prefix}_{timestamp}.dlt")
+            self.file = open(self.path, "wb")
+            self.file.write(self.MAGIC)
+            self.index = DLTFileIndex(self.index_block_size)
+            self.index.size = len(self.MAGIC)
+            self.opened_at = time.time()
+            self.files.append(self.path)
+            print(f"Started new log file: {self.path}")
+
+    def write_frames(self, frames, recv_time=None):
+        """Append raw frames, rotating first if a limit is reached"""
+        if recv_time is None:
+            recv_time = time.time()
+        with self._lock:
+            if self.file is None:
+                self.open()
+            elif self._rotation_due(recv_time):
+                self.rotations += 1
+                self.open()
+
+            data = b"".join(frames)
+            self.file.write(data)
+            self.index.add_frames(frames, self.index.size, recv_time)
+            self.bytes_written += len(data)
+            self.messages_written += len(frames)
+
+    def write(self, data):
+        """Append bytes holding complete frames (file-like interface)"""
+        frames, _ = DLTMessage.split_frames(data)
+        self.write_frames(frames)
+
+    def _rotation_due(self, now):
+        if self.max_bytes and self.index.size >= self.max_bytes:
+            return True
+        return bool(self.max_seconds) and now - self.opened_at >= self.max_seconds
+
+    def flush(self):
+        """Flush the data and, every index_interval, the index"""
+        with self._lock:
+            if self.file is None:
+                return
+            self.file.flush()
+            if time.time() - self.last_index_save >= self.index_interval:
+                self._save_index()
+
+    def close(self):
+        """Close the current file and write its final index"""
+        with self._lock:
+            if self.file is None:
+                return
+            self.file.close()
+            self.file = None
+            self._save_index()
+
+    def _save_index(self):
+        try:
+            self.index.save(DLTFileIndex.path_for(self.path))
+        except OSError as e:
+            print(f"Error writing index: {e}")
+        self.last_index_save = time.time()
+
+    def get_stats(self):
+        """Get file, size and rotation statistics"""
+        with self._lock:
+            return {
+                "file": self.path,
+                "file_size": self.index.size if self.index else 0,
+                "files": len(self.files),
+                "bytes": self.bytes_written,
+                "messages": self.messages_written,
+                "rotations": self.rotations
+            }
@@ -4,16 +4,147 @@ DLT Regular Expression Support
 import re
 from datetime import datetime
 
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+def _literal_runs(parsed, literals, run=None):
+    """Collect the literal runs every match of a parsed pattern contains
+
+    Returns the run still open at the end, which a group's caller
+    continues, since a group's text is contiguous with its neighbours.
+    """
+    run = [] if run is None else run
+    for op, av in parsed:
+        name = str(op)
+        if name == "LITERAL":
+            run.append(chr(av))
+            continue
+        if name == "SUBPATTERN":
+            run = _literal_runs(av[-1], literals, run)
+            continue
+        if run:
+            literals.append("".join(run))
+            run = []
+        if name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT") and av[0] >= 1:
+            _flush(_literal_runs(av[2], literals), literals)
+        elif name == "ATOMIC_GROUP":
+            _flush(_literal_runs(av, literals), literals)
+        # Alternations, classes, lookarounds and backreferences require
+        # no particular literal
+    return run
+
+def _flush(run, literals):
+    """Record a finished literal run"""
+    if run:
+        literals.append("".join(run))
+
+def required_literals(pattern, flags=0):
+    """Get literal substrings that every match of a regex must contain
+
+    Searches can skip any text lacking one of them without running the
+    regex. Case-insensitive patterns yield the literals as written, so
+    callers compare casefolded text.
+
+    Args:
+        pattern: Regular expression pattern string
+        flags: re flags the pattern is compiled with
+
+    Returns:
+        List of literals, longest first (empty if nothing is required)
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except (re.error, TypeError):
+        return []
+    literals = []
+    _flush(_literal_runs(parsed, literals), literals)
+    return sorted(dict.fromkeys(literals), key=len, reverse=True)
+
+class LiteralAutomaton:
+    """
+    Aho-Corasick automaton finding which of many literals occur in a text
+
+    One pass over the text reports every literal it contains, including
+    overlapping ones, however many literals there are.
+    """
+    
+    def __init__(self, literals):
+        """Build the automaton
+        
+        Args:
+            literals: Strings to look for
+        """
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [()]
+        for literal in literals:
+            self._add(literal)
+        self._link()
+        
+    def _add(self, literal):
+        """Add a literal to the trie"""
+        state = 0
+        for char in literal:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(())
+            state = next_state
+        self.output[state] = (literal,)
+        
+    def _link(self):
+        """Compute failure links breadth first, merging outputs along them"""
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+                
+    def find(self, text):
+        """Get the set of literals occurring in text"""
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
 class DLTRegexMatcher:
-    """Regular expression matching for DLT messages"""
+    """
+    Regular expression matching for DLT messages
+    
+    Patterns are not tried one after another on every message: each
+    pattern's longest required literal (see required_literals) goes into
+    one LiteralAutomaton, a single pass over the casefolded payload finds
+    the patterns that can match, and only those regexes run. Patterns
+    without a required literal are always tried.
+    """
     
     def __init__(self):
         self.patterns = {}
+        self._prefilter = None
         
     def add_pattern(self, name, pattern, flags=0):
         """Add a regex pattern"""
         try:
             self.patterns[name] = re.compile(pattern, flags)
+            self._prefilter = None
             return True
         except re.error:
             return False
@@ -22,19 +153,83 @@ class DLTRegexMatcher:
         """Remove a regex pattern"""
         if name in self.patterns:
             del self.patterns[name]
+            self._prefilter = None
             
+    def _get_prefilter(self):
+        """Build the literal automaton for the current patterns
+        
+        Returns:
+            (automaton, pattern names by literal, names of the patterns
+            without a required literal, position of each pattern name)
+        """
+        if self._prefilter is None:
+            by_literal = {}
+            unfiltered = []
+            for name, pattern in self.patterns.items():
+                literals = required_literals(pattern.pattern, pattern.flags & ~re.UNICODE)
+                if literals:
+                    by_literal.setdefault(literals[0].casefold(), []).append(name)
+                else:
+                    unfiltered.append(name)
+            order = {name: position for position, name in enumerate(self.patterns)}
+            self._prefilter = (LiteralAutomaton(by_literal), by_literal, unfiltered, order)
+        return self._prefilter
+        
+    def candidates(self, payload):
+        """Get the names of the patterns that can match a payload, in pattern order"""
+        automaton, by_literal, unfiltered, order = self._get_prefilter()
+        names = list(unfiltered)
+        if by_literal:
+            for literal in automaton.find(payload.casefold()):
+                names.extend(by_literal[literal])
+        if len(names) > 1:
+            names.sort(key=order.__getitem__)
+        return names
+        
     def match_message(self, message):
         """Match message against all patterns"""
         results = {}
-        for name, pattern in self.patterns.items():
-            match = pattern.search(message.payload)
+        payload = message.payload
+        for name in self.candidates(payload):
+            match = self.patterns[name].search(payload)
             if match:
                 results[name] = match.groups()
         return results
         
     def find_all(self, message):
         """Find all matches in message"""
+        payload = message.payload
+        candidates = set(self.candidates(payload))
         results = {}
         for name, pattern in self.patterns.items():
-            results[name] = pattern.findall(message.payload)
-        return results
\ No newline at end of file
+            results[name] = pattern.findall(payload) if name in candidates else []
+        return results
+        
+    def match_range(self, messages, start=0, end=None):
+        """Match a range of messages against all patterns
+        
+        Args:
+            messages: Message sequence
+            start: First index to match
+            end: Index to stop at (None for the end of the sequence)
+            
+        Returns:
+            List of (index, results) for the messages matching any
+            pattern, results as returned by match_message
+        """
+        end = len(messages) if end is None else min(end, len(messages))
+        self._get_prefilter()
+        candidates = self.candidates
+        patterns = self.patterns
+        
+        matched = []
+        for index in range(start, end):
+            payload = messages[index].payload
+            results = {}
+            for name in candidates(payload):
+                match = patterns[name].search(payload)
+                if match:
+                    results[name] = match.groups()
+            if results:
+                matched.append((index, results))
+        return matched
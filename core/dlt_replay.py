@@ -0,0 +1,344 @@
+"""
+DLT Replay Server - Local DLT daemon stand-in for testing and benchmarks
+"""
+import argparse
+import random
+import socket
+import threading
+import time
+from .dlt_message import DLTMessage
+
+def iter_file_frames(file_path):
+    """Yield the raw message frames stored in a .dlt file
+
+    The optional file magic is skipped. Frames are delimited by the length
+    field of the standard header, and reading stops at the first frame with
+    an invalid length.
+    """
+    with open(file_path, 'rb') as f:
+        data = f.read()
+
+    start = 4 if data[:4] == b'DLT\1' else 0
+    frames, _ = DLTMessage.split_frames(memoryview(data)[start:])
+    yield from frames
+
+def iter_synthetic_frames(count=None, apps=("NAV", "HMI", "DIAG", "MEDIA"),
+                          contexts=("MAIN", "NET", "IO"), payload_size=64, seed=None):
+    """Yield synthetic LOG messages
+
+    Every payload starts with "seq=<n> t=<send time>" so a receiver can
+    measure end-to-end latency. The send time is filled in by the server
+    right before the frame goes out (see stamp_frame).
+
+    Args:
+        count: Number of messages to generate (None for endless)
+        apps: Application IDs to cycle through
+        contexts: Context IDs to cycle through
+        payload_size: Approximate payload length in bytes
+        seed: Random seed for reproducible streams
+    """
+    rng = random.Random(seed)
+    levels = ("FATAL", "ERROR", "WARN", "INFO", "INFO", "INFO", "DEBUG", "VERBOSE")
+    seq = 0
+    while count is None or seq < count:
+        msg = DLTMessage()
+        msg.app_id = apps[seq % len(apps)]
+        msg.ctx_id = contexts[rng.randrange(len(contexts))]
+        msg.log_level = levels[rng.randrange(len(levels))]
+        msg.counter = seq & 0xFF
+        msg.arg_count = 1
+        header = f"seq={seq} t={0.0:017.6f} "
+        msg.payload = header + "x" * max(0, payload_size - len(header))
+        yield msg.encode()
+        seq += 1
+
+def stamp_frame(frame, send_time):
+    """Return a copy of a synthetic frame with its "t=" field set to send_time
+
+    Frames that do not carry a synthetic payload are returned unchanged.
+    """
+    if frame[14:18] != b"seq=":
+        return frame
+    marker = frame.find(b" t=", 18)
+    if marker < 0:
+        return frame
+    stamped = bytearray(frame)
+    stamped[marker + 3:marker + 20] = f"{send_time:017.6f}".encode('ascii')
+    return bytes(stamped)
+
+def parse_send_time(payload):
+    """Extract the send time from a synthetic payload, or None"""
+    marker = payload.find(" t=")
+    if marker < 0:
+        return None
+    try:
+        return float(payload[marker + 3:marker + 20])
+    except ValueError:
+        return None
+
+class DLTReplayServer:
+    """
+    Serves DLT frames over TCP (as a DLT daemon would) or sends them over UDP
+
+    Frames come from a source factory (a callable returning an iterator of
+    raw frames), so every TCP client gets its own stream. Pacing, bursts,
+    dropped frames and payload corruption are configurable.
+    """
+
+    def __init__(self, source_factory, host="127.0.0.1", port=3490, protocol="tcp",
+                 rate=1000.0, speed=1.0, burst_every=None, burst_size=0,
+                 drop_rate=0.0, corrupt_rate=0.0, datagram_size=1400, seed=None):
+        """Initialize the server
+
+        Args:
+            source_factory: Callable returning an iterator of raw frames
+            host: Address to listen on (TCP) or send to (UDP)
+            port: Port to listen on (TCP) or send to (UDP)
+            protocol: "tcp" or "udp"
+            rate: Messages per second at 1x speed
+            speed: Playback speed multiplier (0 or None for as fast as possible)
+            burst_every: Seconds between bursts (None for no bursts)
+            burst_size: Extra messages sent back to back in each burst
+            drop_rate: Probability of silently skipping a frame
+            corrupt_rate: Probability of flipping bytes in a frame's payload
+            datagram_size: Maximum UDP datagram size (several frames per datagram)
+            seed: Random seed for drops and corruption
+        """
+        self.source_factory = source_factory
+        self.host = host
+        self.port = port
+        self.protocol = protocol.lower()
+        self.rate = rate
+        self.speed = speed
+        self.burst_every = burst_every
+        self.burst_size = burst_size
+        self.drop_rate = drop_rate
+        self.corrupt_rate = corrupt_rate
+        self.datagram_size = datagram_size
+        self.rng = random.Random(seed)
+
+        self.server_socket = None
+        self.accept_thread = None
+        self.stream_threads = []
+        self.stop_event = threading.Event()
+        self._stats_lock = threading.Lock()
+        self.sent_messages = 0
+        self.sent_bytes = 0
+        self.dropped_messages = 0
+        self.corrupted_messages = 0
+
+    def start(self):
+        """Start serving in background threads
+
+        Returns:
+            The (host, port) the server is bound to (TCP) or sending to (UDP)
+        """
+        self.stop_event.clear()
+        if self.protocol == "udp":
+            self._start_stream_thread(self._serve_udp)
+        else:
+            self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.server_socket.bind((self.host, self.port))
+            self.server_socket.listen(8)
+            self.server_socket.settimeout(0.2)
+            self.port = self.server_socket.getsockname()[1]
+            self.accept_thread = threading.Thread(target=self._accept_loop)
+            self.accept_thread.daemon = True
+            self.accept_thread.start()
+
+        return self.host, self.port
+
+    def _start_stream_thread(self, target, *args):
+        """Run one stream in a background thread"""
+        thread = threading.Thread(target=target, args=args)
+        thread.daemon = True
+        thread.start()
+        self.stream_threads.append(thread)
+
+    def stop(self):
+        """Stop serving and close all sockets"""
+        self.stop_event.set()
+        if self.accept_thread:
+            self.accept_thread.join(timeout=2.0)
+            self.accept_thread = None
+        for thread in self.stream_threads:
+            thread.join(timeout=2.0)
+        self.stream_threads = []
+        if self.server_socket:
+            self.server_socket.close()
+            self.server_socket = None
+
+    def wait(self, timeout=None):
+        """Wait until all started streams have been sent completely"""
+        deadline = None if timeout is None else time.time() + timeout
+        for thread in list(self.stream_threads):
+            remaining = None if deadline is None else max(0.0, deadline - time.time())
+            thread.join(remaining)
+
+    def _accept_loop(self):
+        """Accept TCP clients and stream to each in its own thread"""
+        while not self.stop_event.is_set():
+            try:
+                client, _ = self.server_socket.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._start_stream_thread(self._serve_tcp_client, client)
+
+    def _serve_tcp_client(self, client):
+        """Stream frames to one TCP client"""
+        try:
+            self._stream(client.sendall, max_chunk=65536)
+        except OSError:
+            pass  # Client went away
+        finally:
+            client.close()
+
+    def _serve_udp(self):
+        """Send frames as UDP datagrams to host:port"""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 1)
+        target = (self.host, self.port)
+        try:
+            self._stream(lambda data: sock.sendto(data, target), max_chunk=self.datagram_size)
+        finally:
+            sock.close()
+
+    def _stream(self, send, max_chunk):
+        """Pace frames from a new source through send()
+
+        Frames that are due are coalesced into chunks of at most max_chunk
+        bytes (never splitting a frame), so fast playback is not limited by
+        one system call per message.
+        """
+        interval = 0.0
+        if self.speed and self.rate:
+            interval = 1.0 / (self.rate * self.speed)
+
+        start = time.perf_counter()
+        next_burst = start + self.burst_every if self.burst_every else None
+        due = 0
+        chunk = bytearray()
+
+        for frame in self.source_factory():
+            if self.stop_event.is_set():
+                break
+
+            if interval:
+                now = time.perf_counter()
+                if next_burst is not None and now >= next_burst:
+                    # Let the next burst_size frames through without pacing
+                    due += self.burst_size
+                    next_burst += self.burst_every
+                if due > 0:
+                    due -= 1
+                else:
+                    start += interval
+                    if start > now:
+                        if chunk:
+                            self._send_chunk(send, chunk)
+                            chunk = bytearray()
+                        time.sleep(start - now)
+
+            frame = self._mangle(frame)
+            if frame is None:
+                continue
+
+            if chunk and len(chunk) + len(frame) > max_chunk:
+                self._send_chunk(send, chunk)
+                chunk = bytearray()
+            chunk += frame
+
+        if chunk:
+            self._send_chunk(send, chunk)
+
+    def _send_chunk(self, send, chunk):
+        """Stamp synthetic send times and send one chunk"""
+        now = time.time()
+        frames, _ = DLTMessage.split_frames(chunk)
+        data = b"".join(stamp_frame(frame, now) for frame in frames)
+        count = len(frames)
+        send(data)
+        with self._stats_lock:
+            self.sent_messages += count
+            self.sent_bytes += len(data)
+
+    def _mangle(self, frame):
+        """Apply drop and corruption injection to a frame"""
+        if self.drop_rate and self.rng.random() < self.drop_rate:
+            with self._stats_lock:
+                self.dropped_messages += 1
+            return None
+
+        if self.corrupt_rate and len(frame) > 14 and self.rng.random() < self.corrupt_rate:
+            # Corrupt payload bytes only, framing stays intact
+            corrupted = bytearray(frame)
+            for _ in range(self.rng.randint(1, 4)):
+                pos = self.rng.randrange(14, len(corrupted))
+                corrupted[pos] ^= 0xFF
+            with self._stats_lock:
+                self.corrupted_messages += 1
+            return bytes(corrupted)
+
+        return frame
+
+    def get_stats(self):
+        """Get sender statistics"""
+        with self._stats_lock:
+            return {
+                "sent_messages": self.sent_messages,
+                "sent_bytes": self.sent_bytes,
+                "dropped_messages": self.dropped_messages,
+                "corrupted_messages": self.corrupted_messages
+            }
+
+def main(argv=None):
+    """Command line entry point: python -m core.dlt_replay"""
+    parser = argparse.ArgumentParser(description="Serve a .dlt file or synthetic DLT traffic")
+    parser.add_argument("file", nargs="?", help=".dlt file to replay (synthetic if omitted)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3490)
+    parser.add_argument("--protocol", choices=("tcp", "udp"), default="tcp")
+    parser.add_argument("--rate", type=float, default=1000.0, help="messages/s at 1x")
+    parser.add_argument("--speed", type=float, default=1.0, help="speed factor, 0 = unthrottled")
+    parser.add_argument("--count", type=int, default=None, help="synthetic message count")
+    parser.add_argument("--loop", action="store_true", help="repeat the file forever")
+    parser.add_argument("--burst-every", type=float, default=None)
+    parser.add_argument("--burst-size", type=int, default=0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--corrupt-rate", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    if args.file:
+        def source():
+            while True:
+                yield from iter_file_frames(args.file)
+                if not args.loop:
+                    break
+    else:
+        def source():
+            return iter_synthetic_frames(args.count)
+
+    server = DLTReplayServer(
+        source, host=args.host, port=args.port, protocol=args.protocol,
+        rate=args.rate, speed=args.speed, burst_every=args.burst_every,
+        burst_size=args.burst_size, drop_rate=args.drop_rate,
+        corrupt_rate=args.corrupt_rate
+    )
+    host, port = server.start()
+    print(f"Serving DLT over {args.protocol.upper()} on {host}:{port}")
+    try:
+        while True:
+            time.sleep(1.0)
+            print(server.get_stats())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
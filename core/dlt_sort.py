@@ -0,0 +1,135 @@
+"""
+DLT Sort Index - Cached sort permutations of message columns
+"""
+import heapq
+from array import array
+
+class DLTSortIndex:
+    """
+    Sort permutations of a DLTMessageColumns, one per field and direction
+
+    A permutation lists all positions in sort order, ties in position
+    order, as a stable sort of the messages would. Categorical fields are
+    sorted by concatenating the bitmap index positions of their values in
+    value order, without comparing messages at all; timestamps already in
+    order are their own permutation; other fields are argsorted once over
+    the column. Sorting a filter result then only selects its positions
+    from the cached permutation, so re-sorting, flipping the direction or
+    changing the filter never compares keys again. Positions appended to
+    the columns are sorted on their own and merged in.
+    """
+
+    def __init__(self, columns):
+        """Initialize the index
+
+        Args:
+            columns: DLTMessageColumns to sort
+        """
+        self.columns = columns
+        # (field, reverse) -> [count, order, ranks]
+        self._orders = {}
+
+    def _key(self, field):
+        """Key lookup of a non-categorical field"""
+        if field == "timestamp":
+            return self.columns.timestamps.__getitem__
+        if field == "payload":
+            return self.columns.payloads.__getitem__
+        raise ValueError(f"Unknown sort field: {field}")
+
+    def order(self, field, reverse=False):
+        """Get the permutation of all positions sorted by a field
+
+        Args:
+            field: Message attribute: timestamp, payload or a categorical field
+            reverse: Sort descending
+
+        Returns:
+            array('I') of positions in sort order
+        """
+        columns = self.columns
+        count = len(columns)
+        entry = self._orders.get((field, reverse))
+        if entry is not None and entry[0] == count:
+            return entry[1]
+
+        if field in columns.CATEGORICAL:
+            index = columns.bitmaps()
+            values = columns.values[field]
+            order = array('I')
+            for code in sorted(range(len(values)), key=values.__getitem__, reverse=reverse):
+                order.extend(index.select({field: (code,)}))
+        elif field == "timestamp" and not reverse and columns.times().sorted:
+            order = array('I', range(count))
+        else:
+            key = self._key(field)
+            if entry is not None:
+                # Merge the appended positions into the cached order
+                tail = sorted(range(entry[0], count), key=key, reverse=reverse)
+                order = array('I', heapq.merge(entry[1], tail, key=key, reverse=reverse))
+            else:
+                order = array('I', sorted(range(count), key=key, reverse=reverse))
+
+        self._orders[(field, reverse)] = [count, order, None]
+        return order
+
+    def _ranks(self, field, reverse):
+        """Sort rank of every position (inverse of the permutation)"""
+        entry = self._orders[(field, reverse)]
+        if entry[2] is None:
+            order = entry[1]
+            ranks = array('I', bytes(order.itemsize * len(order)))
+            for rank, position in enumerate(order):
+                ranks[position] = rank
+            entry[2] = ranks
+        return entry[2]
+
+    def sort(self, positions, field, reverse=False):
+        """Sort positions by a field
+
+        Args:
+            positions: Distinct positions (e.g. a filter result)
+            field: Field to sort by (see order())
+            reverse: Sort descending
+
+        Returns:
+            New list of the positions in sort order
+        """
+        order = self.order(field, reverse)
+        total = len(order)
+        count = len(positions)
+        if count == total:
+            return order.tolist()
+        if count * max(1, count.bit_length()) < total:
+            # Few positions: sort them by rank
+            return sorted(positions, key=self._ranks(field, reverse).__getitem__)
+        selected = bytearray(total)
+        for position in positions:
+            selected[position] = 1
+        return [position for position in order if selected[position]]
+
+    def row_of(self, rows, position, field, reverse=False):
+        """Find where a position falls among positions sorted by sort()
+
+        Args:
+            rows: Positions in the order sort() returned them
+            position: Position to look up (need not be among rows)
+            field: Field the rows are sorted by
+            reverse: Whether the rows are sorted descending
+
+        Returns:
+            Index of the first row not sorting before position (len(rows)
+            if there is none)
+        """
+        self.order(field, reverse)
+        ranks = self._ranks(field, reverse)
+        rank = ranks[position]
+        # Binary search: the ranks of the rows ascend
+        low, high = 0, len(rows)
+        while low < high:
+            middle = (low + high) // 2
+            if ranks[rows[middle]] < rank:
+                low = middle + 1
+            else:
+                high = middle
+        return low
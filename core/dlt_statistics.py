@@ -3,6 +3,7 @@ DLT Statistics Manager
 """
 from datetime import datetime, timedelta
 from collections import defaultdict
+from .dlt_loss import DLTLossTracker
 
 class DLTStatistics:
     """Class for collecting and analyzing DLT message statistics"""
@@ -28,6 +29,9 @@ class DLTStatistics:
         self.messages_by_hour = defaultdict(int)
         self.bytes_by_hour = defaultdict(int)
         
+        # Message counter gaps per ECU/session
+        self.loss_tracker = DLTLossTracker()
+        
         # Performance metrics
         self.min_processing_time = float('inf')
         self.max_processing_time = 0
@@ -35,6 +39,7 @@ class DLTStatistics:
         
     def update(self, message, processing_time=None):
         """Update statistics with new message"""
+        self.loss_tracker.track(message, self.total_messages)
         self.total_messages += 1
         self.bytes_received += len(message.raw_data) if message.raw_data else 0
         
@@ -72,6 +77,10 @@ class DLTStatistics:
             "ecu_distribution": dict(self.ecu_counts),
             "app_distribution": dict(self.app_counts),
             "level_distribution": dict(self.level_counts),
+            "message_loss": {
+                key: value for key, value in self.loss_tracker.get_stats().items()
+                if key != "streams"
+            },
             "performance": {
                 "min_processing_time": round(self.min_processing_time, 6),
                 "max_processing_time": round(self.max_processing_time, 6),
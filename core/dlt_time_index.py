@@ -0,0 +1,170 @@
+"""
+DLT Time Index - Binary search over message timestamps
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+
+class DLTTimeIndex:
+    """
+    Time range and go-to-time lookups over an append-only timestamp column
+
+    While timestamps arrive in order (a file, or a merged live session)
+    the column itself is sorted, and a time range or a jump to a point in
+    time is a binary search. Once a timestamp goes backwards the index
+    falls back to a per-block minimum/maximum sketch: blocks entirely
+    outside a range are skipped, blocks entirely inside are taken whole,
+    and only the rest are compared message by message. The running
+    maximum over the blocks is sorted in any case, so go-to-time stays a
+    binary search.
+    """
+
+    def __init__(self, timestamps, block_size=1024):
+        """Initialize the index
+
+        Args:
+            timestamps: Append-only sequence of timestamps (array('d'))
+            block_size: Messages per block of the sketch
+        """
+        self.timestamps = timestamps
+        self.block_size = max(1, int(block_size))
+        self.indexed = 0
+        self.sorted = True
+        self.minimums = array('d')
+        self.maximums = array('d')
+        # Maximum timestamp of each block and all blocks before it
+        self.running_max = array('d')
+
+    def update(self):
+        """Index timestamps added since the last update"""
+        timestamps = self.timestamps
+        total = len(timestamps)
+        if total == self.indexed:
+            return
+        if self.sorted:
+            new = timestamps[max(0, self.indexed - 1):total].tolist()
+            self.sorted = new == sorted(new)
+
+        # Re-index the last, partially filled block
+        block_size = self.block_size
+        first = self.indexed // block_size
+        del self.minimums[first:]
+        del self.maximums[first:]
+        del self.running_max[first:]
+        previous = self.running_max[-1] if self.running_max else float("-inf")
+        for start in range(first * block_size, total, block_size):
+            block = timestamps[start:start + block_size]
+            low, high = min(block), max(block)
+            previous = max(previous, high)
+            self.minimums.append(low)
+            self.maximums.append(high)
+            self.running_max.append(previous)
+        self.indexed = total
+
+    def _inside(self, timestamp, start, end, start_inclusive, end_inclusive):
+        if start is not None and (timestamp < start or (timestamp == start and not start_inclusive)):
+            return False
+        if end is not None and (timestamp > end or (timestamp == end and not end_inclusive)):
+            return False
+        return True
+
+    def bounds(self, start=None, end=None, start_inclusive=True, end_inclusive=True):
+        """Position range of a time range in a sorted column
+
+        Returns:
+            range of positions, or None if the timestamps are not sorted
+        """
+        self.update()
+        if not self.sorted:
+            return None
+        timestamps = self.timestamps
+        low = 0
+        if start is not None:
+            low = (bisect_left if start_inclusive else bisect_right)(timestamps, start)
+        high = len(timestamps)
+        if end is not None:
+            high = (bisect_right if end_inclusive else bisect_left)(timestamps, end)
+        return range(low, max(low, high))
+
+    def select(self, start=None, end=None, positions=None, start_inclusive=True, end_inclusive=True):
+        """Get the positions whose timestamp lies within a time range
+
+        Args:
+            start: Range start (None for unbounded)
+            end: Range end (None for unbounded)
+            positions: Ascending positions to consider (None for all)
+            start_inclusive: Include messages at exactly start
+            end_inclusive: Include messages at exactly end
+
+        Returns:
+            Matching positions in ascending order: a range when the
+            timestamps are sorted and positions is None or a range,
+            otherwise a list
+        """
+        window = self.bounds(start, end, start_inclusive, end_inclusive)
+        if window is not None:
+            if positions is None:
+                return window
+            if isinstance(positions, range) and positions.step == 1:
+                low, high = max(window.start, positions.start), min(window.stop, positions.stop)
+                return range(low, max(low, high))
+            return positions[bisect_left(positions, window.start):bisect_left(positions, window.stop)]
+
+        timestamps = self.timestamps
+        limits = (start, end, start_inclusive, end_inclusive)
+        inside = self._inside
+        if positions is not None and not (isinstance(positions, range) and positions.step == 1):
+            return [i for i in positions if inside(timestamps[i], *limits)]
+
+        low, high = (0, len(timestamps)) if positions is None else (positions.start, positions.stop)
+        block_size = self.block_size
+        result = []
+        for block in range(low // block_size, (high + block_size - 1) // block_size):
+            first = max(low, block * block_size)
+            last = min(high, (block + 1) * block_size)
+            smallest, largest = self.minimums[block], self.maximums[block]
+            if inside(smallest, *limits) and inside(largest, *limits):
+                result.extend(range(first, last))
+            elif not ((start is not None and (largest < start or (largest == start and not start_inclusive)))
+                      or (end is not None and (smallest > end or (smallest == end and not end_inclusive)))):
+                result.extend(i for i in range(first, last) if inside(timestamps[i], *limits))
+        return result
+
+    def estimate(self, start=None, end=None):
+        """Estimated fraction of messages within a time range
+
+        Exact for sorted timestamps; otherwise blocks partly overlapping
+        the range count half.
+        """
+        total = len(self.timestamps)
+        if not total:
+            return 0.0
+        window = self.bounds(start, end)
+        if window is not None:
+            return len(window) / total
+        inside = 0.0
+        for block, (smallest, largest) in enumerate(zip(self.minimums, self.maximums)):
+            size = min(self.block_size, total - block * self.block_size)
+            if (start is not None and largest < start) or (end is not None and smallest > end):
+                continue
+            full = (start is None or smallest >= start) and (end is None or largest <= end)
+            inside += size if full else size / 2
+        return inside / total
+
+    def find(self, timestamp):
+        """Get the first position at or after a point in time
+
+        Returns:
+            Position of the first message (in position order) whose
+            timestamp is at least timestamp, or the number of messages if
+            there is none
+        """
+        self.update()
+        timestamps = self.timestamps
+        if self.sorted:
+            return bisect_left(timestamps, timestamp)
+        block = bisect_left(self.running_max, timestamp)
+        start = block * self.block_size
+        for i in range(start, min(len(timestamps), start + self.block_size)):
+            if timestamps[i] >= timestamp:
+                return i
+        return len(timestamps)
@@ -0,0 +1,207 @@
+"""
+DLT Trigger Engine - Event-triggered snapshots of the live stream
+"""
+import os
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from .dlt_regex import DLTRegexMatcher
+from .export_manager import DLTExportManager
+
+class DLTTrigger:
+    """Class representing one trigger rule"""
+
+    def __init__(self, name, level=None, pattern=None, app_id=None, ctx_id=None):
+        """Initialize the rule
+
+        Args:
+            name: Name used for the snapshot file and bookmark
+            level: Log level that fires the trigger (e.g. "FATAL")
+            pattern: Regular expression searched in the payload
+            app_id: Only messages of this application
+            ctx_id: Only messages of this context
+
+        A rule with both level and pattern needs both to match.
+        """
+        if level is None and pattern is None:
+            raise ValueError(f"Trigger {name} needs a level or a payload pattern")
+        self.name = name
+        self.level = level
+        self.pattern = pattern
+        self.app_id = app_id
+        self.ctx_id = ctx_id
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create from a configuration entry"""
+        return cls(data["name"], level=data.get("level"), pattern=data.get("pattern"),
+                   app_id=data.get("app_id"), ctx_id=data.get("ctx_id"))
+
+class DLTTriggerSet:
+    """
+    Trigger rules compiled into a single check per message
+
+    Payload patterns go into a DLTRegexMatcher, whose literal prefilter
+    finds the few rules that can match a message in one pass, so most
+    messages run no regex at all. Each rule keeps its own regex, so
+    backreferences and inline flags mean what they mean on their own.
+    Level-only rules are a dictionary lookup.
+    """
+
+    def __init__(self, triggers):
+        self.triggers = list(triggers)
+        self.by_level = {}
+        self.compiled = []
+        self.matcher = DLTRegexMatcher()
+        for trigger in self.triggers:
+            if trigger.pattern is None:
+                self.by_level.setdefault(trigger.level, []).append(trigger)
+            else:
+                # Invalid patterns raise re.error here
+                self.compiled.append((trigger, re.compile(trigger.pattern)))
+                self.matcher.add_pattern(len(self.compiled) - 1, trigger.pattern)
+
+    def match(self, message):
+        """Get the first trigger that fires on message, or None"""
+        for trigger in self.by_level.get(message.log_level, ()):
+            if self._scope_matches(trigger, message):
+                return trigger
+
+        if not self.compiled:
+            return None
+        # Nearly all messages leave no candidate rule; the rare candidates
+        # are checked in rule order for level, scope and their regex
+        payload = message.payload
+        for index in self.matcher.candidates(payload):
+            trigger, regex = self.compiled[index]
+            if ((trigger.level is None or trigger.level == message.log_level)
+                    and self._scope_matches(trigger, message)
+                    and regex.search(payload)):
+                return trigger
+        return None
+
+    @staticmethod
+    def _scope_matches(trigger, message):
+        return ((trigger.app_id is None or trigger.app_id == message.app_id) and
+                (trigger.ctx_id is None or trigger.ctx_id == message.ctx_id))
+
+class TriggerSnapshot:
+    """Class representing one captured pre/post trigger window"""
+
+    def __init__(self, trigger, message, messages, deadline):
+        self.trigger = trigger
+        self.message = message        # Message that fired the trigger
+        self.messages = messages      # Pre-trigger window, then post-trigger messages
+        self.deadline = deadline      # End of the post-trigger window
+        self.hits = 1                 # Triggers fired while capturing
+        self.count = 0                # Messages written
+        self.path = None
+
+class DLTTriggerEngine:
+    """
+    Keeps the last seconds of the live stream and snapshots them on triggers
+
+    Every message passes through a ring of the last pre_seconds (bounded
+    by max_ring_messages as well). When a trigger fires, the ring is
+    copied and the following post_seconds are added before the window is
+    written to a small .dlt file and bookmarked. Triggers firing while a
+    window is still being captured are counted in that snapshot instead of
+    starting a new one.
+    """
+
+    def __init__(self, triggers, output_dir, pre_seconds=10.0, post_seconds=5.0,
+                 max_ring_messages=200000, bookmarks=None):
+        """Initialize the engine
+
+        Args:
+            triggers: Iterable of DLTTrigger rules
+            output_dir: Directory for the snapshot files
+            pre_seconds: Seconds kept before the trigger
+            post_seconds: Seconds captured after the trigger
+            max_ring_messages: Upper bound of the ring, whatever its time span
+            bookmarks: Optional DLTBookmarkManager receiving one bookmark
+                per snapshot
+        """
+        self.trigger_set = DLTTriggerSet(triggers)
+        self.output_dir = output_dir
+        self.pre_seconds = pre_seconds
+        self.post_seconds = post_seconds
+        self.bookmarks = bookmarks
+
+        self.ring = deque(maxlen=max_ring_messages)
+        self.capture = None
+        self.snapshots = []
+        self.new_snapshots = []
+        self._lock = threading.Lock()
+
+    def on_message(self, message):
+        """Handle a live message (called from the message bus)"""
+        with self._lock:
+            now = message.timestamp
+            self.ring.append(message)
+            while self.ring and self.ring[0].timestamp < now - self.pre_seconds:
+                self.ring.popleft()
+
+            if self.capture is not None:
+                if now <= self.capture.deadline:
+                    self.capture.messages.append(message)
+                else:
+                    self._finish()
+
+            trigger = self.trigger_set.match(message)
+            if trigger is None:
+                return
+            if self.capture is not None:
+                self.capture.hits += 1
+                return
+            self.capture = TriggerSnapshot(trigger, message, list(self.ring),
+                                           now + self.post_seconds)
+
+    def tick(self, now=None):
+        """Write a capture whose post-trigger window ended on a quiet link"""
+        if now is None:
+            now = time.time()
+        with self._lock:
+            if self.capture is not None and now > self.capture.deadline:
+                self._finish()
+
+    def close(self):
+        """Write a capture that is still in progress"""
+        with self._lock:
+            if self.capture is not None:
+                self._finish()
+
+    def _finish(self):
+        """Write the current capture and bookmark it (called with the lock held)"""
+        capture, self.capture = self.capture, None
+        stamp = datetime.fromtimestamp(capture.message.timestamp).strftime("%Y%m%d_%H%M%S")
+        name = re.sub(r"[^\w.-]", "_", capture.trigger.name)
+        path = os.path.join(self.output_dir, f"trigger_{name}_{stamp}.dlt")
+        suffix = 1
+        while os.path.exists(path):
+            suffix += 1
+            path = os.path.join(self.output_dir, f"trigger_{name}_{stamp}_{suffix}.dlt")
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            DLTExportManager.export_to_dlt(capture.messages, path)
+        except OSError as e:
+            print(f"Error writing trigger snapshot: {e}")
+            return
+        capture.path = path
+        capture.count = len(capture.messages)
+        capture.messages = None  # Only the file is kept
+
+        if self.bookmarks is not None:
+            self.bookmarks.add_bookmark(
+                capture.message, f"Trigger {capture.trigger.name}: {capture.path}"
+            )
+        self.snapshots.append(capture)
+        self.new_snapshots.append(capture)
+
+    def pop_new_snapshots(self):
+        """Get and clear the snapshots written since the last call"""
+        with self._lock:
+            snapshots, self.new_snapshots = self.new_snapshots, []
+            return snapshots
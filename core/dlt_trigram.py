@@ -0,0 +1,214 @@
+"""
+DLT Trigram Index - Payload trigram index for substring and regex search
+"""
+import base64
+import json
+import os
+import sys
+from array import array
+
+class DLTTrigramIndex:
+    """
+    Trigram index over casefolded message payloads
+
+    Messages are grouped into blocks of block_size, and for every trigram
+    the index lists the blocks whose payloads contain it. A substring can
+    only occur in blocks listing all of its trigrams, so a search verifies
+    just the messages of those blocks. Indexing blocks rather than single
+    messages keeps the index a fraction of the payload size. Positions not
+    indexed yet are always candidates.
+
+    The index is stored next to the DLT file (like DLTFileIndex) together
+    with the file's size and modification time, so it is reused only for
+    the file it was built from.
+    """
+
+    VERSION = 1
+    SUFFIX = ".tri"
+
+    def __init__(self, block_size=256):
+        self.block_size = max(1, int(block_size))
+        self.indexed = 0
+        self.postings = {}
+        self.source = None
+
+    @classmethod
+    def path_for(cls, dlt_path):
+        """Trigram index file path belonging to a DLT file"""
+        return dlt_path + cls.SUFFIX
+
+    def update(self, payloads, cancel=None):
+        """Index the payloads following the ones already indexed
+
+        Args:
+            payloads: Append-only sequence of all payloads
+            cancel: Optional threading.Event aborting the update
+
+        Returns:
+            False if cancelled, True otherwise
+        """
+        postings = self.postings
+        block_size = self.block_size
+        total = len(payloads)
+        position = self.indexed
+        while position < total:
+            if cancel is not None and cancel.is_set():
+                return False
+            block = position // block_size
+            end = min(total, (block + 1) * block_size)
+            text = "\0".join(payloads[position:end]).casefold()
+            for trigram in set(zip(text, text[1:], text[2:])):
+                if "\0" in trigram:
+                    continue
+                key = "".join(trigram)
+                blocks = postings.get(key)
+                if blocks is None:
+                    postings[key] = array('I', (block,))
+                elif blocks[-1] != block:
+                    blocks.append(block)
+            position = self.indexed = end
+        return True
+
+    def candidate_blocks(self, literals):
+        """Get the blocks that may contain all literals
+
+        Returns:
+            Set of block numbers, or None if the literals are too short
+            to narrow the search
+        """
+        lists = []
+        for literal in literals:
+            literal = literal.casefold()
+            for i in range(len(literal) - 2):
+                blocks = self.postings.get(literal[i:i + 3])
+                if blocks is None:
+                    return set()
+                lists.append(blocks)
+        if not lists:
+            return None
+
+        lists.sort(key=len)
+        result = set(lists[0])
+        for blocks in lists[1:]:
+            if not result:
+                break
+            result.intersection_update(blocks)
+        return result
+
+    def candidates(self, literals, positions):
+        """Narrow positions to those that may contain all literals
+
+        Args:
+            literals: Substrings every match contains
+            positions: Ascending positions (a list, or a range with step 1)
+
+        Returns:
+            The positions still to be verified
+        """
+        blocks = self.candidate_blocks(literals)
+        if blocks is None:
+            return positions
+        block_size = self.block_size
+        indexed = self.indexed
+
+        if isinstance(positions, range):
+            low, high = positions.start, positions.stop
+            narrowed = []
+            for block in sorted(blocks):
+                start = max(low, block * block_size)
+                end = min(high, indexed, (block + 1) * block_size)
+                if start < end:
+                    narrowed.extend(range(start, end))
+            if high > indexed:
+                narrowed.extend(range(max(low, indexed), high))
+            return narrowed
+
+        return [i for i in positions if i >= indexed or i // block_size in blocks]
+
+    @staticmethod
+    def file_signature(dlt_path):
+        """Size and modification time identifying a file's contents"""
+        stat = os.stat(dlt_path)
+        return [stat.st_size, stat.st_mtime]
+
+    def to_dict(self):
+        """Convert to dictionary for serialization"""
+        return {
+            "version": self.VERSION,
+            "block_size": self.block_size,
+            "indexed": self.indexed,
+            "source": self.source,
+            "byteorder": sys.byteorder,
+            "postings": {key: base64.b64encode(blocks.tobytes()).decode("ascii")
+                         for key, blocks in self.postings.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create from dictionary"""
+        if data.get("version") != cls.VERSION:
+            raise ValueError(f"Unsupported trigram index version: {data.get('version')}")
+        index = cls(data["block_size"])
+        index.indexed = data["indexed"]
+        index.source = data.get("source")
+        swap = data.get("byteorder", sys.byteorder) != sys.byteorder
+        for key, encoded in data["postings"].items():
+            blocks = array('I')
+            blocks.frombytes(base64.b64decode(encoded))
+            if swap:
+                blocks.byteswap()
+            index.postings[key] = blocks
+        return index
+
+    def save(self, path):
+        """Write the index atomically"""
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Read an index written by save()"""
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    @classmethod
+    def open_or_build(cls, dlt_path, payloads, block_size=256, cancel=None):
+        """Load the stored index of a file, bringing it up to date, or build it
+
+        Args:
+            dlt_path: DLT file the payloads were read from (None to skip storing)
+            payloads: Payloads of the file's messages, in file order
+            block_size: Messages per block for a new index
+            cancel: Optional threading.Event aborting the build
+
+        Returns:
+            DLTTrigramIndex, or None if cancelled
+        """
+        index = None
+        signature = None
+        if dlt_path:
+            signature = cls.file_signature(dlt_path)
+            path = cls.path_for(dlt_path)
+            try:
+                stored = cls.load(path)
+                if (stored.source == signature and stored.block_size == block_size
+                        and stored.indexed <= len(payloads)):
+                    index = stored
+            except (OSError, ValueError, KeyError):
+                pass
+
+        if index is None:
+            index = cls(block_size)
+            index.source = signature
+        indexed = index.indexed
+        if not index.update(payloads, cancel):
+            return None
+
+        if dlt_path and index.indexed != indexed:
+            try:
+                index.save(cls.path_for(dlt_path))
+            except OSError:
+                pass
+        return index
@@ -0,0 +1,171 @@
+"""
+DLT UDP Connection - Module for receiving DLT over UDP unicast and multicast
+"""
+import socket
+import struct
+import threading
+import selectors
+from .dlt_message import DLTMessage
+from .dlt_connection import DLTConnection
+
+class DLTUDPConnection(DLTConnection):
+    """Class for receiving DLT messages sent over UDP (unicast or multicast)
+
+    Every wake-up of the receive thread drains all datagrams queued on the
+    socket before handing the frames to the ingest pipeline, and each
+    datagram may carry several DLT messages. Per-sender counters track
+    datagrams, malformed bytes and message counter gaps, so losses on a
+    congested host become visible.
+    """
+
+    # Requested kernel receive buffer size
+    DEFAULT_RECV_BUFFER = 8 * 1024 * 1024
+
+    # Maximum datagrams handled per wake-up before handing frames on
+    MAX_DATAGRAMS_PER_WAKE = 1024
+
+    def __init__(self, host="0.0.0.0", port=3490, multicast_group=None,
+                 interface="0.0.0.0", recv_buffer_size=DEFAULT_RECV_BUFFER):
+        """Initialize connection parameters
+
+        Args:
+            host: Local address to bind to
+            port: UDP port to listen on
+            multicast_group: Multicast group to join (None for unicast)
+            interface: Local interface address used for the multicast join
+            recv_buffer_size: Requested SO_RCVBUF size in bytes
+        """
+        super().__init__(host, port)
+        self.multicast_group = multicast_group
+        self.interface = interface
+        self.recv_buffer_size = recv_buffer_size
+        self.effective_recv_buffer = 0
+        self.sender_stats = {}
+        self._stats_lock = threading.Lock()
+
+    def connect(self, resume_log=False):
+        """Bind the UDP socket and start receiving"""
+        try:
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.recv_buffer_size)
+            self.effective_recv_buffer = self.socket.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+
+            if self.multicast_group:
+                # Bind to the wildcard address so group traffic is delivered
+                self.socket.bind(("", self.port))
+                membership = struct.pack(
+                    "4s4s",
+                    socket.inet_aton(self.multicast_group),
+                    socket.inet_aton(self.interface)
+                )
+                self.socket.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+            else:
+                self.socket.bind((self.host, self.port))
+
+            self.socket.setblocking(False)
+            self.is_connected = True
+
+            # Set up decoding and recording before any data arrives
+            self._start_pipeline()
+            self._open_log(resume_log)
+
+            # Start receive thread
+            self.stop_thread = False
+            self.receive_thread = threading.Thread(target=self._receive_loop)
+            self.receive_thread.daemon = True
+            self.receive_thread.start()
+
+            return True
+        except Exception as e:
+            print(f"UDP bind failed: {e}")
+            self.last_error = e
+            if self.socket:
+                self.socket.close()
+            self.is_connected = False
+            return False
+
+    def send(self, data):
+        """UDP receive mode has no peer to send control requests to"""
+        raise ConnectionError("Sending is not supported on UDP receive connections")
+
+    def _receive_loop(self):
+        """Background thread for receiving datagrams"""
+        selector = selectors.DefaultSelector()
+        selector.register(self.socket, selectors.EVENT_READ)
+        recv_buffer = bytearray(65536)
+
+        try:
+            while not self.stop_thread:
+                # Wake up periodically to notice stop requests and to
+                # flush the recording while the link is quiet
+                if not selector.select(timeout=self.LOG_FLUSH_INTERVAL):
+                    self._flush_log()
+                    continue
+
+                frames = self._drain_socket(recv_buffer)
+                if frames:
+                    self._ingest_frames(frames)
+        except Exception as e:
+            if not self.stop_thread:
+                print(f"Error receiving data: {e}")
+        finally:
+            selector.close()
+
+        self._on_receive_loop_exit()
+
+    def _drain_socket(self, recv_buffer):
+        """Read all queued datagrams without blocking
+
+        Returns:
+            List of raw frames split from the drained datagrams
+        """
+        frames = []
+        view = memoryview(recv_buffer)
+
+        for _ in range(self.MAX_DATAGRAMS_PER_WAKE):
+            try:
+                size, sender = self.socket.recvfrom_into(recv_buffer)
+            except (BlockingIOError, InterruptedError):
+                break
+
+            datagram_frames, used = DLTMessage.split_frames(view[:size])
+            self._update_sender_stats(sender, size, used, datagram_frames)
+            frames.extend(datagram_frames)
+
+        return frames
+
+    def _update_sender_stats(self, sender, size, used, frames):
+        """Update per-sender datagram and counter gap statistics"""
+        with self._stats_lock:
+            stats = self.sender_stats.get(sender)
+            if stats is None:
+                stats = {
+                    "datagrams": 0,
+                    "bytes": 0,
+                    "messages": 0,
+                    "malformed_bytes": 0
+                }
+                self.sender_stats[sender] = stats
+
+            stats["datagrams"] += 1
+            stats["bytes"] += size
+            stats["messages"] += len(frames)
+            stats["malformed_bytes"] += size - used
+
+        # Each sender has its own message counter sequence
+        self.loss_tracker.track_frames(sender, frames)
+
+    def get_sender_stats(self):
+        """Get a copy of the per-sender receive statistics"""
+        with self._stats_lock:
+            result = {}
+            for addr, stats in self.sender_stats.items():
+                counters = self.loss_tracker.get_stream_stats(addr) or {}
+                result[f"{addr[0]}:{addr[1]}"] = dict(
+                    stats,
+                    counter_gaps=counters.get("gaps", 0),
+                    lost_messages=counters.get("lost", 0),
+                    last_counter=counters.get("last_counter")
+                )
+            return result
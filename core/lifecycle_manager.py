@@ -1,56 +1,173 @@
 """
 DLT Connection Lifecycle Manager
 """
+import random
 import threading
 import time
+from collections import deque
 from utils.logger import get_logger
 
 class DLTLifecycleManager:
-    """Manages DLT connection lifecycle and reconnection"""
-    
-    def __init__(self, connection):
+    """Manages DLT connection lifecycle and reconnection
+
+    Disconnects are reported by the connection's receive loop, so a
+    reconnect starts immediately instead of on the next poll. Failed
+    attempts back off exponentially with jitter. The recording continues in
+    the same log file with a gap marker instead of starting a new file.
+    """
+
+    def __init__(self, connection, reconnect_interval=0.5, max_interval=30.0,
+                 jitter=0.5, max_retries=None):
+        """Initialize the lifecycle manager
+
+        Args:
+            connection: DLTConnection to supervise
+            reconnect_interval: Backoff delay after the first failed attempt (seconds)
+            max_interval: Upper bound for the backoff delay (seconds)
+            jitter: Fraction of each delay that is randomized (0..1)
+            max_retries: Attempts per outage before giving up (None for unlimited)
+        """
         self.connection = connection
         self.logger = get_logger()
         self.auto_reconnect = True
-        self.reconnect_interval = 5  # seconds
-        self.max_retries = 3
+        self.reconnect_interval = reconnect_interval
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.max_retries = max_retries
         self.retry_count = 0
         self.monitor_thread = None
         self.stop_monitor = False
-        
+        self._disconnected = threading.Event()
+        self._stop_event = threading.Event()
+        self._metrics_lock = threading.Lock()
+        self.reset_metrics()
+
+    def reset_metrics(self):
+        """Reset reconnect metrics"""
+        with self._metrics_lock:
+            self.disconnect_count = 0
+            self.reconnect_count = 0
+            self.failed_attempts = 0
+            self.total_downtime = 0.0
+            self.last_downtime = None
+            self.reconnect_latencies = deque(maxlen=100)
+            self.down_since = None
+
     def start(self):
         """Start connection monitoring"""
         self.stop_monitor = False
+        self._stop_event.clear()
+        self._disconnected.clear()
+        self.connection.keep_log_on_drop = True
+        self.connection.add_disconnect_callback(self._on_disconnect)
+
         self.monitor_thread = threading.Thread(target=self._monitor_connection)
         self.monitor_thread.daemon = True
         self.monitor_thread.start()
+
+        # Connection may already be down before monitoring started
+        if not self.connection.is_connected:
+            self._on_disconnect(self.connection)
+
+    def stop(self, timeout=1.0):
+        """Stop connection monitoring
         
-    def stop(self):
-        """Stop connection monitoring"""
+        A reconnect attempt in progress is aborted. Called from the UI
+        thread, so the join is bounded; an attempt that still completes
+        afterwards is disconnected by the monitor thread itself.
+        """
         self.stop_monitor = True
+        self._stop_event.set()
+        self._disconnected.set()
+        self.connection.remove_disconnect_callback(self._on_disconnect)
+        self.connection.keep_log_on_drop = False
+        self.connection.cancel_connect()
         if self.monitor_thread:
-            self.monitor_thread.join()
-            
+            self.monitor_thread.join(timeout)
+
+    def _on_disconnect(self, connection):
+        """Called from the receive loop when the link drops"""
+        with self._metrics_lock:
+            self.disconnect_count += 1
+            if self.down_since is None:
+                self.down_since = connection.disconnected_at or time.time()
+        self._disconnected.set()
+
     def _monitor_connection(self):
-        """Monitor connection and handle reconnection"""
+        """Wait for disconnect events and handle reconnection"""
         while not self.stop_monitor:
-            if not self.connection.is_connected and self.auto_reconnect:
-                if self.retry_count < self.max_retries:
-                    self.logger.info("Connection lost, attempting reconnect...")
-                    if self.connection.connect():
-                        self.logger.info("Reconnection successful")
-                        self.retry_count = 0
-                    else:
-                        self.retry_count += 1
-                        self.logger.warning(
-                            f"Reconnection failed, attempt {self.retry_count}/{self.max_retries}"
-                        )
-                else:
-                    self.logger.error("Max reconnection attempts reached")
-                    self.stop_monitor = True
-                    
-            time.sleep(self.reconnect_interval)
-            
+            self._disconnected.wait()
+            self._disconnected.clear()
+            if self.stop_monitor:
+                break
+            if self.auto_reconnect and not self.connection.is_connected:
+                self._reconnect()
+
+    def _reconnect(self):
+        """Reconnect immediately, then with exponential backoff"""
+        self.logger.info("Connection lost, attempting reconnect...")
+        self.retry_count = 0
+
+        while not self.stop_monitor:
+            if self.connection.connect(resume_log=True):
+                if self.stop_monitor:
+                    # Stopped while this attempt was in progress
+                    self.connection.disconnect()
+                    return
+                self._record_reconnect()
+                self.logger.info("Reconnection successful")
+                self.retry_count = 0
+                return
+
+            self.retry_count += 1
+            with self._metrics_lock:
+                self.failed_attempts += 1
+
+            if self.max_retries is not None and self.retry_count >= self.max_retries:
+                self.logger.error("Max reconnection attempts reached")
+                return
+
+            delay = self._backoff_delay(self.retry_count)
+            self.logger.warning(
+                f"Reconnection failed, attempt {self.retry_count}, retrying in {delay:.2f} s"
+            )
+            if self._stop_event.wait(delay):
+                return
+
+    def _backoff_delay(self, attempt):
+        """Exponential backoff delay for the given failed attempt number"""
+        delay = min(self.max_interval, self.reconnect_interval * (2 ** (attempt - 1)))
+        return delay * (1.0 - self.jitter * random.random())
+
+    def _record_reconnect(self):
+        """Update metrics after a successful reconnect"""
+        now = time.time()
+        with self._metrics_lock:
+            self.reconnect_count += 1
+            if self.down_since is not None:
+                downtime = now - self.down_since
+                self.last_downtime = downtime
+                self.total_downtime += downtime
+                self.reconnect_latencies.append(downtime)
+            self.down_since = None
+
+    def get_metrics(self):
+        """Get reconnect latency and downtime metrics"""
+        with self._metrics_lock:
+            latencies = sorted(self.reconnect_latencies)
+            current_downtime = time.time() - self.down_since if self.down_since else 0.0
+            return {
+                "connected": self.connection.is_connected,
+                "disconnects": self.disconnect_count,
+                "reconnects": self.reconnect_count,
+                "failed_attempts": self.failed_attempts,
+                "total_downtime": self.total_downtime + current_downtime,
+                "last_downtime": self.last_downtime,
+                "current_downtime": current_downtime,
+                "reconnect_latency_avg": sum(latencies) / len(latencies) if latencies else None,
+                "reconnect_latency_max": latencies[-1] if latencies else None
+            }
+
     def reset_retries(self):
         """Reset the retry counter"""
-        self.retry_count = 0
\ No newline at end of file
+        self.retry_count = 0
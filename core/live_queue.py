@@ -0,0 +1,86 @@
+"""
+Live Message Queue - Bounded hand-off between receive threads and the UI
+"""
+import threading
+import time
+from collections import deque
+
+class LiveMessageQueue:
+    """Bounded, thread-safe queue between message ingest and the UI thread
+
+    Producers (socket threads) never block: when the queue is full the
+    oldest pending message is discarded and counted as dropped. The UI
+    thread drains the queue in batches on its own schedule.
+    """
+
+    def __init__(self, maxsize=50000):
+        """Initialize the queue with a maximum number of pending messages"""
+        self.maxsize = maxsize
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Reset drop and throughput counters"""
+        self.total_received = 0
+        self.total_delivered = 0
+        self.dropped = 0
+        self.max_pending = 0
+        self.last_drain_time = None
+
+    def put(self, message):
+        """Add a message, dropping the oldest pending one if full
+
+        Returns:
+            True if the message was queued without dropping anything
+        """
+        with self._lock:
+            self.total_received += 1
+            dropped = False
+            if len(self._queue) >= self.maxsize:
+                self._queue.popleft()
+                self.dropped += 1
+                dropped = True
+            self._queue.append(message)
+            if len(self._queue) > self.max_pending:
+                self.max_pending = len(self._queue)
+            return not dropped
+
+    def drain(self, max_items=None):
+        """Remove and return up to max_items pending messages in arrival order"""
+        with self._lock:
+            if max_items is None or max_items >= len(self._queue):
+                batch = list(self._queue)
+                self._queue.clear()
+            else:
+                popleft = self._queue.popleft
+                batch = [popleft() for _ in range(max_items)]
+            self.total_delivered += len(batch)
+            self.last_drain_time = time.time()
+            return batch
+
+    def clear(self):
+        """Discard all pending messages"""
+        with self._lock:
+            self._queue.clear()
+
+    def __len__(self):
+        """Number of messages waiting to be drained"""
+        return len(self._queue)
+
+    @property
+    def is_lagging(self):
+        """True when the consumer is falling behind (queue over half full)"""
+        return len(self._queue) > self.maxsize // 2
+
+    def get_stats(self):
+        """Get queue statistics"""
+        with self._lock:
+            return {
+                "pending": len(self._queue),
+                "max_pending": self.max_pending,
+                "received": self.total_received,
+                "delivered": self.total_delivered,
+                "dropped": self.dropped,
+                "lagging": len(self._queue) > self.maxsize // 2
+            }
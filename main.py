@@ -4,22 +4,68 @@ Python DLT Viewer - Main Application Entry Point
 """
 import sys
 import os
-from ui.app import DLTViewerApp
+import argparse
+import signal
 from utils.config import load_config, save_config
 from utils.logger import setup_logger
 
-def main():
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Python DLT Viewer")
+    parser.add_argument("--record", action="store_true",
+                        help="record all configured ECUs without a user interface")
+    parser.add_argument("--ecu", action="append", dest="ecus", metavar="ECU_ID",
+                        help="record only this ECU (repeatable)")
+    parser.add_argument("--ecu-dir", help="directory with the ECU configurations")
+    parser.add_argument("--output", help="directory for the recordings")
+    parser.add_argument("--status", help="path of the JSON status file")
+    return parser.parse_args(argv)
+
+def record(args, config, logger):
+    """Run the headless recorder until SIGINT/SIGTERM"""
+    # No UI modules are imported on this path
+    from core.dlt_ecu import ECUManager
+    from core.dlt_daemon import DLTRecorderDaemon
+
+    ecus = ECUManager(args.ecu_dir).ecus
+    if args.ecus:
+        missing = [ecu_id for ecu_id in args.ecus if ecu_id not in ecus]
+        if missing:
+            logger.error(f"Unknown ECU: {', '.join(missing)}")
+            return 1
+        ecus = {ecu_id: ecus[ecu_id] for ecu_id in args.ecus}
+
+    daemon = DLTRecorderDaemon(list(ecus.values()), config,
+                               output_dir=args.output, status_file=args.status)
+    if not daemon.ecus:
+        logger.error("No ECU with an IP address is configured")
+        return 1
+
+    signal.signal(signal.SIGINT, lambda signum, frame: daemon.stop())
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+    daemon.run()
+    return 0
+
+def main(argv=None):
     """Main entry point for the DLT Viewer application"""
+    args = parse_args(argv)
+
     # Set up logging
     logger = setup_logger()
-    logger.info("Starting Python DLT Viewer")
-    
+
     # Load configuration
     config = load_config()
-    
+
+    if args.record:
+        logger.info("Starting Python DLT Viewer recorder")
+        return record(args, config, logger)
+
+    logger.info("Starting Python DLT Viewer")
+    from ui.app import DLTViewerApp
+
     # Start the application
     app = DLTViewerApp(config)
-    
+
     # Run the main loop
     try:
         app.run()
@@ -30,6 +76,7 @@ def main():
         # Save configuration on exit
         save_config(config)
         logger.info("DLT Viewer shutting down")
+    return 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
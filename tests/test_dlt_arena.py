@@ -0,0 +1,64 @@
+"""
+Test DLT Message Arena Module
+"""
+import unittest
+from core.dlt_arena import DLTMessageArena
+from core.dlt_message import DLTMessage
+
+def make_message(text, counter=0):
+    """Build a raw LOG message with extended header"""
+    payload = text.encode('utf-8')
+    length = 4 + 10 + len(payload)
+    header = (1 << 31) | ((counter & 0xFF) << 16) | length
+    ext_header = bytes([0x04]) + b"APP1" + b"CTX1" + bytes([1])
+    msg = DLTMessage()
+    msg.parse_from_bytes(header.to_bytes(4, 'little') + ext_header + payload)
+    return msg
+
+class TestDLTMessageArena(unittest.TestCase):
+    def setUp(self):
+        # Minimum segment size with room for two resident segments
+        self.arena = DLTMessageArena(segment_size=0, memory_cap=2 * 65536)
+        
+    def tearDown(self):
+        self.arena.close()
+        
+    def test_append_and_get(self):
+        """Test storing and decoding messages"""
+        msg = make_message("hello arena")
+        msg.timestamp = 1234.5
+        self.arena.append(msg)
+        
+        self.assertEqual(len(self.arena), 1)
+        decoded = self.arena[0]
+        self.assertEqual(decoded.payload, "hello arena")
+        self.assertEqual(decoded.app_id, "APP1")
+        self.assertEqual(decoded.timestamp, 1234.5)
+        self.assertEqual(bytes(self.arena.get_raw(0)), bytes(msg.raw_data))
+        
+    def test_spill_to_disk(self):
+        """Test that old segments spill and remain readable"""
+        texts = [f"message {i} " + "x" * 1000 for i in range(500)]
+        for text in texts:
+            self.arena.append(make_message(text))
+            
+        stats = self.arena.get_stats()
+        self.assertGreater(stats["spilled_bytes"], 0)
+        self.assertLessEqual(stats["resident_bytes"], 2 * 65536)
+        
+        # Bypass the decode cache to read spilled bytes
+        self.arena._cache.clear()
+        self.assertEqual(self.arena[0].payload, texts[0])
+        self.assertEqual(self.arena[-1].payload, texts[-1])
+        self.assertEqual([m.payload for m in self.arena[250:253]], texts[250:253])
+        
+    def test_clear(self):
+        """Test clearing the arena"""
+        self.arena.extend([make_message("a"), make_message("b")])
+        self.arena.clear()
+        self.assertEqual(len(self.arena), 0)
+        with self.assertRaises(IndexError):
+            self.arena[0]
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+Test DLT Bitmap Index Module
+"""
+import random
+import unittest
+from types import SimpleNamespace
+from core.dlt_columns import DLTMessageColumns
+from core.dlt_bitmap import CHUNK_SIZE
+
+LEVELS = ["FATAL", "ERROR", "WARN", "INFO", "DEBUG"]
+
+def make_messages(count, seed=1):
+    """Messages with frequent levels and ECUs and rare contexts"""
+    rng = random.Random(seed)
+    return [SimpleNamespace(timestamp=float(i), payload="", msg_type="LOG",
+                            ecu_id=f"ECU{i % 3}", app_id=f"AP{rng.randrange(20)}",
+                            ctx_id=f"C{rng.randrange(300)}",
+                            log_level=rng.choices(LEVELS, [1, 5, 20, 60, 14])[0])
+            for i in range(count)]
+
+class TestBitmapIndex(unittest.TestCase):
+    def setUp(self):
+        # More than two chunks, the last one partially filled
+        self.messages = make_messages(2 * CHUNK_SIZE + 1000)
+        self.columns = DLTMessageColumns.from_messages(self.messages)
+
+    def select(self, **criteria):
+        codes = {field: self.columns.code_set(field, values) for field, values in criteria.items()}
+        return self.columns.bitmaps().select(codes)
+
+    def expected(self, **criteria):
+        return [i for i, msg in enumerate(self.messages)
+                if all(getattr(msg, field) in values for field, values in criteria.items())]
+
+    def check(self, **criteria):
+        self.assertEqual(self.select(**criteria), self.expected(**criteria))
+
+    def test_single_field(self):
+        """Test dense, sparse and missing values of one field"""
+        self.check(log_level={"INFO"})
+        self.check(log_level={"FATAL", "ERROR"})
+        self.check(ctx_id={"C7"})
+        self.check(ctx_id={"C7", "C8", "C9"})
+        self.assertEqual(self.select(ctx_id={"NONE"}), [])
+
+    def test_across_fields(self):
+        """Test OR within a field and AND across fields"""
+        self.check(ecu_id={"ECU1"}, log_level={"WARN", "INFO"})
+        self.check(ctx_id={"C1", "C2"}, app_id={"AP3"}, log_level={"INFO"})
+        self.check(ecu_id={"ECU0", "ECU2"}, log_level={"FATAL"})
+
+    def test_count(self):
+        """Test per-value counts"""
+        index = self.columns.bitmaps()
+        code = self.columns.code_of("log_level", "WARN")
+        self.assertEqual(index.count("log_level", code), len(self.expected(log_level={"WARN"})))
+
+    def test_incremental_update(self):
+        """Test appended messages are indexed, including the partial chunk"""
+        self.check(log_level={"ERROR"})
+        more = make_messages(CHUNK_SIZE, seed=2)
+        more[0].ctx_id = "NEW"
+        self.messages.extend(more)
+        self.columns.extend(more)
+        self.check(log_level={"ERROR"})
+        self.check(ctx_id={"NEW", "C5"}, ecu_id={"ECU2"})
+
+if __name__ == '__main__':
+    unittest.main()
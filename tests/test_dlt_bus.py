@@ -0,0 +1,141 @@
+"""
+Test DLT Message Bus Module
+"""
+import unittest
+import threading
+import time
+from core.dlt_message import DLTMessage
+from core.dlt_bus import (DLTMessageBus, DLTSubscription, POLICY_BLOCK,
+                          POLICY_DROP_OLDEST, POLICY_SAMPLE, POLICY_ERRORS_ONLY)
+
+def make_messages(count, level="INFO"):
+    """Build messages numbered through their payload"""
+    messages = []
+    for i in range(count):
+        msg = DLTMessage()
+        msg.payload = str(i)
+        msg.log_level = level
+        messages.append(msg)
+    return messages
+
+class TestDLTSubscription(unittest.TestCase):
+    def test_drop_oldest(self):
+        """Test a full queue discards its oldest messages"""
+        subscription = DLTSubscription(lambda msg: None, POLICY_DROP_OLDEST, maxsize=5)
+        subscription.publish(make_messages(8))
+
+        self.assertEqual([m.payload for m in subscription._queue], ["3", "4", "5", "6", "7"])
+        self.assertEqual(subscription.get_stats()["dropped"], 3)
+
+    def test_errors_never_dropped(self):
+        """Test FATAL/ERROR messages survive the lossy policies"""
+        for policy in (POLICY_DROP_OLDEST, POLICY_SAMPLE, POLICY_ERRORS_ONLY):
+            subscription = DLTSubscription(lambda msg: None, policy, maxsize=4)
+            subscription.publish(make_messages(10))
+            subscription.publish(make_messages(3, "ERROR"))
+            subscription.publish(make_messages(1, "FATAL"))
+
+            levels = [m.log_level for m in subscription._queue]
+            self.assertEqual(levels.count("ERROR"), 3, policy)
+            self.assertEqual(levels.count("FATAL"), 1, policy)
+
+    def test_errors_only_under_load(self):
+        """Test only errors are queued once the queue is full"""
+        subscription = DLTSubscription(lambda msg: None, POLICY_ERRORS_ONLY, maxsize=2)
+        subscription.publish(make_messages(2))
+        subscription.publish(make_messages(2, "WARN"))
+        subscription.publish(make_messages(1, "ERROR"))
+
+        self.assertEqual([m.log_level for m in subscription._queue], ["INFO", "ERROR"])
+        self.assertEqual(subscription.get_stats()["dropped"], 3)
+
+    def test_error_hard_limit(self):
+        """Test errors beyond the reserve above maxsize are dropped and counted"""
+        subscription = DLTSubscription(lambda msg: None, POLICY_ERRORS_ONLY, maxsize=8)
+        subscription.publish(make_messages(20, "ERROR"))
+
+        stats = subscription.get_stats()
+        self.assertEqual(stats["pending"], 10)
+        self.assertEqual(stats["errors_dropped"], 10)
+        self.assertEqual(stats["dropped"], 10)
+
+    def test_block_timeout(self):
+        """Test a stuck block subscriber holds up publish() only for block_timeout"""
+        subscription = DLTSubscription(lambda msg: None, POLICY_BLOCK,
+                                       maxsize=5, block_timeout=0.2)
+        subscription.running = True  # No delivery thread: the queue never drains
+        started = time.time()
+        subscription.publish(make_messages(8))
+
+        self.assertLess(time.time() - started, 1.0)
+        self.assertEqual(subscription.get_stats()["stalls"], 3)
+        self.assertEqual(len(subscription._queue), 5)
+
+    def test_sample_when_lagging(self):
+        """Test only every Nth message is kept once half full"""
+        subscription = DLTSubscription(lambda msg: None, POLICY_SAMPLE,
+                                       maxsize=100, sample_every=10)
+        subscription.publish(make_messages(250))
+
+        # 50 before lagging, then one in ten of the remaining 200
+        self.assertEqual(len(subscription._queue), 70)
+
+    def test_invalid_policy(self):
+        """Test unknown policies are rejected"""
+        with self.assertRaises(ValueError):
+            DLTSubscription(lambda msg: None, "fastest")
+
+class TestDLTMessageBus(unittest.TestCase):
+    def setUp(self):
+        self.bus = DLTMessageBus()
+
+    def tearDown(self):
+        self.bus.stop()
+
+    def test_ordered_lossless_delivery(self):
+        """Test block subscribers receive every message in order"""
+        received = []
+        self.bus.subscribe(received.append, POLICY_BLOCK, maxsize=10)
+        self.bus.start()
+        for i in range(0, 200, 20):
+            self.bus.publish(make_messages(20))
+        self.bus.stop()
+
+        self.assertEqual(len(received), 200)
+        self.assertEqual([m.payload for m in received[:20]], [str(i) for i in range(20)])
+
+    def test_slow_subscriber_isolated(self):
+        """Test a stuck subscriber does not hold up a lossless one"""
+        release = threading.Event()
+        self.addCleanup(release.set)
+        recorded = []
+        self.bus.subscribe(lambda msg: release.wait(5.0), POLICY_DROP_OLDEST,
+                           maxsize=10, name="slow")
+        self.bus.subscribe(recorded.append, POLICY_BLOCK, maxsize=10, name="recorder")
+        self.bus.start()
+
+        for _ in range(20):
+            self.bus.publish(make_messages(10))
+        deadline = time.time() + 2.0
+        while len(recorded) < 200 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(recorded), 200)
+
+        stats = {s["name"]: s for s in self.bus.get_stats()}
+        self.assertGreater(stats["slow"]["dropped"], 0)
+        self.assertGreater(stats["slow"]["lag"], 0.0)
+        self.assertEqual(stats["recorder"]["dropped"], 0)
+        release.set()
+
+    def test_subscribe_unsubscribe(self):
+        """Test subscriptions are unique per callback"""
+        callback = lambda msg: None
+        self.bus.subscribe(callback)
+        self.bus.subscribe(callback)
+        self.assertEqual(self.bus.callbacks, [callback])
+
+        self.bus.unsubscribe(callback)
+        self.assertEqual(self.bus.callbacks, [])
+
+if __name__ == '__main__':
+    unittest.main()
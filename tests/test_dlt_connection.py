@@ -2,10 +2,14 @@
 Test DLT Connection Module
 """
 import unittest
+import os
+import shutil
 import socket
+import tempfile
 import threading
 import time
 from core.dlt_connection import DLTConnection
+from core.dlt_message import DLTMessage
 
 class TestDLTConnection(unittest.TestCase):
     def setUp(self):
@@ -47,6 +51,39 @@ class TestDLTConnection(unittest.TestCase):
         self.connection.disconnect()
         self.assertFalse(self.connection.is_connected)
         
+    def test_reconnect_closes_old_socket(self):
+        """Test replacing or losing a link closes its socket"""
+        self.server_socket.listen(2)
+        accepted = []
+        
+        def serve():
+            for _ in range(2):
+                accepted.append(self.server_socket.accept()[0])
+                
+        server_thread = threading.Thread(target=serve)
+        server_thread.daemon = True
+        server_thread.start()
+        dropped = []
+        self.connection.disconnect_callbacks.append(dropped.append)
+        self.connection.log_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.connection.log_dir, True)
+        
+        self.assertTrue(self.connection.connect())
+        first = self.connection.socket
+        self.assertTrue(self.connection.connect(resume_log=True))
+        self.assertEqual(first.fileno(), -1)
+        self.assertIsNot(self.connection.socket, first)
+        
+        server_thread.join(2.0)
+        for client in accepted:
+            client.close()
+        deadline = time.time() + 2.0
+        while not dropped and time.time() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(dropped, [self.connection])
+        self.assertFalse(self.connection.is_connected)
+        self.assertIsNone(self.connection.socket)
+        
     def test_callbacks(self):
         """Test message callbacks"""
         received_messages = []
@@ -63,6 +100,68 @@ class TestDLTConnection(unittest.TestCase):
         self.connection.remove_callback(callback)
         self.assertNotIn(callback, self.connection.callbacks)
         
+    def test_parallel_addresses(self):
+        """Test a dead address does not prevent connecting to a live one"""
+        dead = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        dead.bind(('127.0.0.1', 0))
+        dead_port = dead.getsockname()[1]
+        dead.close()  # Nothing listens here any more
+        
+        server_thread = threading.Thread(target=self._accept_connection)
+        server_thread.daemon = True
+        server_thread.start()
+        
+        connection = DLTConnection('127.0.0.1', dead_port)
+        connection.addresses = [('127.0.0.1', self.port)]
+        connection.log_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, connection.log_dir, True)
+        self.addCleanup(connection.disconnect)
+        
+        self.assertTrue(connection.connect())
+        self.assertEqual(connection.connected_address, f"127.0.0.1:{self.port}")
+        
+    def test_all_addresses_fail(self):
+        """Test connect() reports failure without waiting for the timeout"""
+        dead = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        dead.bind(('127.0.0.1', 0))
+        dead_port = dead.getsockname()[1]
+        dead.close()
+        
+        connection = DLTConnection('127.0.0.1', dead_port)
+        connection.connect_timeout = 10.0
+        started = time.time()
+        self.assertFalse(connection.connect())
+        self.assertLess(time.time() - started, 2.0)
+        self.assertIsInstance(connection.last_error, ConnectionError)
+        
+    def test_quiet_link_flushes_log(self):
+        """Test the recording reaches the file while the link is idle"""
+        frame = DLTMessage().encode()
+        sent = threading.Event()
+        
+        def serve():
+            client, _ = self.server_socket.accept()
+            client.sendall(frame)
+            sent.set()
+            time.sleep(3.0)  # Keep the link open but quiet
+            client.close()
+            
+        server_thread = threading.Thread(target=serve)
+        server_thread.daemon = True
+        server_thread.start()
+        
+        self.connection.log_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.connection.log_dir, True)
+        self.assertTrue(self.connection.connect())
+        sent.wait(2.0)
+        
+        path = os.path.join(self.connection.log_dir, os.listdir(self.connection.log_dir)[0])
+        deadline = time.time() + 3 * DLTConnection.LOG_FLUSH_INTERVAL
+        while os.path.getsize(path) < 4 + len(frame) and time.time() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(os.path.getsize(path), 4 + len(frame))
+        self.assertTrue(self.connection.is_connected)
+        
     def _accept_connection(self):
         """Helper to accept test connections"""
         client_socket, _ = self.server_socket.accept()
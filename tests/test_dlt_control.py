@@ -2,7 +2,16 @@
 Test DLT Control Module
 """
 import unittest
-from core.dlt_control import DLTControlMessage, DLTControlMessageType
+import shutil
+import socket
+import struct
+import tempfile
+import threading
+import time
+from core.dlt_bus import POLICY_BLOCK
+from core.dlt_connection import DLTConnection
+from core.dlt_control import DLTControlClient, DLTControlMessage, DLTControlMessageType
+from core.dlt_message import DLTMessage
 
 class TestDLTControl(unittest.TestCase):
     def setUp(self):
@@ -29,5 +38,153 @@ class TestDLTControl(unittest.TestCase):
         response = self.message.get_response()
         self.assertEqual(response.service_id, self.message.service_id | 0x1000)
 
+class FakeDaemon:
+    """Minimal DLT daemon answering control requests in order"""
+    
+    def __init__(self, respond=True):
+        self.respond = respond
+        self.requests = []
+        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server_socket.bind(('localhost', 0))
+        self.port = self.server_socket.getsockname()[1]
+        self.server_socket.listen(1)
+        self.thread = threading.Thread(target=self._serve)
+        self.thread.daemon = True
+        self.thread.start()
+        
+    def _serve(self):
+        client, _ = self.server_socket.accept()
+        buffer = bytearray()
+        try:
+            while True:
+                data = client.recv(65536)
+                if not data:
+                    break
+                buffer.extend(data)
+                messages, used = DLTMessage.parse_all(buffer)
+                del buffer[:used]
+                replies = []
+                for msg in messages:
+                    request = DLTControlMessage.from_message(msg)
+                    self.requests.append(request)
+                    response = request.get_response()
+                    if request.service_id == DLTControlMessageType.GET_SOFTWARE_VERSION:
+                        response.payload = struct.pack("<I", 5) + b"1.2.3"
+                    replies.append(response.to_frame())
+                if self.respond and replies:
+                    client.sendall(b"".join(replies))
+        except OSError:
+            pass
+        finally:
+            client.close()
+            
+    def close(self):
+        self.server_socket.close()
+
+class LoopbackConnection:
+    """Connection stand-in that records sent frames"""
+    
+    def __init__(self):
+        self.sent = []
+        self.policy = None
+        
+    def add_callback(self, callback, policy=None, name=None):
+        self.policy = policy
+        
+    def remove_callback(self, callback):
+        pass
+        
+    def send(self, data):
+        self.sent.append(data)
+
+class TestDLTControlClient(unittest.TestCase):
+    def _connect(self, daemon):
+        connection = DLTConnection('localhost', daemon.port)
+        connection.log_dir = tempfile.mkdtemp()
+        self.assertTrue(connection.connect())
+        self.addCleanup(shutil.rmtree, connection.log_dir, True)
+        self.addCleanup(connection.disconnect)
+        return connection
+        
+    def test_frame_roundtrip(self):
+        """Test control message framing and decoding"""
+        request = DLTControlMessage.set_log_level("APP1", "CTX1", DLTMessage.LOG_WARN)
+        msg = DLTMessage()
+        msg.parse_from_bytes(request.to_frame())
+        
+        self.assertEqual(msg.msg_type, "CONTROL")
+        decoded = DLTControlMessage.from_message(msg)
+        self.assertEqual(decoded.service_id, DLTControlMessageType.SET_LOG_LEVEL)
+        self.assertEqual(decoded.payload[:8], b"APP1CTX1")
+        self.assertFalse(decoded.is_response)
+        
+    def test_pipelined_set_log_levels(self):
+        """Test many pipelined requests resolve with responses"""
+        daemon = FakeDaemon()
+        self.addCleanup(daemon.close)
+        client = DLTControlClient(self._connect(daemon))
+        self.addCleanup(client.close)
+        
+        levels = [("APP1", f"C{i:03d}", DLTMessage.LOG_WARN) for i in range(300)]
+        start = time.time()
+        futures = client.set_log_levels(levels)
+        results = client.wait_all(futures, timeout=5.0)
+        
+        self.assertLess(time.time() - start, 2.0)
+        self.assertEqual(len(results), 300)
+        for response in results:
+            self.assertIsInstance(response, DLTControlMessage)
+            self.assertEqual(response.request_id, DLTControlMessageType.SET_LOG_LEVEL)
+            self.assertEqual(response.status, DLTControlMessage.STATUS_OK)
+        self.assertEqual(daemon.requests[299].payload[4:8], b"C299")
+        
+    def test_software_version(self):
+        """Test a query response payload"""
+        daemon = FakeDaemon()
+        self.addCleanup(daemon.close)
+        client = DLTControlClient(self._connect(daemon))
+        self.addCleanup(client.close)
+        
+        response = client.get_software_version().result(timeout=5.0)
+        self.assertEqual(response.get_software_version(), "1.2.3")
+        
+    def test_timeout(self):
+        """Test requests fail when the daemon does not answer"""
+        daemon = FakeDaemon(respond=False)
+        self.addCleanup(daemon.close)
+        client = DLTControlClient(self._connect(daemon), timeout=0.1)
+        self.addCleanup(client.close)
+        
+        future = client.get_log_info()
+        with self.assertRaises(TimeoutError):
+            future.result(timeout=2.0)
+            
+    def test_log_info_levels(self):
+        """Test context levels survive a GET_LOG_INFO response roundtrip"""
+        levels = {("NAV", "MAIN"): DLTMessage.LOG_DEBUG, ("NAV", "NET"): -1,
+                  ("HMI", "UI"): DLTMessage.LOG_WARN}
+        for options in (DLTControlMessage.LOG_INFO_WITH_LEVELS,
+                        DLTControlMessage.LOG_INFO_WITH_DESCRIPTIONS):
+            response = DLTControlMessage.decode(
+                DLTControlMessage.log_info_response(levels, options).encode()
+            )
+            self.assertEqual(response.get_log_levels(), levels)
+            
+    def test_per_request_timeout(self):
+        """Test a long per-call timeout outlives the client default"""
+        connection = LoopbackConnection()
+        client = DLTControlClient(connection, timeout=0.05)
+        self.addCleanup(client.close)
+        self.assertEqual(connection.policy, POLICY_BLOCK)
+        
+        future = client.get_log_info(timeout=5.0)
+        time.sleep(0.3)
+        self.assertFalse(future.done())
+        
+        reply = DLTMessage()
+        reply.parse_from_bytes(DLTControlMessage.get_log_info().get_response().to_frame())
+        client._on_message(reply)
+        self.assertEqual(future.result(timeout=1.0).status, DLTControlMessage.STATUS_OK)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
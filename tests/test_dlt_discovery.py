@@ -0,0 +1,60 @@
+"""
+Test DLT Network Discovery Module
+"""
+import unittest
+import socket
+import time
+from core.dlt_discovery import DLTNetworkScanner
+
+class TestDLTNetworkScanner(unittest.TestCase):
+    def setUp(self):
+        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server_socket.bind(('127.0.0.1', 0))
+        self.port = self.server_socket.getsockname()[1]
+        self.server_socket.listen(16)
+        
+    def tearDown(self):
+        self.server_socket.close()
+        
+    def test_iter_targets(self):
+        """Test target expansion from CIDR networks"""
+        scanner = DLTNetworkScanner(["10.0.0.0/30", "10.0.0.9"], ports=[1, 2],
+                                    include_localhost=False)
+        targets = list(scanner.iter_targets())
+        self.assertEqual(len(targets), scanner.count_targets())
+        self.assertIn(("10.0.0.1", 1), targets)
+        self.assertIn(("10.0.0.9", 2), targets)
+        self.assertNotIn(("10.0.0.0", 1), targets)
+        
+    def test_finds_open_port(self):
+        """Test that an open port is reported"""
+        found = []
+        scanner = DLTNetworkScanner(["127.0.0.1/32"], ports=[self.port],
+                                    include_localhost=False)
+        scanner.scan(lambda host, port: found.append((host, port)))
+        
+        self.assertEqual(found, [("127.0.0.1", self.port)])
+        self.assertEqual(scanner.probed, 1)
+        
+    def test_concurrent_scan_speed(self):
+        """Test that a /22 is scanned concurrently"""
+        found = []
+        scanner = DLTNetworkScanner(["127.0.0.0/22"], ports=[self.port],
+                                    concurrency=256, timeout=0.3,
+                                    include_localhost=False)
+        start = time.time()
+        scanner.scan(lambda host, port: found.append(host))
+        
+        self.assertLess(time.time() - start, 10.0)
+        self.assertEqual(scanner.probed, 1022)
+        self.assertIn("127.0.0.1", found)
+        
+    def test_cancel(self):
+        """Test that a cancelled scan stops early"""
+        scanner = DLTNetworkScanner(["127.0.0.0/22"], ports=[self.port],
+                                    concurrency=1, include_localhost=False)
+        scanner.scan(lambda host, port: scanner.cancel())
+        self.assertLess(scanner.probed, 1022)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+Test DLT Filter Cache Module
+"""
+import random
+import unittest
+from types import SimpleNamespace
+from core.dlt_columns import DLTMessageColumns
+from core.dlt_filter_engine import FilterSpec, compile_filter, search_columns
+from core.dlt_filter_cache import DLTFilterCache
+
+def make_messages(count, seed=1):
+    """Messages with a few apps, contexts and payload words"""
+    rng = random.Random(seed)
+    words = ["timeout", "retry", "state", "signal", "lost"]
+    return [SimpleNamespace(timestamp=float(i), ecu_id="ECU1", msg_type="LOG",
+                            app_id=rng.choice(["NAV", "HMI", "DIAG"]),
+                            ctx_id=rng.choice(["MAIN", "GPS", "DISP"]),
+                            log_level=rng.choice(["ERROR", "WARN", "INFO"]),
+                            payload=f"{rng.choice(words)} {rng.choice(words)} {rng.randrange(100)}")
+            for i in range(count)]
+
+class TestFilterCache(unittest.TestCase):
+    def setUp(self):
+        self.messages = make_messages(2000)
+        self.columns = DLTMessageColumns.from_messages(self.messages)
+        self.cache = DLTFilterCache()
+
+    def expected(self, spec, search=None):
+        positions = compile_filter(spec).filter(self.columns)
+        return search_columns(self.columns, search, positions) if search else positions
+
+    def test_narrows(self):
+        """Test the narrowing relation between specs"""
+        wide = FilterSpec(app_ids=["NAV", "HMI"], payload_text="time")
+        self.assertTrue(FilterSpec(app_ids=["NAV"], payload_text="TIMEOUT").narrows(wide))
+        self.assertTrue(FilterSpec(app_ids=["NAV"], payload_text="timeout", log_levels=["INFO"]).narrows(wide))
+        self.assertFalse(FilterSpec(app_ids=["NAV", "DIAG"], payload_text="timeout").narrows(wide))
+        self.assertFalse(FilterSpec(app_ids=["NAV"]).narrows(wide))
+        self.assertTrue(FilterSpec(time_start=5.0, time_end=6.0).narrows(FilterSpec(time_start=1.0)))
+        self.assertFalse(FilterSpec(time_end=6.0).narrows(FilterSpec(time_start=1.0)))
+        self.assertTrue(wide.narrows(FilterSpec()))
+
+    def test_refinement(self):
+        """Test narrowing queries refine cached results"""
+        spec = FilterSpec(log_levels=["ERROR", "WARN"])
+        self.assertEqual(self.cache.query(self.columns, spec), self.expected(spec))
+        for search in ("t", "ti", "tim", "timeout 4"):
+            self.assertEqual(self.cache.query(self.columns, spec, search), self.expected(spec, search))
+        narrower = FilterSpec(log_levels=["ERROR"], app_ids=["NAV"])
+        self.assertEqual(self.cache.query(self.columns, narrower), self.expected(narrower))
+        self.assertEqual(self.cache.get_stats()["misses"], 1)
+        self.assertEqual(self.cache.get_stats()["refinements"], 5)
+
+        # Widening again is served from the cache
+        self.assertEqual(self.cache.query(self.columns, spec, "ti"), self.expected(spec, "ti"))
+        self.assertEqual(self.cache.get_stats()["hits"], 1)
+
+    def test_search_keeps_filter(self):
+        """Test clearing the search restores the filter result"""
+        spec = FilterSpec(ctx_ids=["GPS"])
+        filtered = self.cache.query(self.columns, spec)
+        self.cache.query(self.columns, spec, "retry")
+        self.assertEqual(self.cache.query(self.columns, spec, ""), filtered)
+        self.assertEqual(self.cache.query(self.columns, FilterSpec()), list(range(2000)))
+
+    def test_appended_messages(self):
+        """Test cached results are extended with new positions"""
+        spec = FilterSpec(app_ids=["HMI"], payload_text="lost")
+        self.cache.query(self.columns, spec)
+        more = make_messages(500, seed=2)
+        self.columns.extend(more)
+        self.assertEqual(self.cache.query(self.columns, spec), self.expected(spec))
+        self.assertEqual(self.cache.query(self.columns, spec, "lost 1"), self.expected(spec, "lost 1"))
+
+    def test_refine_after_append(self):
+        """Test refining a search applies the spec to positions appended since"""
+        spec = FilterSpec(log_levels=["ERROR"])
+        self.cache.query(self.columns, spec, "lost")
+        self.columns.extend(make_messages(500, seed=3))
+        result = self.cache.query(self.columns, spec, "lost 1")
+        self.assertEqual(result, self.expected(spec, "lost 1"))
+        self.assertTrue(any(i >= 2000 for i in result))
+        self.assertEqual(self.cache.get_stats()["refinements"], 1)
+
+    def test_memory_budget(self):
+        """Test least recently used results are evicted"""
+        cache = DLTFilterCache(max_bytes=4 * 1500)
+        for level in ("ERROR", "WARN", "INFO"):
+            cache.query(self.columns, FilterSpec(log_levels=[level]))
+        stats = cache.get_stats()
+        self.assertLessEqual(stats["bytes"], 4 * 1500)
+        self.assertGreater(stats["evictions"], 0)
+        self.assertNotIn((FilterSpec(log_levels=["ERROR"]).key(), None), cache.entries)
+
+if __name__ == '__main__':
+    unittest.main()
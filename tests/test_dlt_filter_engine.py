@@ -0,0 +1,93 @@
+"""
+Test DLT Filter Engine Module
+"""
+import unittest
+from core.dlt_message import DLTMessage
+from core.dlt_columns import DLTMessageColumns
+from core.dlt_filters import DLTFilter
+from core.dlt_filter_engine import FilterSpec, CompiledFilter, compile_filter
+
+def make_messages():
+    """Build a small mixed trace"""
+    rows = [
+        ("ECU1", "NAV", "ROUT", "INFO", 10.0, "Route calculated"),
+        ("ECU1", "NAV", "GPS", "WARN", 11.0, "GPS signal weak"),
+        ("ECU2", "HMI", "DISP", "ERROR", 12.0, "Display TIMEOUT 42"),
+        ("ECU2", "HMI", "TOUC", "INFO", 13.0, "touch event"),
+        ("ECU1", "DIAG", "DTC", "FATAL", 14.0, "Straße gesperrt"),
+    ]
+    messages = []
+    for ecu, app, ctx, level, timestamp, payload in rows:
+        msg = DLTMessage()
+        msg.ecu_id, msg.app_id, msg.ctx_id = ecu, app, ctx
+        msg.log_level, msg.timestamp, msg.payload = level, timestamp, payload
+        messages.append(msg)
+    return messages
+
+class TestFilterEngine(unittest.TestCase):
+    def setUp(self):
+        self.messages = make_messages()
+        self.columns = DLTMessageColumns.from_messages(self.messages)
+
+    def check(self, spec, expected):
+        """Check the predicate, the list path and the columnar path agree"""
+        compiled = CompiledFilter(spec)
+        self.assertEqual([i for i, m in enumerate(self.messages) if compiled.matches(m)], expected)
+        self.assertEqual(compiled.filter(self.messages), expected)
+        self.assertEqual(compiled.filter(self.columns), expected)
+
+    def test_categorical(self):
+        """Test ECU, app, context and level criteria"""
+        self.check(FilterSpec(ecu_ids=["ECU1"]), [0, 1, 4])
+        self.check(FilterSpec(app_ids=["NAV", "HMI"], log_levels=["INFO"]), [0, 3])
+        self.check(FilterSpec(ctx_ids=["NONE"]), [])
+
+    def test_time_and_payload(self):
+        """Test time range, case-insensitive text and regex criteria"""
+        self.check(FilterSpec(time_start=11.0, time_end=13.0), [1, 2, 3])
+        self.check(FilterSpec(payload_text="timeout"), [2])
+        self.check(FilterSpec(payload_text="timeout", case_sensitive=True), [])
+        self.check(FilterSpec(payload_text="STRASSE"), [4])
+        self.check(FilterSpec(regex=r"\d+$"), [2])
+
+    def test_empty_spec(self):
+        """Test empty selections do not restrict, as in the filter panel"""
+        spec = FilterSpec.from_config({"ecu": [], "payload_text": ""})
+        self.assertTrue(spec.is_empty())
+        self.check(spec, [0, 1, 2, 3, 4])
+        self.assertEqual(CompiledFilter(spec).filter(self.columns, [1, 3]), [1, 3])
+
+    def test_spec_key(self):
+        """Test equivalent filter configurations normalize to the same key"""
+        a = FilterSpec.from_config({"app_id": ["NAV", "HMI"], "ecu": []})
+        b = FilterSpec.from_config({"app_id": ["HMI", "NAV"]})
+        self.assertEqual(a.key(), b.key())
+        self.assertIs(compile_filter(a), compile_filter(b))
+
+    def test_columns_append(self):
+        """Test columns grow with live batches"""
+        columns = DLTMessageColumns()
+        columns.extend(self.messages[:2])
+        columns.extend(self.messages[2:])
+        self.assertEqual(len(columns), 5)
+        self.assertEqual(columns.value("app_id", 3), "HMI")
+        self.assertEqual(CompiledFilter(FilterSpec(payload_text="touch")).filter(columns), [3])
+
+class TestDLTFilter(unittest.TestCase):
+    def test_matches_uses_current_criteria(self):
+        """Test DLTFilter recompiles when its criteria change"""
+        messages = make_messages()
+        dlt_filter = DLTFilter()
+        self.assertTrue(all(dlt_filter.matches(m) for m in messages))
+
+        dlt_filter.set_app_filter(["HMI"])
+        self.assertEqual(dlt_filter.filter(messages), [2, 3])
+
+        dlt_filter.set_regex_filter("timeout")
+        self.assertEqual(dlt_filter.filter(messages), [2])
+
+        dlt_filter.time_end = 11.5   # Direct assignment works as well
+        self.assertEqual(dlt_filter.filter(messages), [])
+
+if __name__ == '__main__':
+    unittest.main()
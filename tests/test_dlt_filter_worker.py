@@ -0,0 +1,83 @@
+"""
+Test DLT Filter Worker Module
+"""
+import threading
+import unittest
+from types import SimpleNamespace
+from core.dlt_columns import DLTMessageColumns
+from core.dlt_filter_engine import FilterSpec, compile_filter
+from core.dlt_filter_cache import DLTFilterCache
+from core.dlt_filter_worker import DLTFilterWorker
+
+def make_columns(count):
+    """Columns with alternating levels and numbered payloads"""
+    messages = [SimpleNamespace(timestamp=float(i), ecu_id="ECU1", app_id="APP", ctx_id="CTX",
+                                msg_type="LOG", log_level="ERROR" if i % 3 == 0 else "INFO",
+                                payload=f"value {i}")
+                for i in range(count)]
+    return DLTMessageColumns.from_messages(messages)
+
+class TestChunkedQuery(unittest.TestCase):
+    def setUp(self):
+        self.columns = make_columns(10000)
+        self.cache = DLTFilterCache()
+        self.spec = FilterSpec(log_levels=["ERROR"], payload_text="7")
+
+    def test_partial_results(self):
+        """Test chunks are reported in order and add up to the result"""
+        parts = []
+        positions = self.cache.query(self.columns, self.spec, chunk_size=1000, on_partial=parts.append)
+        self.assertGreater(len(parts), 1)
+        self.assertEqual([i for part in parts for i in part], positions)
+        self.assertEqual(positions, compile_filter(self.spec).filter(self.columns))
+
+    def test_cancel(self):
+        """Test a cancelled query stops and caches nothing"""
+        cancel = threading.Event()
+        parts = []
+
+        def on_partial(part):
+            parts.append(part)
+            cancel.set()
+
+        self.assertIsNone(self.cache.query(self.columns, self.spec, cancel=cancel,
+                                           on_partial=on_partial, chunk_size=1000))
+        self.assertEqual(len(parts), 1)
+        self.assertEqual(self.cache.get_stats()["entries"], 0)
+
+    def test_count(self):
+        """Test only the first count positions are evaluated"""
+        positions = self.cache.query(self.columns, self.spec, count=5000)
+        self.assertTrue(positions and positions[-1] < 5000)
+        self.assertEqual(self.cache.query(self.columns, self.spec, count=3000),
+                         [i for i in positions if i < 3000])
+
+class TestFilterWorker(unittest.TestCase):
+    def test_newest_query_wins(self):
+        """Test a new submission cancels the query in flight"""
+        columns = make_columns(20000)
+        worker = DLTFilterWorker(DLTFilterCache(), chunk_size=500)
+        done = threading.Event()
+        results = []
+
+        first_started = threading.Event()
+        release = threading.Event()
+
+        def slow_partial(part):
+            first_started.set()
+            release.wait(5)
+
+        first = worker.submit(columns, FilterSpec(log_levels=["INFO"]),
+                              on_partial=slow_partial, on_done=results.append)
+        self.assertTrue(first_started.wait(5))
+        worker.submit(columns, FilterSpec(log_levels=["ERROR"]), search="value 1",
+                      on_done=lambda positions: (results.append(positions), done.set()))
+        self.assertTrue(first.is_set())
+        release.set()
+
+        self.assertTrue(done.wait(5))
+        expected = [i for i in range(20000) if i % 3 == 0 and "value 1" in f"value {i}"]
+        self.assertEqual(results, [expected])
+
+if __name__ == '__main__':
+    unittest.main()
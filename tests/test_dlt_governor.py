@@ -0,0 +1,99 @@
+"""
+Test DLT Log Storm Governor Module
+"""
+import unittest
+from concurrent.futures import Future
+from core.dlt_control import DLTControlMessage, DLTControlMessageType
+from core.dlt_governor import DLTLogStormGovernor
+from core.dlt_message import DLTMessage
+
+class RecordingControlClient:
+    """Control client stand-in that acknowledges every request"""
+    
+    def __init__(self, status=DLTControlMessage.STATUS_OK, levels=None):
+        self.status = status
+        self.levels = levels
+        self.calls = []
+        
+    def get_log_info(self, app_id="", ctx_id="", timeout=None):
+        future = Future()
+        if self.levels is None:
+            future.set_exception(TimeoutError("Control request timed out"))
+        else:
+            future.set_result(DLTControlMessage.log_info_response(self.levels))
+        return future
+        
+    def set_log_level(self, app_id, ctx_id, level, timeout=None):
+        self.calls.append((app_id, ctx_id, level))
+        future = Future()
+        response = DLTControlMessage(DLTControlMessageType.SET_LOG_LEVEL, self.status).get_response()
+        future.set_result(response)
+        return future
+
+def make_message(app_id, ctx_id):
+    msg = DLTMessage()
+    msg.app_id = app_id
+    msg.ctx_id = ctx_id
+    return msg
+
+class TestDLTLogStormGovernor(unittest.TestCase):
+    def setUp(self):
+        self.client = RecordingControlClient()
+        self.governor = DLTLogStormGovernor(self.client, threshold=100, window=1.0, cooldown=10.0)
+        
+    def _feed(self, app_id, ctx_id, count, start, duration=1.0):
+        for i in range(count):
+            self.governor.on_message(make_message(app_id, ctx_id), now=start + duration * i / count)
+        
+    def test_throttle_flooding_context(self):
+        """Test that only the flooding context is throttled"""
+        self._feed("NAV", "SPAM", 500, start=0.0)
+        self._feed("HMI", "MAIN", 10, start=0.0)
+        self.governor.tick(now=1.0)
+        
+        self.assertEqual(self.client.calls, [("NAV", "SPAM", DLTMessage.LOG_WARN)])
+        self.assertEqual(self.governor.get_throttled(), [("NAV", "SPAM")])
+        events = self.governor.pop_new_events()
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].action, "throttle")
+        self.assertEqual(events[0].message.ctx_id, "SPAM")
+        
+    def test_restore_previous_level(self):
+        """Test that the level from before throttling is restored"""
+        client = RecordingControlClient(levels={("NAV", "SPAM"): DLTMessage.LOG_DEBUG})
+        governor = DLTLogStormGovernor(client, threshold=100, cooldown=10.0)
+        for i in range(500):
+            governor.on_message(make_message("NAV", "SPAM"), now=i / 500.0)
+        governor.tick(now=1.0)
+        governor.tick(now=11.5)
+        
+        self.assertEqual(client.calls, [("NAV", "SPAM", DLTMessage.LOG_WARN),
+                                        ("NAV", "SPAM", DLTMessage.LOG_DEBUG)])
+        self.assertIn("restored to 5", governor.events[-1].description)
+        
+    def test_restore_after_cooldown(self):
+        """Test the fallback level is restored when the previous one is unknown"""
+        self._feed("NAV", "SPAM", 500, start=0.0)
+        self.governor.tick(now=1.0)
+        self.governor.tick(now=5.0)
+        self.assertEqual(len(self.client.calls), 1)
+        
+        self.governor.tick(now=11.5)
+        self.assertEqual(self.client.calls[-1],
+                         ("NAV", "SPAM", DLTControlMessage.LOG_LEVEL_DEFAULT))
+        self.assertEqual(self.governor.get_throttled(), [])
+        self.assertEqual([e.action for e in self.governor.events], ["throttle", "restore"])
+        self.assertIn("fallback", self.governor.events[-1].description)
+        
+    def test_rejected_request_recorded(self):
+        """Test that a rejected log level change is recorded"""
+        governor = DLTLogStormGovernor(RecordingControlClient(DLTControlMessage.STATUS_ERROR),
+                                       threshold=100)
+        for i in range(500):
+            governor.on_message(make_message("NAV", "SPAM"), now=i / 500.0)
+        governor.tick(now=1.0)
+        
+        self.assertEqual([e.action for e in governor.events], ["throttle", "failed"])
+
+if __name__ == '__main__':
+    unittest.main()
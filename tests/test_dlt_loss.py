@@ -0,0 +1,86 @@
+"""
+Test DLT Loss Tracker Module
+"""
+import unittest
+from core.dlt_message import DLTMessage
+from core.dlt_loss import DLTLossTracker
+from core.dlt_statistics import DLTStatistics
+
+def make_message(counter, ecu_id="ECU1", session_id=None):
+    """Build a message with the given counter"""
+    msg = DLTMessage()
+    msg.counter = counter
+    msg.ecu_id = ecu_id
+    msg.session_id = session_id
+    return msg
+
+class TestDLTLossTracker(unittest.TestCase):
+    def setUp(self):
+        self.tracker = DLTLossTracker()
+
+    def test_wrap_is_not_loss(self):
+        """Test 255 -> 0 counts as a wrap without loss"""
+        lost = self.tracker.track_messages([make_message(c) for c in (254, 255, 0, 1)])
+
+        stats = self.tracker.get_stats()
+        self.assertEqual(lost, 0)
+        self.assertEqual(stats["wraps"], 1)
+        self.assertEqual(stats["gaps"], 0)
+
+    def test_gap_detection(self):
+        """Test skipped counters are counted with the position of the gap"""
+        counters = (10, 11, 15, 16, 254, 2)
+        lost = self.tracker.track_messages([make_message(c) for c in counters], start=100)
+
+        self.assertEqual(lost, 3 + 237 + 3)
+        events = self.tracker.get_events()
+        self.assertEqual([(e.position, e.expected, e.counter, e.lost) for e in events],
+                         [(102, 12, 15, 3), (104, 17, 254, 237), (105, 255, 2, 3)])
+        stats = self.tracker.get_stats()
+        self.assertEqual(stats["gaps"], 3)
+        self.assertEqual(stats["wraps"], 1)
+        self.assertAlmostEqual(stats["loss_rate"], 243 / (6 + 243))
+
+    def test_streams_tracked_separately(self):
+        """Test each ECU/session has its own counter sequence"""
+        messages = [make_message(0, "ECU1"), make_message(50, "ECU2"),
+                    make_message(1, "ECU1"), make_message(51, "ECU2"),
+                    make_message(7, "ECU2", "01"), make_message(8, "ECU2", "01")]
+        self.assertEqual(self.tracker.track_messages(messages), 0)
+        self.assertEqual(len(self.tracker.get_stats()["streams"]), 3)
+
+    def test_duplicate(self):
+        """Test a repeated counter is a duplicate, not a loss of 255"""
+        self.assertEqual(self.tracker.track_messages([make_message(5), make_message(5)]), 0)
+        self.assertEqual(self.tracker.get_stats()["duplicates"], 1)
+
+    def test_frames(self):
+        """Test counters are read from raw frames"""
+        frames = []
+        for counter in (1, 2, 4):
+            msg = DLTMessage()
+            msg.counter = counter
+            frames.append(msg.encode())
+
+        self.assertEqual(self.tracker.track_frames("sender", frames), 1)
+        self.assertEqual(self.tracker.get_stream_stats("sender")["last_counter"], 4)
+
+    def test_parsed_counter(self):
+        """Test parse_from_bytes sets message.counter"""
+        msg = DLTMessage()
+        msg.counter = 42
+        parsed = DLTMessage()
+        parsed.parse_from_bytes(msg.encode())
+        self.assertEqual(parsed.counter, 42)
+        self.assertEqual(parsed.msg_counter, 42)
+
+    def test_statistics_summary(self):
+        """Test the statistics summary reports message loss"""
+        statistics = DLTStatistics()
+        for counter in (0, 1, 3):
+            statistics.update(make_message(counter))
+
+        self.assertEqual(statistics.get_summary()["message_loss"]["lost"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+"""
+Test DLT Stream Merger Module
+"""
+import unittest
+from core.dlt_arena import DLTMessageArena
+from core.dlt_message import DLTMessage
+from core.dlt_merge import DLTStreamMerger
+
+def make_message(timestamp, payload=""):
+    """Build a message with the given merge time"""
+    msg = DLTMessage()
+    msg.timestamp = timestamp
+    msg.payload = payload
+    return msg
+
+class TestDLTStreamMerger(unittest.TestCase):
+    def setUp(self):
+        self.merged = []
+        self.merger = DLTStreamMerger(window=1.0, max_buffered=100,
+                                      max_delay=5.0, idle_timeout=2.0)
+        self.merger.add_output(self.merged.extend)
+        self.merger.add_stream("A", now=100.0)
+        self.merger.add_stream("B", now=100.0)
+
+    def times(self):
+        return [m.timestamp for m in self.merged]
+
+    def test_stream_ecu_survives_arena(self):
+        """Test the stream ECU of attached connections is kept by the arena"""
+        class Connection:
+            def add_callback(self, callback, **kwargs):
+                self.callback = callback
+
+        payload = b"hello"
+        header = (1 << 31) | (4 + 10 + len(payload))
+        received = DLTMessage()
+        received.parse_from_bytes(header.to_bytes(4, "little") + bytes([0x04]) + b"APP1CTX1"
+                                  + bytes([1]) + payload)
+        received.timestamp = 10.0
+        self.assertEqual(received.ecu_id, "UNK")
+
+        arena = DLTMessageArena(segment_size=0)
+        self.addCleanup(arena.close)
+        self.merger.add_output(arena.extend)
+        connection = Connection()
+        self.merger.attach(connection, "ECU1")
+        connection.callback(received)
+        self.merger.flush()
+
+        self.assertEqual(self.merged[0].ecu_id, "ECU1")
+        arena._cache.clear()
+        self.assertEqual(arena[0].ecu_id, "ECU1")
+        self.assertEqual(arena[0].payload, "hello")
+
+    def test_interleaved_streams_ordered(self):
+        """Test messages are released in time order across streams"""
+        self.merger.feed("A", [make_message(10.0), make_message(10.2)], now=100.0)
+        self.merger.feed("B", [make_message(10.1)], now=100.0)
+        self.merger.feed("B", [make_message(10.3)], now=100.0)
+        self.merger.feed("A", [make_message(10.4)], now=100.0)
+
+        # 10.4 waits until B reaches it
+        self.assertEqual(self.times(), [10.0, 10.1, 10.2, 10.3])
+        self.merger.flush()
+        self.assertEqual(self.times(), [10.0, 10.1, 10.2, 10.3, 10.4])
+
+    def test_watermark_holds_back(self):
+        """Test a message waits for the slowest active stream"""
+        self.merger.feed("B", [make_message(10.0)], now=100.0)
+        self.merger.feed("A", [make_message(10.5)], now=100.0)
+        self.assertEqual(self.times(), [10.0])
+
+        self.merger.feed("B", [make_message(10.6)], now=100.1)
+        self.assertEqual(self.times(), [10.0, 10.5])
+
+    def test_window_bound(self):
+        """Test the time window releases messages a slow stream holds back"""
+        self.merger.feed("B", [make_message(10.0)], now=100.0)
+        self.merger.feed("A", [make_message(10.5), make_message(11.6)], now=100.0)
+
+        self.assertEqual(self.times(), [10.0, 10.5])
+        self.assertEqual(self.merger.get_stats()["pending"], 1)
+
+    def test_idle_stream(self):
+        """Test a quiet stream stops holding back the others"""
+        self.merger.feed("B", [make_message(10.0)], now=100.0)
+        self.merger.feed("A", [make_message(10.5)], now=101.0)
+        self.merger.tick(now=101.5)
+        self.assertEqual(self.times(), [10.0])
+
+        # B has been quiet for longer than idle_timeout
+        self.merger.tick(now=102.5)
+        self.assertEqual(self.times(), [10.0, 10.5])
+
+    def test_delay_bound(self):
+        """Test tick() releases a message held back for max_delay"""
+        merger = DLTStreamMerger(window=10.0, max_delay=0.5, idle_timeout=100.0)
+        merged = []
+        merger.add_output(merged.extend)
+        merger.add_stream("A", now=0.0)
+        merger.add_stream("B", now=0.0)
+        merger.feed("B", [make_message(10.0)], now=0.0)
+        merger.feed("A", [make_message(10.5)], now=0.2)
+
+        merger.tick(now=0.6)
+        self.assertEqual(len(merged), 1)
+        merger.tick(now=0.7)
+        self.assertEqual(len(merged), 2)
+        self.assertEqual(merger.get_stats()["forced"], 1)
+
+    def test_count_bound(self):
+        """Test the buffer never holds more than max_buffered messages"""
+        merger = DLTStreamMerger(window=100.0, max_buffered=5, max_delay=100.0)
+        merger.add_stream("A", now=0.0)
+        merger.add_stream("B", now=0.0)
+        merger.feed("B", [make_message(0.0)], now=0.0)
+        merger.feed("A", [make_message(float(i)) for i in range(1, 20)], now=0.0)
+
+        stats = merger.get_stats()
+        self.assertEqual(stats["pending"], 5)
+        self.assertEqual(stats["released"], 15)
+
+    def test_late_arrival_reported(self):
+        """Test messages older than released ones are passed on and reported"""
+        self.merger.feed("A", [make_message(10.0)], now=100.0)
+        self.merger.feed("B", [make_message(10.5)], now=100.0)
+        self.merger.feed("A", [make_message(10.6)], now=100.0)
+        self.assertEqual(self.times(), [10.0, 10.5])
+
+        self.merger.feed("B", [make_message(10.2, "late")], now=100.0)
+        self.assertEqual(self.merged[-1].payload, "late")
+
+        stats = self.merger.get_stats()
+        self.assertEqual(stats["late"], 1)
+        self.assertAlmostEqual(stats["streams"]["B"]["max_lateness"], 0.3)
+        events = self.merger.pop_late_events()
+        self.assertEqual([(e["stream"], e["position"]) for e in events], [("B", 2)])
+        self.assertEqual(self.merger.pop_late_events(), [])
+
+    def test_custom_time_key(self):
+        """Test merging on a key other than the receive time"""
+        merger = DLTStreamMerger(time_key=lambda msg: int(msg.payload))
+        merged = []
+        merger.add_output(merged.extend)
+        merger.add_stream("A", now=0.0)
+        merger.add_stream("B", now=0.0)
+        merger.feed("A", [make_message(1.0, "2")], now=0.0)
+        merger.feed("B", [make_message(0.0, "1")], now=0.0)
+        merger.flush()
+
+        self.assertEqual([m.payload for m in merged], ["1", "2"])
+        self.assertEqual(merger.get_stats()["late"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Test DLT Parallel Filter Module
+"""
+import os
+import random
+import shutil
+import struct
+import tempfile
+import threading
+import time
+import unittest
+from core.dlt_columns import DLTMessageColumns
+from core.dlt_file import DLTFile
+from core.dlt_filter_cache import DLTFilterCache
+from core.dlt_filter_engine import FilterSpec, compile_filter, search_columns
+from core.dlt_parallel import DLTFileSource, DLTParallelFilter
+from core.dlt_trigram import DLTTrigramIndex
+
+def write_file(path, count, seed=1):
+    """Write a DLT file with random IDs, levels and payloads"""
+    rng = random.Random(seed)
+    words = ["timeout", "retry", "state", "signal", "lost"]
+    with open(path, "wb") as f:
+        f.write(b"DLT\1\x01" + struct.pack("<Q", 1700000000) + b"ECU1")
+        for i in range(count):
+            data = (bytes([rng.randrange(5)]) + b"ECU1" + rng.choice([b"NAV\0", b"HMI\0"])
+                    + rng.choice([b"MAIN", b"GPS\0"]) + b"\0"
+                    + f" {rng.choice(words)} {rng.choice(words)} {rng.randrange(100)}".encode())
+            f.write(struct.pack("<I", 1 << 31 | (i & 0xFF) << 16 | len(data) + 4) + data)
+
+class TestParallelFilter(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.path = os.path.join(cls.temp_dir, "test.dlt")
+        write_file(cls.path, 3000)
+        cls.dlt_file = DLTFile(cls.path)
+        cls.dlt_file.parse_header()
+        cls.dlt_file.load_messages()
+        cls.parallel = DLTParallelFilter(workers=2, shard_size=500, min_messages=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.parallel.close()
+        shutil.rmtree(cls.temp_dir, True)
+
+    def setUp(self):
+        self.columns = DLTMessageColumns.from_messages(self.dlt_file.messages)
+        self.columns.source = DLTFileSource.from_file(self.dlt_file)
+
+    def expected(self, spec, search=None):
+        positions = compile_filter(spec).filter(self.columns)
+        return search_columns(self.columns, search, positions) if search else positions
+
+    def test_shards_in_order(self):
+        """Test shard results match in-process evaluation and stream in order"""
+        self.assertEqual(len(self.columns), 3000)
+        for spec, search in ((FilterSpec(regex=r"timeout \d+"), None),
+                             (FilterSpec(app_ids=["NAV"], payload_text="LOST"), None),
+                             (FilterSpec(query="level>=WARN and payload~/sig.*re/"), None),
+                             (FilterSpec(), "gps")):
+            parts = []
+            result = self.parallel.evaluate(self.columns, spec, search, range(3000), on_partial=parts.append)
+            self.assertEqual(result, self.expected(spec, search))
+            self.assertEqual([p for part in parts for p in part], result)
+            self.assertGreater(len(parts), 1)
+
+    def test_appended_and_narrowed(self):
+        """Test positions appended after loading and trigram narrowing"""
+        self.columns.trigrams = DLTTrigramIndex(64)
+        self.columns.trigrams.update(self.columns.payloads)
+        self.columns.extend(self.dlt_file.messages[:100])
+        spec = FilterSpec(regex=r"retry (lost|state)")
+        result = self.parallel.evaluate(self.columns, spec, None, range(3100))
+        self.assertEqual(result, self.expected(spec))
+        self.assertTrue(any(p >= 3000 for p in result))
+
+    def test_clock_times_across_midnight(self):
+        """Test workers resolve clock times against the columns' day"""
+        midnight = time.mktime((2026, 3, 3, 0, 0, 0, 0, 0, -1))
+        for i in range(len(self.columns)):
+            self.columns.timestamps[i] = midnight - 150 + i * 0.1
+        spec = FilterSpec(query="t>=23:59:00 and payload~/lost \\d/")
+        result = self.parallel.evaluate(self.columns, spec, None, range(3000))
+        self.assertEqual(result, self.expected(spec))
+        self.assertTrue(any(self.columns.timestamps[p] >= midnight for p in result))
+
+    def test_cache_and_cancel(self):
+        """Test the cache hands regex queries to the pool"""
+        cache = DLTFilterCache(parallel=self.parallel)
+        spec = FilterSpec(regex="sig?nal")
+        self.assertEqual(cache.query(self.columns, spec), self.expected(spec))
+        self.assertTrue(self.parallel.applies(self.columns, spec, None, 3000))
+        self.assertFalse(self.parallel.applies(self.columns, FilterSpec(payload_text="signal"), "gps", 3000))
+
+        cancel = threading.Event()
+        cancel.set()
+        self.assertIsNone(cache.query(self.columns, FilterSpec(regex="lost"), cancel=cancel))
+        self.assertEqual(cache.get_stats()["entries"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
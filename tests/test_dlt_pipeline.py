@@ -0,0 +1,86 @@
+"""
+Test DLT Ingest Pipeline Module
+"""
+import unittest
+import threading
+from core.dlt_message import DLTMessage
+from core.dlt_pipeline import DLTIngestPipeline
+
+def make_frames(count, start=0):
+    """Build raw LOG frames with the sequence number as payload"""
+    frames = []
+    for i in range(start, start + count):
+        msg = DLTMessage()
+        msg.counter = i
+        msg.payload = str(i)
+        frames.append(msg.encode())
+    return frames
+
+class TestDLTIngestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.delivered = []
+        self.pipeline = DLTIngestPipeline(self.delivered.extend, workers=4,
+                                          max_pending_batches=8, batch_size=10)
+        self.pipeline.start()
+
+    def tearDown(self):
+        self.pipeline.stop()
+
+    def test_ordered_delivery(self):
+        """Test batches decoded in parallel are delivered in order"""
+        frames = make_frames(500)
+        for i in range(0, 500, 50):
+            self.assertTrue(self.pipeline.submit(frames[i:i + 50]))
+            self.assertTrue(self.pipeline.wait_idle(2.0))
+
+        self.assertEqual([m.payload for m in self.delivered], [str(i) for i in range(500)])
+        stats = self.pipeline.get_stats()
+        self.assertEqual(stats["frames_delivered"], 500)
+        self.assertEqual(stats["frames_dropped"], 0)
+
+    def test_receive_time_stamped(self):
+        """Test decoded messages carry the receive time"""
+        self.pipeline.submit(make_frames(3), recv_time=1234.5)
+        self.pipeline.wait_idle(2.0)
+
+        self.assertEqual([m.timestamp for m in self.delivered], [1234.5] * 3)
+
+    def test_slow_consumer_sheds_batches(self):
+        """Test submit never blocks when delivery is stuck"""
+        release = threading.Event()
+        pipeline = DLTIngestPipeline(lambda messages: release.wait(5.0),
+                                     max_pending_batches=2, batch_size=10)
+        pipeline.start()
+        try:
+            for i in range(10):
+                pipeline.submit(make_frames(10, i * 10))
+            stats = pipeline.get_stats()
+            self.assertEqual(stats["frames_in"], 100)
+            self.assertGreater(stats["frames_dropped"], 0)
+            self.assertLessEqual(stats["max_pending_batches"], 2)
+        finally:
+            release.set()
+            pipeline.stop()
+
+    def test_decode_errors_counted(self):
+        """Test undecodable frames are skipped and counted"""
+        frames = make_frames(2)
+        frames.insert(1, b"\x08\x00\x00\x80\x00\x00\x00\x00")
+        self.pipeline.submit(frames)
+        self.pipeline.wait_idle(2.0)
+
+        self.assertEqual([m.payload for m in self.delivered], ["0", "1"])
+        self.assertEqual(self.pipeline.get_stats()["decode_errors"], 1)
+
+class TestSplitFrames(unittest.TestCase):
+    def test_split_frames(self):
+        """Test framing by the length field leaves partial frames"""
+        frames = make_frames(3)
+        data = b"".join(frames) + frames[0][:5]
+
+        split, used = DLTMessage.split_frames(data)
+        self.assertEqual(split, frames)
+        self.assertEqual(used, len(data) - 5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+Test DLT Query Module
+"""
+import random
+import time
+import unittest
+from types import SimpleNamespace
+from core.dlt_columns import DLTMessageColumns
+from core.dlt_filter_engine import FilterSpec, compile_filter
+from core.dlt_query import DLTQuery, DLTQueryError, And, IndexLookup, Regex, TimeRange, reference_time
+from core.dlt_trigram import DLTTrigramIndex
+
+# 09:58 local time on some day, one message per 100 ms
+START = time.mktime((2026, 3, 2, 9, 58, 0, 0, 0, -1))
+
+def make_messages(count, seed=1):
+    """Messages spread over a few minutes with random IDs and payloads"""
+    rng = random.Random(seed)
+    words = ["timeout", "retry", "state", "signal", "lost"]
+    return [SimpleNamespace(timestamp=START + i * 0.1, msg_type=rng.choice(["LOG", "CONTROL"]),
+                            ecu_id=rng.choice(["ECU1", "ECU2"]),
+                            app_id=rng.choice(["NAV", "HMI", "DIAG"]),
+                            ctx_id=rng.choice(["MAIN", "GPS", "DISP"]),
+                            log_level=rng.choice(["FATAL", "ERROR", "WARN", "INFO", "DEBUG"]),
+                            payload=f"{rng.choice(words)} {rng.choice(words)} {rng.randrange(100)}")
+            for i in range(count)]
+
+class TestQuery(unittest.TestCase):
+    def setUp(self):
+        self.messages = make_messages(3000)
+        self.columns = DLTMessageColumns.from_messages(self.messages)
+
+    def check(self, text):
+        """Planned evaluation must agree with per-message matching"""
+        query = DLTQuery(text)
+        reference = self.messages[0].timestamp
+        expected = [i for i, m in enumerate(self.messages) if query.matches(m, reference)]
+        self.assertEqual(query.evaluate(self.columns), expected, text)
+        return expected
+
+    def test_queries(self):
+        """Test planned evaluation against per-message matching"""
+        for text in (
+            "ecu:ECU1 and app in (NAV,HMI) and level>=WARN and payload~/timeout \\d+/ and t in [10:00,10:02]",
+            "app:NAV or ctx:GPS",
+            "not (level<=INFO or type=CONTROL)",
+            "level>ERROR and level<ERROR",
+            'payload:"TIMEOUT RETRY" and app!=HMI',
+            "t>=10:01:30.5 and (payload~/lost/i or ecu in (ECU2))",
+            "t in [,09:59) and app:NAV and app:HMI",
+            f"t < {START + 10}",
+        ):
+            self.check(text)
+
+    def test_level_comparisons(self):
+        """Test level comparisons follow severity"""
+        expected = [i for i, m in enumerate(self.messages) if m.log_level in ("FATAL", "ERROR", "WARN")]
+        self.assertEqual(self.check("level>=warn"), expected)
+        self.assertEqual(self.check("level in (FATAL, ERROR, WARN)"), expected)
+
+    def test_plan_order(self):
+        """Test categorical criteria merge and regexes run last"""
+        query = DLTQuery("payload~/lost/ and t>=10:00 and app:NAV and level in (ERROR,WARN)")
+        self.assertIsInstance(query.root, And)
+        steps = query.root.plan(SimpleNamespace(columns=self.columns, total=len(self.columns),
+                                                reference=self.messages[0].timestamp))
+        self.assertIsInstance(steps[0], IndexLookup)
+        self.assertEqual(set(steps[0].criteria), {"app_id", "log_level"})
+        self.assertIsInstance(steps[1], TimeRange)
+        self.assertIsInstance(steps[2], Regex)
+
+    def test_explain(self):
+        """Test explain lists every step with actual counts"""
+        self.columns.trigrams = DLTTrigramIndex(64)
+        self.columns.trigrams.update(self.columns.payloads)
+        text = "app:NAV and payload~/timeout 4\\d/"
+        expected = self.check(text)
+        lines = DLTQuery(text).explain(self.columns).splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertIn("bitmap index", lines[3])
+        self.assertIn("trigram", lines[4])
+        self.assertTrue(lines[2].rstrip().endswith(str(len(expected))))
+
+    def test_clock_times_across_midnight(self):
+        """Test clock times fall on the first message's day on every path"""
+        midnight = time.mktime((2026, 3, 3, 0, 0, 0, 0, 0, -1))
+        messages = [SimpleNamespace(**dict(vars(m), timestamp=midnight - 150 + i * 0.1))
+                    for i, m in enumerate(self.messages)]
+        columns = DLTMessageColumns.from_messages(messages)
+        spec = FilterSpec(query="t>=23:59:00 and level>=WARN")
+        compiled = compile_filter(spec)
+        expected = [i for i, m in enumerate(messages)
+                    if m.timestamp >= midnight - 60 and m.log_level in ("FATAL", "ERROR", "WARN")]
+        reference = reference_time(columns)
+        self.assertEqual([i for i, m in enumerate(messages) if compiled.matches(m, reference)], expected)
+        self.assertEqual(compiled.filter(columns), expected)
+        self.assertEqual(compiled.filter(messages), expected)
+        self.assertTrue(any(messages[i].timestamp >= midnight for i in expected))
+
+    def test_errors(self):
+        """Test invalid queries report their position"""
+        for text, position in (("app:", 4), ("foo:1", 0), ("level>=LOUD", 7), ("app:NAV and", 11),
+                               ("payload~/(/", 11), ("(app:NAV", 8), ("app in (NAV", 11), ("t in [x,]", 6)):
+            with self.assertRaises(DLTQueryError, msg=text) as context:
+                DLTQuery(text)
+            self.assertEqual(context.exception.position, position, text)
+
+    def test_filter_spec(self):
+        """Test queries combine with the other criteria of a filter spec"""
+        spec = FilterSpec(ecu_ids=["ECU1"], query="level>=ERROR or payload:lost")
+        compiled = compile_filter(spec)
+        expected = [i for i, m in enumerate(self.messages) if compiled.matches(m)]
+        self.assertEqual(compiled.filter(self.columns), expected)
+        self.assertEqual(compiled.filter(self.messages), expected)
+        self.assertTrue(FilterSpec(ecu_ids=["ECU1"], query=spec.query).narrows(FilterSpec(query=spec.query)))
+        self.assertFalse(FilterSpec(query="app:NAV").narrows(spec))
+        self.assertEqual(FilterSpec.from_config({"query": " app:NAV "}).query, "app:NAV")
+
+if __name__ == "__main__":
+    unittest.main()
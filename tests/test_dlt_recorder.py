@@ -0,0 +1,164 @@
+"""
+Test DLT Recorder Module
+"""
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from core.dlt_message import DLTMessage
+from core.dlt_index import DLTFileIndex, find_session_time
+from core.dlt_recorder import DLTRecorder
+from core.dlt_daemon import DLTRecorderDaemon
+from core.dlt_ecu import ECUConfig
+
+def make_frames(count, level="INFO", app_id="APP1"):
+    """Build raw LOG frames"""
+    frames = []
+    for i in range(count):
+        msg = DLTMessage()
+        msg.counter = i
+        msg.log_level = level
+        msg.app_id = app_id
+        msg.payload = f"message {i}"
+        frames.append(msg.encode())
+    return frames
+
+class TestDLTRecorder(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, True)
+
+    def test_index(self):
+        """Test blocks, time ranges and header counts of the index"""
+        recorder = DLTRecorder(self.temp_dir, index_block_size=10)
+        recorder.write_frames(make_frames(15), recv_time=100.0)
+        recorder.write_frames(make_frames(10, "ERROR", "APP2"), recv_time=101.0)
+        recorder.close()
+
+        index = DLTFileIndex.load(DLTFileIndex.path_for(recorder.path))
+        self.assertEqual(index.messages, 25)
+        self.assertEqual(index.size, os.path.getsize(recorder.path))
+        self.assertEqual([(b[1], b[2], b[3], b[4]) for b in index.blocks],
+                         [(0, 10, 100.0, 100.0), (10, 10, 100.0, 101.0), (20, 5, 101.0, 101.0)])
+        self.assertEqual(index.levels, {DLTMessage.LOG_INFO: 15, DLTMessage.LOG_ERROR: 10})
+        self.assertEqual(index.apps, {"APP1": 15, "APP2": 10})
+
+        # Block offsets point at message boundaries
+        with open(recorder.path, "rb") as f:
+            f.seek(index.find_block(17)[0])
+            messages, _ = DLTMessage.parse_all(f.read())
+        self.assertEqual(messages[0].payload, "message 10")
+        self.assertEqual((messages[5].payload, messages[5].log_level), ("message 0", "ERROR"))
+        self.assertIsNone(index.find_block(25))
+
+        # Rebuilding from the file gives the same blocks (without times)
+        rebuilt = DLTFileIndex.build(recorder.path, block_size=10)
+        self.assertEqual([b[:3] for b in rebuilt.blocks], [b[:3] for b in index.blocks])
+
+    def test_rotation(self):
+        """Test files rotate by size and each gets its own index"""
+        frame_size = len(make_frames(1)[0])
+        recorder = DLTRecorder(self.temp_dir, max_bytes=4 + 10 * frame_size, max_seconds=0)
+        for _ in range(5):
+            recorder.write_frames(make_frames(5))
+        recorder.close()
+
+        stats = recorder.get_stats()
+        self.assertEqual(stats["files"], 3)
+        self.assertEqual(stats["rotations"], 2)
+        self.assertEqual(stats["messages"], 25)
+        for path in recorder.files:
+            self.assertTrue(os.path.exists(DLTFileIndex.path_for(path)))
+            self.assertLessEqual(os.path.getsize(path), 4 + 10 * frame_size)
+
+    def test_session_time(self):
+        """Test finding a point in time across the files of a rotated session"""
+        indexes = []
+        for first in (100, 102, 104):
+            index = DLTFileIndex(block_size=5)
+            for second in (first, first + 1):
+                index.add_frames(make_frames(5), index.size, recv_time=float(second))
+            indexes.append(index)
+
+        number, block = find_session_time(indexes, 103.0)
+        self.assertEqual((number, block[1], block[3]), (1, 5, 103.0))
+        number, block = find_session_time(indexes, 99.0)
+        self.assertEqual((number, block[1]), (0, 0))
+        self.assertEqual(find_session_time(indexes, 101.5)[0], 1)
+        self.assertIsNone(find_session_time(indexes, 106.0))
+
+        # An index rebuilt from a file alone has no receive times
+        recorder = DLTRecorder(self.temp_dir)
+        recorder.write_frames(make_frames(5), recv_time=100.0)
+        recorder.close()
+        self.assertIsNone(DLTFileIndex.build(recorder.path).find_time(100.0))
+
+    def test_rotation_by_time(self):
+        """Test a new file is started once max_seconds have passed"""
+        recorder = DLTRecorder(self.temp_dir, max_bytes=0, max_seconds=60)
+        recorder.write_frames(make_frames(1), recv_time=time.time())
+        recorder.write_frames(make_frames(1), recv_time=time.time() + 61)
+        recorder.close()
+        self.assertEqual(recorder.get_stats()["files"], 2)
+
+class TestDLTRecorderDaemon(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, True)
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.bind(("127.0.0.1", 0))
+        self.server.listen(1)
+        self.addCleanup(self.server.close)
+
+    def test_record_and_status(self):
+        """Test an ECU is recorded and reported in the status file"""
+        frames = make_frames(20)
+
+        def serve():
+            client, _ = self.server.accept()
+            client.sendall(b"".join(frames))
+            time.sleep(1.0)
+            client.close()
+
+        thread = threading.Thread(target=serve)
+        thread.daemon = True
+        thread.start()
+
+        ecu = ECUConfig("ECU1", ip_address="127.0.0.1", tcp_port=self.server.getsockname()[1])
+        status_file = os.path.join(self.temp_dir, "status.json")
+        daemon = DLTRecorderDaemon([ecu, ECUConfig("NOIP")], {},
+                                   output_dir=self.temp_dir, status_file=status_file)
+        daemon.start()
+        try:
+            deadline = time.time() + 3.0
+            while daemon.recorders["ECU1"].get_stats()["messages"] < 20 and time.time() < deadline:
+                time.sleep(0.05)
+        finally:
+            daemon.shutdown()
+
+        with open(status_file) as f:
+            status = json.load(f)
+        self.assertEqual(list(status["ecus"]), ["ECU1"])
+        self.assertEqual(status["ecus"]["ECU1"]["recording"]["messages"], 20)
+        self.assertEqual(status["ecus"]["ECU1"]["loss"]["lost"], 0)
+
+        path = status["ecus"]["ECU1"]["recording"]["file"]
+        self.assertEqual(os.path.dirname(path), os.path.join(self.temp_dir, "ECU1"))
+        self.assertEqual(DLTFileIndex.load(DLTFileIndex.path_for(path)).messages, 20)
+
+    def test_record_mode_without_tkinter(self):
+        """Test the recorder entry point does not import the UI"""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        code = ("import sys, main, core.dlt_daemon; "
+                "sys.exit('tkinter' in sys.modules or 'ui.app' in sys.modules)")
+        result = subprocess.run([sys.executable, "-c", code], cwd=root, timeout=30)
+        self.assertEqual(result.returncode, 0)
+
+if __name__ == '__main__':
+    unittest.main()
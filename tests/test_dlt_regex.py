@@ -0,0 +1,85 @@
+"""
+Test DLT Regex Module
+"""
+import re
+import unittest
+from core.dlt_message import DLTMessage
+from core.dlt_regex import DLTRegexMatcher, LiteralAutomaton, required_literals
+
+def make_message(payload):
+    msg = DLTMessage()
+    msg.payload = payload
+    return msg
+
+class TestLiteralAutomaton(unittest.TestCase):
+    def test_overlapping(self):
+        """Test all literals are found, including overlapping ones"""
+        automaton = LiteralAutomaton(["he", "she", "his", "hers", "abc", "bcd"])
+        self.assertEqual(automaton.find("ushers abcd"), {"he", "she", "hers", "abc", "bcd"})
+        self.assertEqual(automaton.find("nothing"), set())
+
+class TestRegexMatcher(unittest.TestCase):
+    PATTERNS = {
+        "timeout": (r"timeout after (\d+) ms", 0),
+        "voltage": (r"(?i)VOLTAGE=(\d+)", 0),
+        "state": (r"state (\w+) -> (\w+)", 0),
+        "error_or_warn": (r"error|warn", re.IGNORECASE),
+        "digits": (r"\d{5}", 0),
+    }
+    PAYLOADS = [
+        "Timeout after 250 ms",
+        "timeout after 250 ms",
+        "Voltage=12 state INIT -> RUN",
+        "WARNING: 12345 frames lost",
+        "plain text",
+    ]
+
+    def setUp(self):
+        self.matcher = DLTRegexMatcher()
+        for name, (pattern, flags) in self.PATTERNS.items():
+            self.assertTrue(self.matcher.add_pattern(name, pattern, flags))
+        self.messages = [make_message(payload) for payload in self.PAYLOADS]
+
+    def naive(self, message):
+        results = {}
+        for name, pattern in self.matcher.patterns.items():
+            match = pattern.search(message.payload)
+            if match:
+                results[name] = match.groups()
+        return results
+
+    def test_match_message(self):
+        """Test prefiltered matching equals trying every pattern"""
+        for msg in self.messages:
+            self.assertEqual(self.matcher.match_message(msg), self.naive(msg))
+        self.assertEqual(self.matcher.match_message(self.messages[1]), {"timeout": ("250",)})
+
+    def test_find_all(self):
+        """Test find_all reports every pattern"""
+        results = self.matcher.find_all(self.messages[2])
+        self.assertEqual(list(results), list(self.PATTERNS))
+        self.assertEqual(results["state"], [("INIT", "RUN")])
+        self.assertEqual(results["timeout"], [])
+
+    def test_match_range(self):
+        """Test batch matching over a message range"""
+        expected = [(i, self.naive(msg)) for i, msg in enumerate(self.messages) if self.naive(msg)]
+        self.assertEqual(self.matcher.match_range(self.messages), expected)
+        self.assertEqual(self.matcher.match_range(self.messages, 2, 3), [(2, self.naive(self.messages[2]))])
+
+    def test_pattern_changes(self):
+        """Test the prefilter follows added and removed patterns"""
+        self.matcher.match_message(self.messages[0])
+        self.matcher.remove_pattern("timeout")
+        self.assertEqual(self.matcher.match_message(self.messages[1]), {})
+        self.matcher.add_pattern("plain", r"plain (\w+)")
+        self.assertEqual(self.matcher.match_message(self.messages[4]), {"plain": ("text",)})
+        self.assertFalse(self.matcher.add_pattern("broken", "("))
+
+    def test_required_literals(self):
+        """Test literals continue through literal-only groups"""
+        self.assertEqual(required_literals(r"a(bc)d"), ["abcd"])
+        self.assertEqual(required_literals(r"word\b.*code=(123)\b"), ["code=123", "word"])
+
+if __name__ == '__main__':
+    unittest.main()
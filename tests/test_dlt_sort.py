@@ -0,0 +1,83 @@
+"""
+Test DLT Sort Index Module
+"""
+import random
+import unittest
+from types import SimpleNamespace
+from core.dlt_columns import DLTMessageColumns
+
+FIELDS = ("timestamp", "ecu_id", "app_id", "ctx_id", "log_level", "payload")
+
+def make_messages(count, rng, start=0):
+    """Messages with repeated values, so ties are common"""
+    return [SimpleNamespace(timestamp=float(rng.randrange(500)), msg_type="LOG",
+                            ecu_id=rng.choice(["ECU1", "ECU2"]),
+                            app_id=rng.choice(["NAV", "HMI", "DIAG", "AUDIO"]),
+                            ctx_id=f"C{rng.randrange(20):02d}",
+                            log_level=rng.choice(["ERROR", "WARN", "INFO", "DEBUG"]),
+                            payload=f"payload {rng.randrange(50)}")
+            for _ in range(count)]
+
+class TestSortIndex(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(5)
+        self.messages = make_messages(3000, self.rng)
+        self.columns = DLTMessageColumns.from_messages(self.messages)
+
+    def expected(self, positions, field, reverse):
+        """The stable sort the view used to do"""
+        return sorted(positions, key=lambda idx: getattr(self.messages[idx], field), reverse=reverse)
+
+    def test_sort(self):
+        """Test sorting all, many and few positions by every field and direction"""
+        index = self.columns.sort_index()
+        subsets = [list(range(3000)), sorted(self.rng.sample(range(3000), 1500)),
+                   sorted(self.rng.sample(range(3000), 40))]
+        for field in FIELDS:
+            for reverse in (False, True):
+                for positions in subsets:
+                    self.assertEqual(index.sort(positions, field, reverse),
+                                     self.expected(positions, field, reverse), (field, reverse))
+
+    def test_cached(self):
+        """Test permutations are computed once per field and direction"""
+        index = self.columns.sort_index()
+        order = index.order("app_id", True)
+        self.assertIs(index.order("app_id", True), order)
+        self.assertIsNot(index.order("app_id", False), order)
+
+    def test_append(self):
+        """Test positions appended to the columns are merged in"""
+        index = self.columns.sort_index()
+        for field in FIELDS:
+            index.order(field)
+            index.order(field, True)
+        extra = make_messages(500, self.rng)
+        self.messages.extend(extra)
+        self.columns.extend(extra)
+        positions = sorted(self.rng.sample(range(3500), 2000))
+        for field in FIELDS:
+            for reverse in (False, True):
+                self.assertEqual(index.sort(positions, field, reverse),
+                                 self.expected(positions, field, reverse), (field, reverse))
+
+    def test_row_of(self):
+        """Test positions are located in sorted rows by rank"""
+        index = self.columns.sort_index()
+        positions = sorted(self.rng.sample(range(3000), 800))
+        for field in FIELDS:
+            for reverse in (False, True):
+                rows = index.sort(positions, field, reverse)
+                for position in self.rng.sample(range(3000), 50):
+                    row = index.row_of(rows, position, field, reverse)
+                    expected = self.expected(sorted(set(rows) | {position}), field, reverse).index(position)
+                    self.assertEqual(row, expected, (field, reverse, position))
+
+    def test_sorted_timestamps(self):
+        """Test timestamps in order are their own permutation"""
+        messages = sorted(self.messages, key=lambda m: m.timestamp)
+        columns = DLTMessageColumns.from_messages(messages)
+        self.assertEqual(columns.sort_index().order("timestamp").tolist(), list(range(3000)))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Test DLT Time Index Module
+"""
+import random
+import unittest
+from array import array
+from types import SimpleNamespace
+from core.dlt_columns import DLTMessageColumns
+from core.dlt_filter_engine import FilterSpec, compile_filter
+from core.dlt_time_index import DLTTimeIndex
+
+class TestTimeIndex(unittest.TestCase):
+    def check_ranges(self, timestamps, index):
+        """select() must agree with comparing every timestamp"""
+        rng = random.Random(3)
+        for _ in range(50):
+            start, end = sorted(rng.uniform(-5, 105) for _ in range(2))
+            if rng.random() < 0.2:
+                start = None
+            inclusive = rng.random() < 0.5
+            expected = [i for i, t in enumerate(timestamps)
+                        if (start is None or t > start or (inclusive and t == start)) and t <= end]
+            self.assertEqual(list(index.select(start, end, start_inclusive=inclusive)), expected)
+            positions = list(range(0, len(timestamps), 3))
+            self.assertEqual(list(index.select(start, end, positions, inclusive)),
+                             [i for i in expected if i % 3 == 0])
+            window = range(100, 700)
+            self.assertEqual(list(index.select(start, end, window, inclusive)),
+                             [i for i in expected if i in window])
+
+    def test_sorted(self):
+        """Test sorted timestamps are searched as position ranges"""
+        timestamps = array('d', (i * 0.1 for i in range(1000)))
+        index = DLTTimeIndex(timestamps, block_size=64)
+        self.assertIsInstance(index.select(10.0, 20.0), range)
+        self.check_ranges(timestamps, index)
+        self.assertEqual(index.find(12.05), 121)
+        self.assertEqual(index.find(1000.0), 1000)
+        self.assertEqual(index.estimate(0.0, 9.95), 0.1)
+
+    def test_unsorted(self):
+        """Test out-of-order timestamps fall back to the block sketch"""
+        rng = random.Random(1)
+        timestamps = array('d', (i * 0.1 + rng.uniform(-2, 2) for i in range(1000)))
+        index = DLTTimeIndex(timestamps, block_size=64)
+        index.update()
+        self.assertFalse(index.sorted)
+        self.check_ranges(timestamps, index)
+        for target in (-10.0, 0.0, 33.3, 50.0, 99.0, 200.0):
+            expected = next((i for i, t in enumerate(timestamps) if t >= target), len(timestamps))
+            self.assertEqual(index.find(target), expected)
+
+    def test_append(self):
+        """Test the index follows appended timestamps"""
+        timestamps = array('d', (float(i) for i in range(100)))
+        index = DLTTimeIndex(timestamps, block_size=16)
+        self.assertEqual(index.find(50.0), 50)
+        timestamps.extend(float(i) for i in range(100, 150))
+        self.assertEqual(index.find(120.0), 120)
+        self.assertTrue(index.sorted)
+        timestamps.append(10.5)
+        self.assertEqual(index.find(149.5), 151)
+        self.assertFalse(index.sorted)
+        self.assertEqual(index.select(10.2, 10.8), [150])
+
+    def test_filter_time_range(self):
+        """Test time criteria of filters use the time index"""
+        rng = random.Random(2)
+        messages = [SimpleNamespace(timestamp=i + rng.choice([0, 0, 0, -30]), ecu_id="ECU1", msg_type="LOG",
+                                    app_id=rng.choice(["NAV", "HMI"]), ctx_id="MAIN",
+                                    log_level="INFO", payload="x")
+                    for i in range(2000)]
+        for timestamps in (messages, sorted(messages, key=lambda m: m.timestamp)):
+            columns = DLTMessageColumns.from_messages(timestamps)
+            for spec in (FilterSpec(time_start=500.0, time_end=900.0),
+                         FilterSpec(time_start=500.0, app_ids=["NAV"]),
+                         FilterSpec(time_end=100.0, payload_text="x")):
+                compiled = compile_filter(spec)
+                expected = [i for i, m in enumerate(timestamps) if compiled.matches(m)]
+                self.assertEqual(compiled.filter(columns), expected)
+                self.assertEqual(compiled.filter(columns, range(300, 1500)),
+                                 [i for i in expected if 300 <= i < 1500])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+Test DLT Trigger Engine Module
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from core.dlt_message import DLTMessage
+from core.dlt_bookmarks import DLTBookmarkManager
+from core.dlt_trigger import DLTTrigger, DLTTriggerSet, DLTTriggerEngine
+
+def make_message(timestamp, payload="", level="INFO", app_id="APP1"):
+    """Build a message with raw data, as received on the live path"""
+    msg = DLTMessage()
+    msg.timestamp = timestamp
+    msg.payload = payload
+    msg.log_level = level
+    msg.app_id = app_id
+    msg.raw_data = msg.encode()
+    return msg
+
+class TestDLTTriggerSet(unittest.TestCase):
+    def test_level_and_pattern_rules(self):
+        """Test level rules, payload patterns and scope"""
+        triggers = DLTTriggerSet([
+            DLTTrigger("fatal", level="FATAL"),
+            DLTTrigger("reset", pattern=r"watchdog reset \d+"),
+            DLTTrigger("nav", pattern="timeout", app_id="NAV"),
+            DLTTrigger("warn oom", level="WARN", pattern="out of memory")
+        ])
+
+        self.assertEqual(triggers.match(make_message(0, level="FATAL")).name, "fatal")
+        self.assertEqual(triggers.match(make_message(0, "watchdog reset 3")).name, "reset")
+        self.assertIsNone(triggers.match(make_message(0, "timeout")))
+        self.assertEqual(triggers.match(make_message(0, "timeout", app_id="NAV")).name, "nav")
+        self.assertIsNone(triggers.match(make_message(0, "out of memory")))
+        self.assertEqual(triggers.match(make_message(0, "out of memory", "WARN")).name, "warn oom")
+        self.assertIsNone(triggers.match(make_message(0, "all good")))
+
+    def test_patterns_keep_their_own_semantics(self):
+        """Test backreferences and inline flags apply per rule"""
+        triggers = DLTTriggerSet([
+            DLTTrigger("repeat", pattern=r"(\w)\1 code"),
+            DLTTrigger("fatal", pattern="(?i)fatal error"),
+            DLTTrigger("reset", pattern="RESET")
+        ])
+
+        self.assertEqual(triggers.match(make_message(0, "aa code")).name, "repeat")
+        self.assertIsNone(triggers.match(make_message(0, "ab code")))
+        self.assertEqual(triggers.match(make_message(0, "FATAL Error: disk")).name, "fatal")
+        self.assertIsNone(triggers.match(make_message(0, "reset")))
+        self.assertEqual(triggers.match(make_message(0, "RESET")).name, "reset")
+
+    def test_rule_needs_condition(self):
+        """Test a rule without level or pattern is rejected"""
+        with self.assertRaises(ValueError):
+            DLTTrigger("empty")
+
+class TestDLTTriggerEngine(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.bookmarks = DLTBookmarkManager(os.path.join(self.temp_dir, "config"))
+        self.engine = DLTTriggerEngine(
+            [DLTTrigger("fatal", level="FATAL")], os.path.join(self.temp_dir, "snapshots"),
+            pre_seconds=2.0, post_seconds=1.0, bookmarks=self.bookmarks
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def read_snapshot(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        self.assertEqual(data[:4], b"DLT\1")
+        messages, _ = DLTMessage.parse_all(data[4:])
+        return [m.payload for m in messages]
+
+    def test_pre_and_post_window(self):
+        """Test a snapshot holds the pre-trigger ring and the post-trigger window"""
+        for i in range(10):
+            self.engine.on_message(make_message(100.0 + i * 0.5, str(i)))
+        self.engine.on_message(make_message(105.0, "crash", "FATAL"))
+        for i in range(10, 14):
+            self.engine.on_message(make_message(105.0 + (i - 9) * 0.4, str(i)))
+
+        snapshots = self.engine.pop_new_snapshots()
+        self.assertEqual(len(snapshots), 1)
+        # 103.0 .. 104.5 before, 105.4 .. 105.8 after; 106.6 closed the window
+        self.assertEqual(self.read_snapshot(snapshots[0].path),
+                         ["6", "7", "8", "9", "crash", "10", "11"])
+        self.assertEqual(snapshots[0].count, 7)
+        self.assertEqual(len(self.bookmarks.get_bookmarks()), 1)
+        self.assertIn(snapshots[0].path, self.bookmarks.get_bookmarks()[0].description)
+
+    def test_tick_closes_quiet_window(self):
+        """Test the snapshot is written when no message arrives after the window"""
+        self.engine.on_message(make_message(100.0, "crash", "FATAL"))
+        self.engine.tick(now=100.5)
+        self.assertEqual(self.engine.pop_new_snapshots(), [])
+
+        self.engine.tick(now=101.5)
+        self.assertEqual(len(self.engine.pop_new_snapshots()), 1)
+
+    def test_triggers_during_capture(self):
+        """Test triggers inside an open window are counted, not captured again"""
+        self.engine.on_message(make_message(100.0, "a", "FATAL"))
+        self.engine.on_message(make_message(100.5, "b", "FATAL"))
+        self.engine.close()
+
+        snapshots = self.engine.pop_new_snapshots()
+        self.assertEqual(len(snapshots), 1)
+        self.assertEqual(snapshots[0].hits, 2)
+        self.assertEqual(self.read_snapshot(snapshots[0].path), ["a", "b"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Test DLT Trigram Index Module
+"""
+import os
+import random
+import tempfile
+import unittest
+from types import SimpleNamespace
+from core.dlt_columns import DLTMessageColumns
+from core.dlt_filter_engine import FilterSpec, CompiledFilter, search_columns
+from core.dlt_regex import required_literals
+from core.dlt_trigram import DLTTrigramIndex
+
+WORDS = ["init", "state", "Timeout", "request", "retry", "signal", "buffer", "Straße", "lost"]
+
+def make_messages(count, seed=1):
+    """Messages with random word payloads"""
+    rng = random.Random(seed)
+    return [SimpleNamespace(timestamp=float(i), ecu_id="ECU1", msg_type="LOG",
+                            app_id=rng.choice(["NAV", "HMI"]), ctx_id=rng.choice(["MAIN", "GPS"]),
+                            log_level=rng.choice(["INFO", "WARN"]),
+                            payload=" ".join(rng.choice(WORDS) for _ in range(4)) + f" {rng.randrange(1000)}")
+            for i in range(count)]
+
+class TestTrigramIndex(unittest.TestCase):
+    def setUp(self):
+        self.messages = make_messages(3000)
+        self.columns = DLTMessageColumns.from_messages(self.messages)
+
+    def attach(self, block_size=16):
+        index = DLTTrigramIndex(block_size)
+        index.update(self.columns.payloads)
+        self.columns.trigrams = index
+        return index
+
+    def check(self, spec):
+        """Indexed results equal those of a full scan"""
+        compiled = CompiledFilter(spec)
+        expected = [i for i, msg in enumerate(self.messages) if compiled.matches(msg)]
+        self.assertEqual(compiled.filter(self.columns), expected)
+        return expected
+
+    def test_narrowing(self):
+        """Test substring and regex searches through the index"""
+        index = self.attach()
+        self.assertTrue(self.check(FilterSpec(payload_text="timeout 12")))
+        self.check(FilterSpec(payload_text="STRASSE"))
+        self.check(FilterSpec(payload_text="Timeout", case_sensitive=True))
+        self.check(FilterSpec(payload_text="no such text"))
+        self.check(FilterSpec(regex=r"retry (lost|buffer) \d+"))
+        self.check(FilterSpec(regex=r"(?i)signal\s+INIT", app_ids=["NAV"]))
+        self.assertEqual(index.candidate_blocks(["zzzz"]), set())
+        self.assertIsNone(index.candidate_blocks(["ab"]))
+
+    def test_live_append(self):
+        """Test appended payloads are indexed or kept as candidates"""
+        self.attach()
+        more = make_messages(100, seed=2)
+        more[-1].payload = "unique marker"
+        self.messages.extend(more)
+        self.columns.extend(more)
+        self.assertEqual(self.columns.trigrams.indexed, len(self.messages))
+        self.assertEqual(self.check(FilterSpec(payload_text="unique marker")), [len(self.messages) - 1])
+
+        self.columns.trigrams.indexed -= 50  # pretend the tail is not indexed
+        self.assertEqual(self.check(FilterSpec(payload_text="unique marker")), [len(self.messages) - 1])
+
+    def test_toolbar_search(self):
+        """Test the toolbar search matches payload, app and context"""
+        self.attach()
+        for text in ("gps", "timeout 5", "na"):
+            expected = [i for i, msg in enumerate(self.messages)
+                        if any(text in value.lower() for value in (msg.payload, msg.app_id, msg.ctx_id))]
+            self.assertEqual(search_columns(self.columns, text), expected)
+        subset = list(range(0, 3000, 7))
+        self.assertEqual(search_columns(self.columns, "gps", subset),
+                         [i for i in subset if "gps" in self.messages[i].ctx_id.lower()
+                          or "gps" in self.messages[i].payload.lower()])
+
+    def test_persistence(self):
+        """Test the stored index is reused only for an unchanged file"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "trace.dlt")
+            with open(path, "wb") as f:
+                f.write(b"DLT\x01")
+            payloads = self.columns.payloads
+            built = DLTTrigramIndex.open_or_build(path, payloads[:1000], block_size=32)
+            self.assertTrue(os.path.exists(DLTTrigramIndex.path_for(path)))
+
+            loaded = DLTTrigramIndex.open_or_build(path, payloads, block_size=32)
+            self.assertEqual(loaded.indexed, len(payloads))
+            fresh = DLTTrigramIndex(32)
+            fresh.update(payloads)
+            self.assertEqual(loaded.postings, fresh.postings)
+            self.assertEqual(built.source, loaded.source)
+
+            with open(path, "ab") as f:
+                f.write(b"more")
+            rebuilt = DLTTrigramIndex.open_or_build(path, payloads[:10], block_size=32)
+            self.assertEqual(rebuilt.indexed, 10)
+
+class TestRequiredLiterals(unittest.TestCase):
+    def test_literals(self):
+        """Test literal extraction from regex patterns"""
+        self.assertEqual(required_literals(r"timeout \d+ms"), ["timeout ", "ms"])
+        self.assertEqual(required_literals(r"(?:foo)?bar(baz)+"), ["bar", "baz"])
+        self.assertEqual(required_literals(r"error|warning"), [])
+        self.assertEqual(required_literals(r"[a-z]+\d"), [])
+        self.assertEqual(required_literals("("), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+Test DLT UDP Connection Module
+"""
+import unittest
+import shutil
+import socket
+import tempfile
+import time
+from core.dlt_udp import DLTUDPConnection
+
+def make_frame(text, counter):
+    """Build a raw LOG message with extended header"""
+    payload = text.encode('utf-8')
+    length = 4 + 10 + len(payload)
+    header = (1 << 31) | ((counter & 0xFF) << 16) | length
+    return header.to_bytes(4, 'little') + bytes([0x04]) + b"APP1CTX1" + bytes([1]) + payload
+
+class TestDLTUDPConnection(unittest.TestCase):
+    def setUp(self):
+        self.connection = DLTUDPConnection("127.0.0.1", 0)
+        self.connection.log_dir = tempfile.mkdtemp()
+        self.received = []
+        self.connection.add_callback(self.received.append)
+        self.assertTrue(self.connection.connect())
+        self.port = self.connection.socket.getsockname()[1]
+        self.sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        
+    def tearDown(self):
+        self.sender.close()
+        self.connection.disconnect()
+        shutil.rmtree(self.connection.log_dir, ignore_errors=True)
+        
+    def _wait_for(self, count):
+        deadline = time.time() + 2.0
+        while len(self.received) < count and time.time() < deadline:
+            time.sleep(0.01)
+        
+    def test_multiple_messages_per_datagram(self):
+        """Test that every message in a datagram is delivered"""
+        datagram = b"".join(make_frame(f"msg {i}", i) for i in range(3))
+        self.sender.sendto(datagram, ("127.0.0.1", self.port))
+        self._wait_for(3)
+        
+        self.assertEqual([m.payload for m in self.received], ["msg 0", "msg 1", "msg 2"])
+        stats = list(self.connection.get_sender_stats().values())[0]
+        self.assertEqual(stats["datagrams"], 1)
+        self.assertEqual(stats["messages"], 3)
+        self.assertEqual(stats["counter_gaps"], 0)
+        
+    def test_counter_gap_detection(self):
+        """Test that skipped message counters are counted as lost"""
+        for counter in (254, 255, 0, 4):
+            self.sender.sendto(make_frame("x", counter), ("127.0.0.1", self.port))
+        self._wait_for(4)
+        
+        stats = list(self.connection.get_sender_stats().values())[0]
+        self.assertEqual(stats["counter_gaps"], 1)
+        self.assertEqual(stats["lost_messages"], 3)
+        
+    def test_malformed_bytes(self):
+        """Test that trailing garbage in a datagram is counted"""
+        self.sender.sendto(make_frame("ok", 0) + b"\x01\x02", ("127.0.0.1", self.port))
+        self._wait_for(1)
+        
+        stats = list(self.connection.get_sender_stats().values())[0]
+        self.assertEqual(stats["messages"], 1)
+        self.assertEqual(stats["malformed_bytes"], 2)
+
+if __name__ == '__main__':
+    unittest.main()
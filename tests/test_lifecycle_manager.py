@@ -0,0 +1,109 @@
+"""
+Test DLT Lifecycle Manager Module
+"""
+import unittest
+import os
+import socket
+import tempfile
+import threading
+import time
+from core.dlt_connection import DLTConnection
+from core.dlt_message import DLTMessage
+from core.lifecycle_manager import DLTLifecycleManager
+
+class TestDLTLifecycleManager(unittest.TestCase):
+    def setUp(self):
+        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server_socket.bind(('localhost', 0))
+        self.port = self.server_socket.getsockname()[1]
+        self.server_socket.listen(2)
+        
+        self.log_dir = tempfile.mkdtemp()
+        self.connection = DLTConnection('localhost', self.port)
+        self.connection.log_dir = self.log_dir
+        self.manager = DLTLifecycleManager(self.connection, reconnect_interval=0.05)
+        
+    def tearDown(self):
+        self.manager.stop()
+        self.connection.disconnect()
+        self.server_socket.close()
+        for f in os.listdir(self.log_dir):
+            os.remove(os.path.join(self.log_dir, f))
+        os.rmdir(self.log_dir)
+        
+    def _wait_for(self, condition, timeout=3.0):
+        deadline = time.time() + timeout
+        while not condition() and time.time() < deadline:
+            time.sleep(0.01)
+        
+    def test_reconnect_after_drop(self):
+        """Test immediate reconnect into the same log file"""
+        accepted = []
+        monitoring = threading.Event()
+        
+        def serve():
+            # Drop the first connection, keep the second one open
+            client, _ = self.server_socket.accept()
+            monitoring.wait(2.0)
+            client.close()
+            client, _ = self.server_socket.accept()
+            accepted.append(client)
+            
+        server_thread = threading.Thread(target=serve)
+        server_thread.daemon = True
+        server_thread.start()
+        
+        self.connection.connect()
+        self.manager.start()
+        monitoring.set()
+        self._wait_for(lambda: accepted and self.connection.is_connected)
+        
+        metrics = self.manager.get_metrics()
+        self.assertTrue(metrics["connected"])
+        self.assertEqual(metrics["reconnects"], 1)
+        self.assertIsNotNone(metrics["last_downtime"])
+        
+        # One recording with a gap marker instead of a second file
+        self.connection.disconnect()
+        files = os.listdir(self.log_dir)
+        self.assertEqual(len(files), 1)
+        with open(os.path.join(self.log_dir, files[0]), 'rb') as f:
+            data = f.read()
+        messages, _ = DLTMessage.parse_all(data[4:])
+        self.assertEqual(messages[0].ctx_id, "GAP")
+        
+        for client in accepted:
+            client.close()
+            
+    def test_stop_during_slow_reconnect(self):
+        """Test stop() does not wait for a hanging connect attempt"""
+        attempt = threading.Event()
+        
+        def slow_connect(resume_log=False):
+            attempt.set()
+            time.sleep(3.0)  # Unreachable ECU without a timeout
+            return False
+            
+        self.connection.connect = slow_connect
+        self.manager.start()
+        self.assertTrue(attempt.wait(2.0))
+        
+        started = time.time()
+        self.manager.stop(timeout=0.5)
+        self.assertLess(time.time() - started, 1.5)
+        
+    def test_backoff_delay(self):
+        """Test exponential backoff bounds"""
+        self.manager.jitter = 0.0
+        self.assertAlmostEqual(self.manager._backoff_delay(1), 0.05)
+        self.assertAlmostEqual(self.manager._backoff_delay(3), 0.2)
+        self.assertEqual(self.manager._backoff_delay(50), self.manager.max_interval)
+        
+        self.manager.jitter = 0.5
+        for _ in range(20):
+            delay = self.manager._backoff_delay(2)
+            self.assertGreaterEqual(delay, 0.05)
+            self.assertLessEqual(delay, 0.1)
+
+if __name__ == '__main__':
+    unittest.main()
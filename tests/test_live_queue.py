@@ -0,0 +1,56 @@
+"""
+Test Live Message Queue Module
+"""
+import unittest
+import threading
+from core.live_queue import LiveMessageQueue
+
+class TestLiveMessageQueue(unittest.TestCase):
+    def setUp(self):
+        self.queue = LiveMessageQueue(maxsize=10)
+        
+    def test_drain_in_order(self):
+        """Test messages are drained in arrival order"""
+        for i in range(5):
+            self.queue.put(i)
+            
+        self.assertEqual(self.queue.drain(), [0, 1, 2, 3, 4])
+        self.assertEqual(len(self.queue), 0)
+        
+    def test_drain_batch_limit(self):
+        """Test draining at most max_items messages"""
+        for i in range(8):
+            self.queue.put(i)
+            
+        self.assertEqual(self.queue.drain(3), [0, 1, 2])
+        self.assertEqual(len(self.queue), 5)
+        
+    def test_drop_oldest_when_full(self):
+        """Test that a full queue drops the oldest messages"""
+        for i in range(15):
+            self.queue.put(i)
+            
+        stats = self.queue.get_stats()
+        self.assertEqual(stats["dropped"], 5)
+        self.assertTrue(stats["lagging"])
+        self.assertEqual(self.queue.drain(), list(range(5, 15)))
+        
+    def test_concurrent_producers(self):
+        """Test that concurrent producers never lose count"""
+        queue = LiveMessageQueue(maxsize=100000)
+        
+        def produce():
+            for i in range(1000):
+                queue.put(i)
+                
+        threads = [threading.Thread(target=produce) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+            
+        self.assertEqual(len(queue.drain()), 4000)
+        self.assertEqual(queue.get_stats()["dropped"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
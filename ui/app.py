@@ -2,16 +2,32 @@
 DLT Viewer Application - Main UI Application
 """
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
+from tkinter import ttk, filedialog, messagebox, simpledialog
 import os
 import threading
+import time
 import datetime
+import ipaddress
+import re
 
 from ui.main_window import MainWindow
 from ui.connection_dialog import ConnectionDialog
 from ui.export_dialog import ExportDialog
 from core.dlt_file import DLTFile
 from core.dlt_connection import DLTConnection
+from core.dlt_udp import DLTUDPConnection
+from core.lifecycle_manager import DLTLifecycleManager
+from core.dlt_control import DLTControlClient
+from core.dlt_governor import DLTLogStormGovernor
+from core.dlt_message import DLTMessage
+from core.live_queue import LiveMessageQueue
+from core.dlt_arena import DLTMessageArena
+from core.dlt_merge import DLTStreamMerger
+from core.dlt_ecu import ECUManager
+from core.dlt_trigger import DLTTrigger, DLTTriggerEngine
+from core.dlt_bookmarks import DLTBookmarkManager
+from core.dlt_bus import POLICY_BLOCK, POLICY_DROP_OLDEST
+from utils.config import get_setting
 from utils.logger import get_logger
 
 class DLTViewerApp:
@@ -24,8 +40,35 @@ class DLTViewerApp:
         self.current_file = None
         self.is_loading = False
         self.connection = None
+        self.lifecycle = None
+        self.control_client = None
+        self.governor = None
+        self.triggers = None
         self.log_file = None
         
+        # Connections to all configured ECUs, merged by time
+        self.merger = None
+        self.merge_connections = []
+        
+        # Connect attempt running in the background
+        self.connect_thread = None
+        self.connect_started = None
+        self.connect_result = None
+        
+        # Live message hand-off from receive threads to the UI thread
+        self.live_queue = LiveMessageQueue(
+            get_setting(config, "live_view.queue_size", 50000)
+        )
+        self.frame_interval_ms = get_setting(config, "live_view.frame_interval_ms", 50)
+        self.max_batch = get_setting(config, "live_view.max_batch", 5000)
+        self.drain_scheduled = False
+        
+        # Compact storage for live session messages
+        self.live_store = DLTMessageArena(
+            segment_size=get_setting(config, "live_view.segment_size_mb", 4) * 1024 * 1024,
+            memory_cap=get_setting(config, "live_view.memory_cap_mb", 256) * 1024 * 1024
+        )
+        
         # Create the main tkinter root window
         self.root = tk.Tk()
         self.root.title("Python DLT Viewer")
@@ -58,8 +101,15 @@ class DLTViewerApp:
     
     def exit(self):
         """Exit the application"""
-        if self.connection and self.connection.is_connected:
+        self._stop_merge()
+        self._cancel_connect()
+        self._stop_lifecycle()
+        self._stop_governor()
+        self._stop_triggers()
+        if self.connection:
             self.connection.disconnect()
+        self.live_store.close()
+        self.main_window.message_list.filter_parallel.close()
             
         # Save window size and position
         self.config["window"] = {
@@ -87,48 +137,349 @@ class DLTViewerApp:
             self.connection.clear_log()
             
         # Clear message list
+        self.live_queue.clear()
+        self.live_store.clear()
         if self.current_file:
             self.current_file.messages.clear()
-            self.main_window.message_list.clear()
-            self.main_window.update_status("Log cleared")
+        self.main_window.message_list.clear()
+        self.main_window.update_status("Log cleared")
     
     def _on_message_received(self, message):
-        """Handle received DLT message"""
-        # Add to message list
-        if hasattr(self, 'main_window'):
-            self.main_window.message_list.add_message(message)
+        """Handle received DLT message (called on the receive thread)"""
+        # Tk is not thread-safe: only hand the message over, the UI
+        # thread picks it up in _drain_live_queue
+        self.live_queue.put(message)
+    
+    def _schedule_drain(self):
+        """Schedule the next live queue drain on the UI thread"""
+        if not self.drain_scheduled:
+            self.drain_scheduled = True
+            self.root.after(self.frame_interval_ms, self._drain_live_queue)
+    
+    def _drain_live_queue(self):
+        """Apply pending live messages to the UI in one batch per frame"""
+        self.drain_scheduled = False
+        
+        batch = self.live_queue.drain(self.max_batch)
+        if batch:
+            self.main_window.add_live_messages(batch)
+        stats = self.live_queue.get_stats()
+        connections = self.merge_connections or ([self.connection] if self.connection else [])
+        for connection in connections:
+            # Messages shed by the ingest pipeline or the bus count as dropped too
+            stats["dropped"] += connection.get_pipeline_stats()["frames_dropped"]
+            for subscriber in connection.get_subscriber_stats():
+                if subscriber["name"] == "live view" or subscriber["name"].startswith("merge "):
+                    stats["dropped"] += subscriber["dropped"] + subscriber["stalls"]
+        if self.merger:
+            stats["late"] = self.merger.get_stats()["late"]
+            for event in self.merger.pop_late_events():
+                self.logger.warning(
+                    f"Late message from {event['stream']} after merged position "
+                    f"{event['position']} ({event['lateness']:.3f} s behind)"
+                )
+        self.main_window.update_live_status(stats)
+        
+        # Show log storm governor actions as markers
+        if self.governor:
+            self.governor.tick()
+            for event in self.governor.pop_new_events():
+                self._add_governor_marker(event)
+        
+        # Show written trigger snapshots as markers
+        if self.triggers:
+            self.triggers.tick()
+            for snapshot in self.triggers.pop_new_snapshots():
+                description = (f"Trigger {snapshot.trigger.name}: {snapshot.count} messages "
+                               f"saved to {snapshot.path}")
+                self.main_window.markers_view.add_marker(snapshot.message, description)
+                self.logger.info(description)
+        
+        # Keep draining while connected (or reconnecting) or while a backlog remains
+        if ((self.connection and (self.connection.is_connected or self.lifecycle))
+                or self.merger or len(self.live_queue)):
+            self._schedule_drain()
     
     def connect_to_device(self):
         """Open connection dialog and connect to DLT device"""
-        result = ConnectionDialog.show_dialog(self.root)
+        result = ConnectionDialog.show_dialog(self.root, self.config)
         if not result:
             return
             
-        host, port = result
+        host, port, protocol = result
         
-        # Disconnect existing connection if any
-        if self.connection and self.connection.is_connected:
+        # Disconnect existing connection (or abandon a pending attempt)
+        self._stop_merge()
+        self._cancel_connect()
+        self._stop_lifecycle()
+        self._stop_governor()
+        self._stop_triggers()
+        if self.connection:
             self.connection.disconnect()
         
         # Create new connection
-        self.connection = DLTConnection(host, port)
+        hosts = [h.strip() for h in host.split(",") if h.strip()]
+        if protocol == "UDP":
+            self.connection = self._create_udp_connection(hosts[0], port)
+        else:
+            self.connection = DLTConnection(hosts[0], port)
+            self.connection.addresses = [(h, port) for h in hosts[1:]]
+            self.connection.connect_timeout = get_setting(
+                self.config, "connection.connect_timeout", DLTConnection.CONNECT_TIMEOUT
+            )
+            self.connection.attempt_delay = get_setting(
+                self.config, "connection.attempt_delay", DLTConnection.ATTEMPT_DELAY
+            )
+        
+        # Decoder pool size and backpressure limit of the ingest pipeline
+        pipeline = self.connection.pipeline
+        pipeline.workers = get_setting(self.config, "ingest.decode_workers", pipeline.workers)
+        pipeline.max_pending_batches = get_setting(
+            self.config, "ingest.max_pending_batches", pipeline.max_pending_batches
+        )
+        
+        # Register the callback before the receive thread starts. The live
+        # view may drop old messages when it falls behind; recording is
+        # unaffected.
+        self.connection.add_callback(
+            self._on_message_received, policy=POLICY_DROP_OLDEST,
+            maxsize=self.live_queue.maxsize, name="live view"
+        )
+        self.live_queue.reset_stats()
         
-        # Try to connect
-        if self.connection.connect():
-            self.main_window.update_status(f"Connected to {host}:{port}")
+        # Connect in the background; the UI polls for the outcome
+        connection = self.connection
+        self.connect_result = None
+        self.connect_started = time.time()
+        
+        def attempt():
+            connected = connection.connect()
+            self.connect_result = (connection, connected)
+            if connected and connection is not self.connection:
+                connection.disconnect()  # Cancelled while connecting
+            
+        self.connect_thread = threading.Thread(target=attempt)
+        self.connect_thread.daemon = True
+        self.connect_thread.start()
+        self._poll_connect(connection, ", ".join(hosts), port, protocol)
+    
+    def _poll_connect(self, connection, host, port, protocol):
+        """Show connect progress until the background attempt finishes"""
+        if connection is not self.connection:
+            return  # Superseded by another connect or cancelled
             
-            # Set up message callback
-            self.connection.add_callback(self._on_message_received)
+        if self.connect_result is None or self.connect_result[0] is not connection:
+            elapsed = time.time() - self.connect_started
+            detail = connection.connect_status
+            self.main_window.show_progress(
+                f"Connecting to {host}:{port} ({elapsed:.1f} s) {detail}".strip(),
+                self._cancel_connect
+            )
+            self.root.after(100, lambda: self._poll_connect(connection, host, port, protocol))
+            return
+            
+        _, connected = self.connect_result
+        self.connect_thread = None
+        self.main_window.hide_progress()
+        
+        if connected:
+            self._on_connected(protocol)
+        elif isinstance(connection.last_error, ConnectionAbortedError):
+            self.main_window.update_status("Connection cancelled")
         else:
-            messagebox.showerror("Connection Failed", 
-                               f"Could not connect to {host}:{port}")
+            self.main_window.update_status("Connection failed")
+            messagebox.showerror("Connection Failed",
+                               f"Could not connect to {host}:{port} ({protocol})\n\n"
+                               f"{connection.last_error}")
+    
+    def _on_connected(self, protocol):
+        """Start live view, reconnects and the governor after connecting"""
+        address = self.connection.connected_address or f"{self.connection.host}:{self.connection.port}"
+        self.main_window.update_status(f"Connected to {address}")
+        
+        # Live messages are kept in the arena, not as message objects
+        self.live_store.clear()
+        self.main_window.message_list.load_messages(self.live_store)
+        self.main_window.stats_view.reset()
+        self._schedule_drain()
+        
+        # Reconnect automatically, continuing the same recording
+        self.lifecycle = DLTLifecycleManager(self.connection)
+        self.lifecycle.start()
+        
+        if protocol == "TCP" and get_setting(self.config, "governor.enabled", False):
+            self._start_governor()
+        if get_setting(self.config, "triggers.enabled", False):
+            self._start_triggers()
+    
+    def connect_all_ecus(self):
+        """Connect to every configured ECU and merge their messages by time"""
+        ecus = [ecu for ecu in ECUManager().ecus.values() if ecu.ip_address]
+        if not ecus:
+            messagebox.showinfo("No ECUs", "No ECU with an IP address is configured.")
+            return
+            
+        self.disconnect_from_device()
+        
+        # Messages wait in a bounded reorder buffer until every ECU has
+        # caught up, so the view shows them in time order
+        self.merger = DLTStreamMerger(
+            window=get_setting(self.config, "merge.window", 0.2),
+            max_buffered=get_setting(self.config, "merge.max_buffered", 10000),
+            max_delay=get_setting(self.config, "merge.max_delay", 0.5),
+            idle_timeout=get_setting(self.config, "merge.idle_timeout", 1.0)
+        )
+        self.merger.add_output(self._on_merged_messages)
+        
+        for ecu in ecus:
+            connection = DLTConnection(ecu.ip_address, ecu.tcp_port)
+            connection.connect_timeout = get_setting(
+                self.config, "connection.connect_timeout", DLTConnection.CONNECT_TIMEOUT
+            )
+            self.merger.attach(connection, ecu.ecu_id)
+            self.merge_connections.append(connection)
+            
+            # A failed connection only goes idle and stops holding back the others
+            thread = threading.Thread(target=connection.connect)
+            thread.daemon = True
+            thread.start()
+        
+        self.merger.start()
+        self.live_queue.reset_stats()
+        self.live_store.clear()
+        self.main_window.message_list.load_messages(self.live_store)
+        self.main_window.stats_view.reset()
+        self._schedule_drain()
+        self.main_window.update_status(
+            f"Merging {len(ecus)} ECUs: " + ", ".join(ecu.ecu_id for ecu in ecus)
+        )
+    
+    def _on_merged_messages(self, messages):
+        """Handle a batch of time-ordered messages from the merger"""
+        for message in messages:
+            self.live_queue.put(message)
+    
+    def _stop_merge(self):
+        """Disconnect all merged ECU connections"""
+        if not self.merger:
+            return
+        merger, self.merger = self.merger, None
+        for connection in self.merge_connections:
+            connection.cancel_connect()
+            connection.disconnect()
+        merger.detach_all()
+        merger.stop()
+        self.merge_connections = []
+    
+    def _cancel_connect(self):
+        """Abandon a connect attempt that is still running"""
+        if self.connect_thread is None:
+            return
+        connection = self.connection
+        self.connection = None
+        self.connect_thread = None
+        self.main_window.hide_progress()
+        if connection:
+            connection.cancel_connect()
+            # An attempt that completed just before the cancel is closed here,
+            # later ones by the connect thread itself
+            if self.connect_result == (connection, True):
+                connection.disconnect()
+        self.main_window.update_status("Connection cancelled")
+    
+    def _create_udp_connection(self, host, port):
+        """Create a UDP connection, joining the group if host is multicast"""
+        try:
+            if ipaddress.ip_address(host).is_multicast:
+                return DLTUDPConnection(port=port, multicast_group=host)
+        except ValueError:
+            pass  # Host name rather than an address
+        return DLTUDPConnection(host, port)
     
     def disconnect_from_device(self):
         """Disconnect from DLT device"""
-        if self.connection and self.connection.is_connected:
+        if self.merger:
+            self._stop_merge()
+            self.main_window.update_status("Disconnected from all ECUs")
+        self._cancel_connect()
+        self._stop_lifecycle()
+        self._stop_governor()
+        self._stop_triggers()
+        if self.connection:
             self.connection.disconnect()
             self.main_window.update_status("Disconnected from device")
     
+    def _start_governor(self):
+        """Start automatic log storm throttling on the current connection"""
+        self.control_client = DLTControlClient(self.connection)
+        self.governor = DLTLogStormGovernor(
+            self.control_client,
+            threshold=get_setting(self.config, "governor.threshold", 2000),
+            window=get_setting(self.config, "governor.window", 1.0),
+            cooldown=get_setting(self.config, "governor.cooldown", 30),
+            throttle_level=DLTMessage.LOG_LEVEL_CODES.get(
+                get_setting(self.config, "governor.throttle_level", "WARN"),
+                DLTMessage.LOG_WARN
+            )
+        )
+        self.connection.add_callback(
+            self.governor.on_message, policy=POLICY_DROP_OLDEST, name="governor"
+        )
+    
+    def _stop_governor(self):
+        """Stop log storm throttling"""
+        if self.governor:
+            self.connection.remove_callback(self.governor.on_message)
+            self.governor = None
+        if self.control_client:
+            self.control_client.close()
+            self.control_client = None
+    
+    def _start_triggers(self):
+        """Snapshot the live stream around configured trigger events"""
+        try:
+            rules = [DLTTrigger.from_dict(rule)
+                     for rule in get_setting(self.config, "triggers.rules", [])]
+            self.triggers = DLTTriggerEngine(
+                rules,
+                os.path.expanduser(get_setting(self.config, "triggers.output_dir", "~/dlt_snapshots")),
+                pre_seconds=get_setting(self.config, "triggers.pre_seconds", 10),
+                post_seconds=get_setting(self.config, "triggers.post_seconds", 5),
+                bookmarks=DLTBookmarkManager()
+            )
+        except (KeyError, ValueError, re.error) as e:
+            self.logger.error(f"Invalid trigger rules: {e}")
+            return
+        # The ring must see every message to give complete snapshots
+        self.connection.add_callback(
+            self.triggers.on_message, policy=POLICY_BLOCK, name="triggers"
+        )
+    
+    def _stop_triggers(self):
+        """Stop trigger snapshots, writing a capture still in progress"""
+        if self.triggers:
+            if self.connection:
+                self.connection.remove_callback(self.triggers.on_message)
+            self.triggers.close()
+            self.triggers = None
+    
+    def _add_governor_marker(self, event):
+        """Record a governor action in the markers view"""
+        message = event.message
+        if message is None:
+            message = DLTMessage()
+            message.timestamp = event.timestamp
+            message.app_id = event.app_id
+            message.ctx_id = event.ctx_id
+        self.main_window.markers_view.add_marker(message, event.description)
+        self.logger.info(event.description)
+    
+    def _stop_lifecycle(self):
+        """Stop automatic reconnection for the current connection"""
+        if self.lifecycle:
+            self.lifecycle.stop()
+            self.lifecycle = None
+    
     def _setup_menu(self):
         """Set up the application menu"""
         menubar = tk.Menu(self.root)
@@ -153,6 +504,7 @@ class DLTViewerApp:
         # Connection menu
         conn_menu = tk.Menu(menubar, tearoff=0)
         conn_menu.add_command(label="Connect...", command=self.connect_to_device)
+        conn_menu.add_command(label="Connect All ECUs", command=self.connect_all_ecus)
         conn_menu.add_command(label="Disconnect", command=self.disconnect_from_device)
         conn_menu.add_separator()
         conn_menu.add_command(label="Clear Log", command=self.clear_log)
@@ -160,6 +512,8 @@ class DLTViewerApp:
         
         # View menu
         view_menu = tk.Menu(menubar, tearoff=0)
+        view_menu.add_command(label="Go to Time...", accelerator="Ctrl+G",
+                            command=self.go_to_time)
         view_menu.add_command(label="Toggle Theme", command=self.toggle_theme)
         menubar.add_cascade(label="View", menu=view_menu)
         
@@ -174,8 +528,17 @@ class DLTViewerApp:
         """Register keyboard shortcuts and events"""
         self.root.bind("<Control-o>", lambda e: self.open_file())
         self.root.bind("<Control-s>", lambda e: self.save_log())
+        self.root.bind("<Control-g>", lambda e: self.go_to_time())
         self.root.protocol("WM_DELETE_WINDOW", self.exit)
         
+    def go_to_time(self):
+        """Jump to the first message at or after a time of day"""
+        text = simpledialog.askstring("Go to Time", "Time (HH:MM:SS.mmm):", parent=self.root)
+        if not text:
+            return
+        if not self.main_window.message_list.goto_time(text):
+            self.main_window.update_status(f"No message at or after {text}")
+    
     def _update_recent_files(self, file_path):
         """Update the list of recently opened files"""
         recent_files = self.config.get("recent_files", [])
@@ -3,18 +3,22 @@ Connection Dialog - UI for TCP/IP connection settings
 """
 import tkinter as tk
 from tkinter import ttk, messagebox
-import socket
 import threading
 import queue
 
+from core.dlt_discovery import DLTNetworkScanner
+from utils.config import get_setting, update_setting
+
 class ConnectionDialog:
     """Dialog for configuring DLT network connection"""
     
-    def __init__(self, parent):
+    def __init__(self, parent, config=None):
         """Initialize the connection dialog"""
         self.parent = parent
+        self.config = config if config is not None else {}
         self.result = None
         self.scan_thread = None
+        self.scanner = None
         self.devices = queue.Queue()
         
         # Create dialog window
@@ -25,7 +29,7 @@ class ConnectionDialog:
         
         # Center dialog
         window_width = 400
-        window_height = 300
+        window_height = 380
         screen_width = parent.winfo_screenwidth()
         screen_height = parent.winfo_screenheight()
         x = (screen_width - window_width) // 2
@@ -65,6 +69,17 @@ class ConnectionDialog:
         self.device_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
+        # Networks to scan (comma separated CIDRs)
+        scan_frame = ttk.Frame(main_frame)
+        scan_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(scan_frame, text="Networks:").pack(side=tk.LEFT)
+        networks = get_setting(self.config, "discovery.networks", ["192.168.1.0/24"])
+        self.networks_var = tk.StringVar(value=", ".join(networks))
+        ttk.Entry(scan_frame, textvariable=self.networks_var).pack(
+            side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 0)
+        )
+        
         # Manual connection frame
         manual_frame = ttk.LabelFrame(main_frame, text="Manual Connection")
         manual_frame.pack(fill=tk.X, pady=(0, 10))
@@ -73,7 +88,8 @@ class ConnectionDialog:
         host_frame = ttk.Frame(manual_frame)
         host_frame.pack(fill=tk.X, pady=5, padx=5)
         
-        ttk.Label(host_frame, text="Host:").pack(side=tk.LEFT)
+        # Several comma-separated hosts are tried in parallel
+        ttk.Label(host_frame, text="Host(s):").pack(side=tk.LEFT)
         self.host_var = tk.StringVar(value="localhost")
         self.host_entry = ttk.Entry(host_frame, textvariable=self.host_var)
         self.host_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 0))
@@ -87,6 +103,21 @@ class ConnectionDialog:
         self.port_entry = ttk.Entry(port_frame, textvariable=self.port_var)
         self.port_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 0))
         
+        # Protocol selection (UDP host may be a multicast group)
+        protocol_frame = ttk.Frame(manual_frame)
+        protocol_frame.pack(fill=tk.X, pady=5, padx=5)
+        
+        ttk.Label(protocol_frame, text="Protocol:").pack(side=tk.LEFT)
+        self.protocol_var = tk.StringVar(value="TCP")
+        self.protocol_combo = ttk.Combobox(
+            protocol_frame,
+            textvariable=self.protocol_var,
+            values=("TCP", "UDP"),
+            state="readonly",
+            width=8
+        )
+        self.protocol_combo.pack(side=tk.LEFT, padx=(5, 0))
+        
         # Button frame
         button_frame = ttk.Frame(main_frame)
         button_frame.pack(fill=tk.X, pady=(0, 5))
@@ -122,6 +153,8 @@ class ConnectionDialog:
         self.dialog.bind("<Return>", lambda e: self._on_connect())
         self.dialog.bind("<Escape>", lambda e: self._on_cancel())
         
+        self.dialog.bind("<Destroy>", self._stop_scan)
+        
         # Double-click to connect
         self.device_tree.bind("<Double-1>", lambda e: self._on_connect())
         self.device_tree.bind("<<TreeviewSelect>>", self._on_device_select)
@@ -131,6 +164,19 @@ class ConnectionDialog:
     
     def _start_scan(self):
         """Start network scan"""
+        try:
+            networks = [n.strip() for n in self.networks_var.get().split(",") if n.strip()]
+            self.scanner = DLTNetworkScanner(
+                networks=networks,
+                ports=get_setting(self.config, "discovery.ports", [3490, 3491]),
+                concurrency=get_setting(self.config, "discovery.concurrency", 256),
+                timeout=get_setting(self.config, "discovery.timeout", 0.3)
+            )
+        except ValueError as e:
+            messagebox.showerror("Invalid Network", str(e), parent=self.dialog)
+            return
+        update_setting(self.config, "discovery.networks", networks)
+        
         # Clear existing items
         for item in self.device_tree.get_children():
             self.device_tree.delete(item)
@@ -139,54 +185,35 @@ class ConnectionDialog:
         self.status_var.set("Scanning network...")
         
         # Start scan in background thread
-        self.scan_thread = threading.Thread(target=self._scan_network)
+        self.scan_thread = threading.Thread(target=self._scan_network, args=(self.scanner,))
         self.scan_thread.daemon = True
         self.scan_thread.start()
         
         # Start checking for results
         self.dialog.after(100, self._check_scan_results)
     
-    def _scan_network(self):
+    def _scan_network(self, scanner):
         """Scan network for DLT devices"""
         try:
-            # Scan local network
-            for port in [3490, 3491]:  # Common DLT ports
-                # Try localhost first
-                self._check_host("localhost", port)
-                
-                # Try common IP patterns
-                for i in range(1, 255):
-                    host = f"192.168.1.{i}"
-                    self._check_host(host, port)
+            scanner.scan(lambda host, port: self.devices.put((host, port, "Available")))
         except Exception as e:
             print(f"Scan error: {e}")
         finally:
             # Signal scan complete
             self.devices.put(None)
     
-    def _check_host(self, host, port):
-        """Check if host:port has a DLT service"""
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(0.1)  # Short timeout for quick scanning
-            result = sock.connect_ex((host, port))
-            sock.close()
-            
-            if result == 0:
-                # Connection successful, likely a DLT service
-                self.devices.put((host, port, "Available"))
-        except:
-            pass
-    
     def _check_scan_results(self):
         """Check for scan results and update UI"""
+        if not self.dialog.winfo_exists():
+            return
+            
         try:
             while True:
                 device = self.devices.get_nowait()
                 if device is None:
                     # Scan complete
                     self.scan_button.configure(state=tk.NORMAL)
-                    self.status_var.set("Scan complete")
+                    self.status_var.set(f"Scan complete ({self.scanner.found} found)")
                     return
                     
                 # Add device to tree
@@ -198,6 +225,9 @@ class ConnectionDialog:
                 )
         except queue.Empty:
             # No more results yet, check again later
+            self.status_var.set(
+                f"Scanning network... {self.scanner.probed}/{self.scanner.total}"
+            )
             self.dialog.after(100, self._check_scan_results)
     
     def _on_device_select(self, event):
@@ -221,7 +251,7 @@ class ConnectionDialog:
             if port < 1 or port > 65535:
                 raise ValueError("Port must be between 1 and 65535")
                 
-            return host, port
+            return host, port, self.protocol_var.get()
         except ValueError as e:
             messagebox.showerror("Invalid Input", str(e))
             return None
@@ -237,9 +267,14 @@ class ConnectionDialog:
         """Handle cancel button"""
         self.dialog.destroy()
     
+    def _stop_scan(self, event=None):
+        """Cancel a running scan when the dialog goes away"""
+        if self.scanner and event is not None and event.widget is self.dialog:
+            self.scanner.cancel()
+    
     @classmethod
-    def show_dialog(cls, parent):
+    def show_dialog(cls, parent, config=None):
         """Show the connection dialog"""
-        dialog = cls(parent)
+        dialog = cls(parent, config)
         dialog.dialog.wait_window()
         return dialog.result
\ No newline at end of file
@@ -2,8 +2,10 @@
 Filter Panel Component
 """
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, messagebox
 import time
+from core.dlt_query import DLTQuery, DLTQueryError
+from utils.config import get_setting
 
 class FilterPanel(ttk.Frame):
     """Panel for filtering DLT messages"""
@@ -15,6 +17,7 @@ class FilterPanel(ttk.Frame):
         self.parent = parent
         self.main_window = main_window
         self.current_filter = {}
+        self._apply_job = None
         
         # Main container
         self.main_frame = ttk.Frame(self)  # Use self instead of parent
@@ -98,6 +101,26 @@ class FilterPanel(ttk.Frame):
         self.payload_entry = ttk.Entry(self.payload_frame, textvariable=self.payload_var)
         self.payload_entry.pack(fill=tk.X, pady=5, padx=5)
         
+        # Query filter in advanced tab
+        self.query_frame = ttk.LabelFrame(self.advanced_frame, text="Query")
+        self.query_frame.pack(fill=tk.X, pady=5, padx=5)
+        
+        self.query_var = tk.StringVar()
+        self.query_entry = ttk.Entry(self.query_frame, textvariable=self.query_var)
+        self.query_entry.pack(fill=tk.X, pady=5, padx=5)
+        
+        self.query_error_var = tk.StringVar()
+        self.query_error_label = ttk.Label(self.query_frame, textvariable=self.query_error_var,
+                                           foreground="red")
+        self.query_error_label.pack(fill=tk.X, padx=5)
+        
+        self.explain_button = ttk.Button(
+            self.query_frame,
+            text="Explain",
+            command=self._explain_query
+        )
+        self.explain_button.pack(anchor=tk.W, pady=5, padx=5)
+        
         # Filter control buttons at the bottom
         self.button_frame = ttk.Frame(self.main_frame)
         self.button_frame.pack(fill=tk.X, pady=10)
@@ -120,6 +143,7 @@ class FilterPanel(ttk.Frame):
         self.payload_var.trace_add("write", lambda *args: self._auto_apply_filters())
         self.time_start_var.trace_add("write", lambda *args: self._auto_apply_filters())
         self.time_end_var.trace_add("write", lambda *args: self._auto_apply_filters())
+        self.query_var.trace_add("write", lambda *args: self._auto_apply_filters())
     
     def update_filters(self, dlt_file):
         """Update available filters based on the DLT file"""
@@ -213,6 +237,7 @@ class FilterPanel(ttk.Frame):
     
     def _apply_filters(self):
         """Apply the current filter settings"""
+        self._cancel_pending_apply()
         self.current_filter = self._build_filter_config()
         self.main_window.apply_filter(self.current_filter)
     
@@ -235,19 +260,30 @@ class FilterPanel(ttk.Frame):
         self.time_start_var.set("")
         self.time_end_var.set("")
         self.payload_var.set("")
+        self.query_var.set("")
         
         # Apply the reset
+        self._cancel_pending_apply()
         self.current_filter = {}
         self.main_window.apply_filter(self.current_filter)
     
     def _checkbox_change(self):
         """Handle checkbox changes"""
-        self._auto_apply_filters()
+        # Filtering runs in the background, so a click applies at once
+        self._apply_filters()
     
     def _auto_apply_filters(self):
-        """Automatically apply filters after delay"""
-        # This could be enhanced with a delay timer to avoid too frequent updates
-        self._apply_filters()
+        """Apply filters once typing in the text fields pauses"""
+        self._cancel_pending_apply()
+        app = getattr(self.main_window, "app", None)
+        delay = get_setting(app.config if app is not None else {}, "search.debounce_ms", 250)
+        self._apply_job = self.after(delay, self._apply_filters)
+    
+    def _cancel_pending_apply(self):
+        """Cancel a scheduled debounced apply"""
+        if self._apply_job is not None:
+            self.after_cancel(self._apply_job)
+            self._apply_job = None
     
     def _build_filter_config(self):
         """Build filter configuration from UI controls"""
@@ -296,8 +332,30 @@ class FilterPanel(ttk.Frame):
         if payload_text:
             filter_config["payload_text"] = payload_text
         
+        # Query (an invalid query is reported and left out)
+        query = self.query_var.get().strip()
+        self.query_error_var.set("")
+        if query:
+            try:
+                DLTQuery(query)
+                filter_config["query"] = query
+            except DLTQueryError as e:
+                self.query_error_var.set(str(e))
+        
         return filter_config
     
+    def _explain_query(self):
+        """Show the plan of the query over the loaded messages"""
+        query = self.query_var.get().strip()
+        if not query:
+            return
+        try:
+            plan = DLTQuery(query).explain(self.main_window.message_list.columns)
+        except DLTQueryError as e:
+            self.query_error_var.set(str(e))
+            return
+        messagebox.showinfo("Query Plan", plan)
+    
     def _parse_time(self, time_str):
         """Parse time string to timestamp"""
         # This is a simplified version - could be enhanced to handle various formats
@@ -50,6 +50,13 @@ class MainWindow:
         self.message_count_label = ttk.Label(self.status_bar, text="")
         self.message_count_label.pack(side=tk.RIGHT)
         
+        # Live ingest indicator (pending/dropped messages)
+        self.live_label = ttk.Label(self.status_bar, text="")
+        self.live_label.pack(side=tk.RIGHT, padx=10)
+        
+        # Cancel button for background operations (shown while running)
+        self.cancel_button = ttk.Button(self.status_bar, text="Cancel")
+        
     def _init_main_view(self):
         """Initialize the main message view"""
         # Create the main layout using PanedWindow
@@ -91,23 +98,59 @@ class MainWindow:
     def update_file_view(self, dlt_file):
         """Update the UI with the loaded file data"""
         # Update the message list
-        self.message_list.load_messages(dlt_file.messages)
+        self.message_list.load_messages(dlt_file.messages, dlt_file)
+        self.message_list.build_search_index(dlt_file.file_path)
         
         # Update filter panel
         self.filter_panel.update_filters(dlt_file)
         
         # Update statistics
-        for message in dlt_file.messages:
-            self.stats_view.update_stats(message)
+        self.stats_view.reset()
+        self.stats_view.update_stats_batch(dlt_file.messages)
         
         # Update status bar
         self.update_status(f"Loaded {len(dlt_file.messages)} messages")
         self.update_message_count(len(dlt_file.messages))
         
+    def apply_filter(self, filter_config):
+        """Apply the filter panel configuration to the message list"""
+        self.message_list.apply_filter(filter_config)
+        
+    def add_live_messages(self, messages):
+        """Append a batch of live messages to the views"""
+        self.message_list.add_messages(messages)
+        self.stats_view.update_stats_batch(messages)
+        self.update_message_count(
+            len(self.message_list.messages),
+            self.message_list.get_visible_count()
+        )
+        
+    def update_live_status(self, stats):
+        """Update the live ingest indicator from live queue statistics"""
+        text = ""
+        if stats["dropped"]:
+            text = f"Dropped: {stats['dropped']}"
+        if stats.get("late"):
+            text = f"{text} Late: {stats['late']}".strip()
+        if stats["lagging"]:
+            text = f"Lagging ({stats['pending']} pending) {text}".strip()
+        self.live_label.config(text=text)
+        
     def update_status(self, message):
         """Update the status bar message"""
         self.status_label.config(text=message)
         
+    def show_progress(self, message, on_cancel):
+        """Show a background operation in the status bar with a Cancel button"""
+        self.status_label.config(text=message)
+        self.cancel_button.config(command=on_cancel)
+        if not self.cancel_button.winfo_ismapped():
+            self.cancel_button.pack(side=tk.LEFT, padx=10)
+            
+    def hide_progress(self):
+        """Remove the Cancel button of a finished background operation"""
+        self.cancel_button.pack_forget()
+        
     def update_message_count(self, count, filtered=None):
         """Update the message count display"""
         if filtered is not None and filtered != count:
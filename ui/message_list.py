@@ -4,6 +4,17 @@ Message List View Component
 import tkinter as tk
 from tkinter import ttk
 import time
+import threading
+from bisect import bisect_left
+from core.dlt_columns import DLTMessageColumns
+from core.dlt_filter_engine import FilterSpec, compile_filter
+from core.dlt_filter_cache import DLTFilterCache
+from core.dlt_filter_worker import DLTFilterWorker
+from core.dlt_parallel import DLTFileSource, DLTParallelFilter
+from core.dlt_query import parse_time, reference_time
+from core.dlt_trigram import DLTTrigramIndex
+from utils.config import get_setting
+from utils.logger import get_logger
 
 class MessageListView(ttk.Frame):
     """
@@ -11,6 +22,16 @@ class MessageListView(ttk.Frame):
     with virtual scrolling for performance
     """
     
+    # Message field sorted by each sortable column
+    SORT_FIELDS = {
+        "time": "timestamp",
+        "ecu": "ecu_id",
+        "app": "app_id",
+        "ctx": "ctx_id",
+        "level": "log_level",
+        "payload": "payload"
+    }
+    
     def __init__(self, parent, main_window):
         """Initialize the message list view"""
         super().__init__(parent)  # Initialize parent class
@@ -18,8 +39,28 @@ class MessageListView(ttk.Frame):
         self.parent = parent
         self.main_window = main_window
         self.messages = []
+        self.columns = DLTMessageColumns()
         self.filtered_indices = []
+        self.filter_spec = FilterSpec()
+        # Large loaded files are searched in a process pool (0 workers: one per CPU)
+        self.filter_parallel = DLTParallelFilter(
+            self._setting("search.parallel_workers", 0) or None,
+            self._setting("search.shard_size", DLTParallelFilter.SHARD_SIZE),
+            self._setting("search.parallel_min_messages", 1000000)
+        )
+        self.filter_cache = DLTFilterCache(
+            self._setting("search.cache_mb", 64) * 1024 * 1024, self.filter_parallel
+        )
+        self.filter_worker = DLTFilterWorker(
+            self.filter_cache, self._setting("search.chunk_size", DLTFilterWorker.CHUNK_SIZE)
+        )
         self.virtual_event_callbacks = []
+        self._search_index_cancel = None
+        self._search_job = None
+        self._query_generation = 0
+        self._query_count = 0
+        self._query_pending = False
+        self._streamed_generation = None
         
         # Create toolbar
         self.toolbar = ttk.Frame(self)
@@ -114,68 +155,172 @@ class MessageListView(ttk.Frame):
         """Bind to message selection events"""
         self.virtual_event_callbacks.append(callback)
     
-    def load_messages(self, messages):
-        """Load messages into the view"""
+    def load_messages(self, messages, dlt_file=None):
+        """Load messages into the view
+        
+        Args:
+            messages: Messages to show
+            dlt_file: DLTFile the messages were loaded from, if any
+        """
+        self._cancel_search_index()
+        self._cancel_query()
         self.messages = messages
-        self.filtered_indices = list(range(len(messages)))
+        self.columns = DLTMessageColumns.from_messages(messages)
+        if dlt_file is not None:
+            self.columns.source = DLTFileSource.from_file(dlt_file)
+        # Build the bitmap index now rather than on the first filter toggle
+        self.columns.bitmaps()
+        self.filter_cache.clear()
+        self.filtered_indices = []
         self._populate_tree()
+        self._refresh()
     
-    def apply_filter(self, filter_config):
-        """Apply filters to the message view"""
-        if not self.messages:
+    def add_messages(self, messages):
+        """Append a batch of live messages and show the ones passing the filters"""
+        if not messages:
+            return
+            
+        start = len(self.messages)
+        self.messages.extend(messages)
+        if len(self.messages) - start != len(messages):
+            # Store skipped some messages, so batch positions do not map to indices
+            messages = [self.messages[idx] for idx in range(start, len(self.messages))]
+        self.columns.extend(messages)
+        if self._query_pending:
+            # The query in flight shows these once it completes
+            return
+        
+        # Filter and render from the already decoded batch instead of
+        # reading every message back from the store
+        matches = compile_filter(self.filter_spec).matches
+        reference = reference_time(self.columns)
+        search_text = self.search_var.get().lower()
+        new_rows = []
+        for idx, msg in enumerate(messages, start):
+            if not matches(msg, reference):
+                continue
+            if search_text and not self._message_matches_search(msg, search_text):
+                continue
+            new_rows.append((idx, msg))
+        
+        if not new_rows:
             return
             
-        # Reset to show all messages
-        if not filter_config:
-            self.filtered_indices = list(range(len(self.messages)))
+        self.filtered_indices.extend(idx for idx, _ in new_rows)
+        
+        if self.sort_column != "index" or self.sort_reverse:
+            # New rows can land anywhere in a sorted view
             self._populate_tree()
             return
             
-        # Apply filters
+        # Only follow the tail if the user is already looking at it
+        follow_tail = self.tree.yview()[1] >= 1.0
+        for idx, msg in new_rows:
+            self._insert_row(idx, msg)
+        if follow_tail:
+            children = self.tree.get_children()
+            if children:
+                self.tree.see(children[-1])
+    
+    def clear(self):
+        """Remove all messages from the view"""
+        self._cancel_search_index()
+        self._cancel_query()
+        self.messages.clear()
+        self.columns = DLTMessageColumns()
+        self.filter_cache.clear()
         self.filtered_indices = []
-        
-        for i, msg in enumerate(self.messages):
-            # Check if message passes all filters
-            if self._message_matches_filter(msg, filter_config):
-                self.filtered_indices.append(i)
-        
-        # Re-populate the tree with filtered messages
         self._populate_tree()
     
-    def _message_matches_filter(self, msg, filter_config):
-        """Check if a message matches the filter criteria"""
-        # ECU ID filter
-        if filter_config.get("ecu") and msg.ecu_id not in filter_config["ecu"]:
-            return False
-            
-        # Application ID filter
-        if filter_config.get("app_id") and msg.app_id not in filter_config["app_id"]:
-            return False
-            
-        # Context ID filter
-        if filter_config.get("ctx_id") and msg.ctx_id not in filter_config["ctx_id"]:
-            return False
-            
-        # Log level filter
-        if filter_config.get("log_level"):
-            log_levels = filter_config["log_level"]
-            if msg.log_level not in log_levels:
-                return False
-        
-        # Time range filter
-        if filter_config.get("time_start") and msg.timestamp < filter_config["time_start"]:
-            return False
-            
-        if filter_config.get("time_end") and msg.timestamp > filter_config["time_end"]:
-            return False
+    def apply_filter(self, filter_config):
+        """Apply filters to the message view"""
+        self.filter_spec = FilterSpec.from_config(filter_config)
+        if not self.messages:
+            return
+        self._refresh()
+    
+    def _setting(self, key, default):
+        """Get an application setting (default without an application)"""
+        app = getattr(self.main_window, "app", None)
+        return get_setting(app.config if app is not None else {}, key, default)
+    
+    def _refresh(self):
+        """Re-evaluate the filter and the toolbar search in the background
+        
+        Rows of the newest query stream in as they are found; a newer
+        query cancels the one in flight.
+        """
+        self._submit_query(stream=True)
+    
+    def _submit_query(self, stream):
+        """Start the current query on the worker
+        
+        Args:
+            stream: Show the matches chunk by chunk as they are found
             
-        # Payload content filter
-        if filter_config.get("payload_text"):
-            search_text = filter_config["payload_text"].lower()
-            if search_text not in msg.payload.lower():
-                return False
-                
-        return True
+        Returns:
+            Generation of the query
+        """
+        self._query_generation += 1
+        generation = self._query_generation
+        self._query_count = len(self.columns)
+        self._query_pending = True
+        on_partial = None
+        if stream:
+            on_partial = lambda positions: self.after(0, self._on_query_partial, generation, positions)
+        self.filter_worker.submit(
+            self.columns, self.filter_spec, self.search_var.get(), on_partial=on_partial,
+            on_done=lambda positions: self.after(0, self._on_query_done, generation, positions)
+        )
+        return generation
+    
+    def _cancel_query(self):
+        """Cancel the query in flight and ignore its pending results"""
+        self.filter_worker.cancel()
+        self._query_generation += 1
+        self._query_pending = False
+    
+    def _on_query_partial(self, generation, positions):
+        """Show a chunk of matches of the current query (Tk thread)"""
+        if generation != self._query_generation:
+            return
+        if self.sort_column != "index" or self.sort_reverse:
+            # A sorted view can only be shown once the result is complete
+            return
+        if self._streamed_generation != generation:
+            # First matches of a new query replace the old rows
+            self._streamed_generation = generation
+            self.filtered_indices = []
+            for item in self.tree.get_children():
+                self.tree.delete(item)
+        self.filtered_indices.extend(positions)
+        for idx in positions:
+            self._insert_row(idx)
+        self._update_count()
+    
+    def _on_query_done(self, generation, positions):
+        """Show the complete result of the current query (Tk thread)"""
+        if generation != self._query_generation:
+            return
+        self._query_pending = False
+        streamed = len(self.filtered_indices) if self._streamed_generation == generation else None
+        self.filtered_indices = positions
+        if streamed is None or self.sort_column != "index" or self.sort_reverse:
+            self._populate_tree()
+        else:
+            for idx in positions[streamed:]:
+                self._insert_row(idx)
+        self._update_count()
+        if len(self.columns) > self._query_count:
+            # Live messages arrived while the query ran: a follow-up query
+            # finds the rest cached and evaluates only them, adding their rows
+            self._streamed_generation = self._submit_query(stream=False)
+    
+    def _update_count(self):
+        """Show the total and visible message counts"""
+        update_message_count = getattr(self.main_window, "update_message_count", None)
+        if update_message_count is not None:
+            update_message_count(len(self.messages), self.get_visible_count())
     
     def _populate_tree(self):
         """Populate the tree with messages"""
@@ -183,41 +328,102 @@ class MessageListView(ttk.Frame):
         for item in self.tree.get_children():
             self.tree.delete(item)
         
-        # Sort messages if needed
-        if self.sort_column != "index" or self.sort_reverse:
-            self._apply_sort()
+        # Sort messages (a no-op pass for the default order)
+        self._apply_sort()
             
         # Add filtered messages to the tree
-        for i, idx in enumerate(self.filtered_indices):
+        for idx in self.filtered_indices:
+            self._insert_row(idx)
+    
+    def _insert_row(self, idx, msg=None):
+        """Append the message at the given index as a tree row
+        
+        Args:
+            idx: Index of the message in self.messages
+            msg: The message itself, if the caller already has it
+        """
+        if msg is None:
             msg = self.messages[idx]
+        
+        # Format timestamp
+        time_str = time.strftime("%H:%M:%S", time.localtime(msg.timestamp))
+        if hasattr(msg, 'timestamp_us') and msg.timestamp_us:
+            time_str += f".{msg.timestamp_us:06d}"
             
-            # Format timestamp
-            time_str = time.strftime("%H:%M:%S", time.localtime(msg.timestamp))
-            if hasattr(msg, 'timestamp_us') and msg.timestamp_us:
-                time_str += f".{msg.timestamp_us:06d}"
-                
-            # Format columns
-            values = (
-                idx,                # Original index
-                time_str,           # Formatted time
-                msg.ecu_id,         # ECU ID
-                msg.app_id,         # Application ID
-                msg.ctx_id,         # Context ID
-                msg.log_level,      # Log level
-                msg.payload[:100]   # First 100 chars of payload
-            )
-            
-            # Insert with appropriate tag for coloring
-            item_id = self.tree.insert("", "end", values=values, tags=(msg.log_level,))
-            
-            # Apply color based on log level
-            if msg.log_level in self.level_colors:
-                self.tree.tag_configure(msg.log_level, foreground=self.level_colors[msg.log_level])
+        # Format columns
+        values = (
+            idx,                # Original index
+            time_str,           # Formatted time
+            msg.ecu_id,         # ECU ID
+            msg.app_id,         # Application ID
+            msg.ctx_id,         # Context ID
+            msg.log_level,      # Log level
+            msg.payload[:100]   # First 100 chars of payload
+        )
+        
+        # Insert with appropriate tag for coloring
+        self.tree.insert("", "end", values=values, tags=(msg.log_level,))
+        
+        # Apply color based on log level
+        if msg.log_level in self.level_colors:
+            self.tree.tag_configure(msg.log_level, foreground=self.level_colors[msg.log_level])
     
     def get_visible_count(self):
         """Get the number of currently visible messages"""
         return len(self.filtered_indices)
     
+    def goto_time(self, text):
+        """Select the first visible message at or after a point in time
+        
+        Args:
+            text: HH:MM[:SS[.fff]] on the day of the first message, or
+                epoch seconds
+            
+        In a view sorted by another column, the row selected is where the
+        first message at or after that time falls in the view's order.
+            
+        Returns:
+            True if a message was selected
+        """
+        if not len(self.columns):
+            return False
+        try:
+            timestamp = parse_time(text, self.columns.timestamps[0])
+        except ValueError:
+            return False
+        
+        # Binary search over the time index, then over the visible rows
+        position = self.columns.times().find(timestamp)
+        rows = self.filtered_indices
+        field = self.SORT_FIELDS.get(self.sort_column)
+        if position >= len(self.columns):
+            # Nothing at or after that time
+            row = len(rows)
+        elif field is not None:
+            # Rows are in the order of the cached permutation: search their ranks
+            row = self.columns.sort_index().row_of(rows, position, field, self.sort_reverse)
+        elif not self.sort_reverse:
+            row = bisect_left(rows, position)
+        else:
+            # Descending positions: the last row at or after position
+            low, high = 0, len(rows)
+            while low < high:
+                middle = (low + high) // 2
+                if rows[middle] >= position:
+                    low = middle + 1
+                else:
+                    high = middle
+            row = low - 1 if low else len(rows)
+        
+        children = self.tree.get_children()
+        if not children:
+            return False
+        item = children[min(row, len(children) - 1)]
+        self.tree.selection_set(item)
+        self.tree.focus(item)
+        self.tree.see(item)
+        return True
+    
     def _on_select(self, event):
         """Handle message selection in the tree"""
         selection = self.tree.selection()
@@ -237,30 +443,64 @@ class MessageListView(ttk.Frame):
             callback(msg)
     
     def _on_search_changed(self, *args):
-        """Handle changes to the search text"""
-        search_text = self.search_var.get().lower()
+        """Handle changes to the search text once typing pauses"""
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(self._setting("search.debounce_ms", 250), self._apply_search)
+    
+    def _apply_search(self):
+        """Apply the toolbar search on top of the filter"""
+        self._search_job = None
+        # The search applies on top of the filter; neither overwrites the other
+        self._refresh()
+    
+    def build_search_index(self, dlt_path=None):
+        """Build the payload trigram index in the background
         
-        if not search_text:
-            # If search is cleared, restore previous filter state
-            self.apply_filter(self.main_window.filter_panel.get_current_filter())
+        The index of a file is stored next to it and reused on the next
+        load; until it is ready, searches scan all payloads.
+        """
+        if not self._setting("search.trigram_index", True):
             return
-            
-        # Apply search filter
-        visible_indices = []
-        for idx in self.filtered_indices:
-            msg = self.messages[idx]
-            if search_text in msg.payload.lower() or search_text in msg.app_id.lower() or search_text in msg.ctx_id.lower():
-                visible_indices.append(idx)
+        block_size = self._setting("search.trigram_block_size", 256)
         
-        # Update the filtered indices
-        self.filtered_indices = visible_indices
-        self._populate_tree()
+        self._cancel_search_index()
+        cancel = self._search_index_cancel = threading.Event()
+        columns = self.columns
+        count = len(columns)
         
-        # Update message count
-        self.main_window.update_message_count(
-            len(self.messages), 
-            self.get_visible_count()
-        )
+        def build():
+            try:
+                # Only the positions present now; later ones are added on the Tk thread
+                payloads = columns.payloads[:count]
+                index = DLTTrigramIndex.open_or_build(dlt_path, payloads, block_size, cancel)
+            except Exception as e:
+                get_logger().error(f"Error building search index: {e}", exc_info=True)
+                return
+            if index is not None and not cancel.is_set():
+                self.after(0, lambda: self._search_index_ready(columns, index))
+        
+        thread = threading.Thread(target=build, daemon=True)
+        thread.start()
+    
+    def _search_index_ready(self, columns, index):
+        """Attach a finished trigram index to the columns it was built from"""
+        if columns is not self.columns:
+            return
+        index.update(columns.payloads)
+        columns.trigrams = index
+    
+    def _cancel_search_index(self):
+        """Abort a background index build"""
+        if self._search_index_cancel is not None:
+            self._search_index_cancel.set()
+            self._search_index_cancel = None
+    
+    def _message_matches_search(self, msg, search_text):
+        """Check if a message contains the (lowercase) toolbar search text"""
+        return (search_text in msg.payload.lower() or
+                search_text in msg.app_id.lower() or
+                search_text in msg.ctx_id.lower())
     
     def _toggle_column(self, column_id):
         """Toggle column visibility"""
@@ -288,7 +528,6 @@ class MessageListView(ttk.Frame):
             self.sort_reverse = False
             
         self.sort_column = column
-        self._apply_sort()
         self._populate_tree()
     
     def _apply_sort(self):
@@ -301,16 +540,9 @@ class MessageListView(ttk.Frame):
                 self.filtered_indices.sort(reverse=True)
             return
         
-        # Get the column index for sorting
-        column_map = {
-            "time": lambda idx: self.messages[idx].timestamp,
-            "ecu": lambda idx: self.messages[idx].ecu_id,
-            "app": lambda idx: self.messages[idx].app_id,
-            "ctx": lambda idx: self.messages[idx].ctx_id,
-            "level": lambda idx: self.messages[idx].log_level,
-            "payload": lambda idx: self.messages[idx].payload
-        }
-        
-        if self.sort_column in column_map:
-            key_func = column_map[self.sort_column]
-            self.filtered_indices.sort(key=key_func, reverse=self.sort_reverse)
\ No newline at end of file
+        # Select the filtered positions from the cached permutation of the column
+        field = self.SORT_FIELDS.get(self.sort_column)
+        if field is not None:
+            self.filtered_indices = self.columns.sort_index().sort(
+                self.filtered_indices, field, self.sort_reverse
+            )
\ No newline at end of file
@@ -4,10 +4,14 @@ Statistics View Component
 import tkinter as tk
 from tkinter import ttk
 import time
+from core.dlt_loss import DLTLossTracker
 
 class StatisticsView(ttk.Frame):
     """Component for displaying DLT statistics"""
     
+    # Number of loss events listed in the tree
+    MAX_LOSS_EVENTS = 20
+    
     def __init__(self, parent, main_window):
         super().__init__(parent)
         
@@ -35,7 +39,15 @@ class StatisticsView(ttk.Frame):
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
+        # Message counter gaps per ECU/session
+        self.loss_tracker = DLTLossTracker()
+        
         # Initialize statistics
+        self.reset()
+        
+    def reset(self):
+        """Clear all statistics"""
+        self.loss_tracker.reset()
         self.stats = {
             "total_messages": 0,
             "start_time": time.time(),
@@ -47,11 +59,24 @@ class StatisticsView(ttk.Frame):
             "by_app": {},
             "by_ctx": {}
         }
-        
         self._update_tree()
         
     def update_stats(self, message):
         """Update statistics with new message"""
+        self._count_message(message)
+        self._update_rates()
+        self._update_tree()
+        
+    def update_stats_batch(self, messages):
+        """Update statistics with a batch of messages and redraw once"""
+        for message in messages:
+            self._count_message(message)
+        self._update_rates()
+        self._update_tree()
+        
+    def _count_message(self, message):
+        """Add a single message to the counters"""
+        self.loss_tracker.track(message, self.stats["total_messages"])
         self.stats["total_messages"] += 1
         self.stats["bytes_received"] += len(message.raw_data) if message.raw_data else 0
         
@@ -61,14 +86,13 @@ class StatisticsView(ttk.Frame):
         self.stats["by_app"][message.app_id] = self.stats["by_app"].get(message.app_id, 0) + 1
         self.stats["by_ctx"][message.ctx_id] = self.stats["by_ctx"].get(message.ctx_id, 0) + 1
         
-        # Calculate rates
+    def _update_rates(self):
+        """Recalculate message and byte rates"""
         elapsed = time.time() - self.stats["start_time"]
         if elapsed > 0:
             self.stats["msg_per_second"] = self.stats["total_messages"] / elapsed
             self.stats["bytes_per_second"] = self.stats["bytes_received"] / elapsed
         
-        self._update_tree()
-        
     def _update_tree(self):
         """Update the statistics tree"""
         # Clear existing items
@@ -100,4 +124,23 @@ class StatisticsView(ttk.Frame):
         # Add context statistics
         contexts = self.tree.insert("", "end", text="Contexts", open=True)
         for ctx, count in sorted(self.stats["by_ctx"].items()):
-            self.tree.insert(contexts, "end", text=ctx, values=(count,))
\ No newline at end of file
+            self.tree.insert(contexts, "end", text=ctx, values=(count,))            
+        # Add message loss statistics
+        loss = self.loss_tracker.get_stats()
+        losses = self.tree.insert("", "end", text="Message Loss", open=True)
+        self.tree.insert(losses, "end", text="Lost Messages", values=(loss["lost"],))
+        self.tree.insert(losses, "end", text="Counter Gaps", values=(loss["gaps"],))
+        self.tree.insert(losses, "end", text="Counter Wraps", values=(loss["wraps"],))
+        self.tree.insert(losses, "end", text="Loss Rate", values=(f"{loss['loss_rate'] * 100:.2f} %",))
+        for (ecu, session), stream in sorted(loss["streams"].items(), key=lambda item: str(item[0])):
+            if stream["lost"]:
+                name = f"{ecu} session {session}" if session is not None else ecu
+                self.tree.insert(losses, "end", text=name, values=(f"{stream['lost']} lost",))
+                
+        # Most recent gaps, by message position
+        events = self.loss_tracker.get_events()[-self.MAX_LOSS_EVENTS:]
+        if events:
+            gaps = self.tree.insert(losses, "end", text="Recent Gaps", open=False)
+            for event in reversed(events):
+                self.tree.insert(gaps, "end", text=f"#{event.position} {event.stream[0]}",
+                                 values=(f"{event.lost} lost ({event.expected} -> {event.counter})",))
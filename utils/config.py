@@ -18,6 +18,66 @@ DEFAULT_CONFIG = {
         "ctx": True,
         "level": True,
         "payload": True
+    },
+    "live_view": {
+        "queue_size": 50000,
+        "frame_interval_ms": 50,
+        "max_batch": 5000,
+        "memory_cap_mb": 256,
+        "segment_size_mb": 4
+    },
+    "connection": {
+        "connect_timeout": 5.0,
+        "attempt_delay": 0.25
+    },
+    "ingest": {
+        "decode_workers": 2,
+        "max_pending_batches": 256
+    },
+    "search": {
+        "trigram_index": True,
+        "trigram_block_size": 256,
+        "cache_mb": 64,
+        "debounce_ms": 250,
+        "chunk_size": 262144,
+        "parallel_workers": 0,
+        "parallel_min_messages": 1000000,
+        "shard_size": 65536
+    },
+    "recorder": {
+        "output_dir": "~/dlt_records",
+        "max_file_mb": 256,
+        "max_file_minutes": 60,
+        "index_block_size": 1000,
+        "status_interval": 5.0
+    },
+    "merge": {
+        "window": 0.2,
+        "max_buffered": 10000,
+        "max_delay": 0.5,
+        "idle_timeout": 1.0
+    },
+    "discovery": {
+        "networks": ["192.168.1.0/24"],
+        "ports": [3490, 3491],
+        "concurrency": 256,
+        "timeout": 0.3
+    },
+    "triggers": {
+        "enabled": False,
+        "pre_seconds": 10,
+        "post_seconds": 5,
+        "output_dir": "~/dlt_snapshots",
+        "rules": [
+            {"name": "fatal", "level": "FATAL"}
+        ]
+    },
+    "governor": {
+        "enabled": False,
+        "threshold": 2000,
+        "window": 1.0,
+        "cooldown": 30,
+        "throttle_level": "WARN"
     }
 }
 